@@ -580,10 +580,23 @@ export class FundsController {
   @ApiOperation({ summary: 'Get all synced funds in ML-compatible format (for ML Service)' })
   @ApiQuery({ name: 'asset_class', required: false, description: 'Filter by asset class (equity, debt, hybrid, gold, international, liquid)' })
   @ApiQuery({ name: 'category', required: false, description: 'Filter by fund category' })
+  @ApiQuery({ name: 'updated_since', required: false, description: 'Only return plans changed since this ISO timestamp (use the watermark from a previous response)' })
   async getMlFunds(
     @Query('asset_class') assetClass?: string,
     @Query('category') category?: string,
+    @Query('updated_since') updatedSince?: string,
   ) {
+    // Taken before querying so changes made while we read are picked up by the next delta
+    const watermark = new Date();
+
+    let since: Date | null = null;
+    if (updatedSince) {
+      since = new Date(updatedSince);
+      if (isNaN(since.getTime())) {
+        throw new BadRequestException(`Invalid updated_since: ${updatedSince}`);
+      }
+    }
+
     const where: any = {
       plan: 'direct',
       option: 'growth',
@@ -594,6 +607,15 @@ export class FundsController {
       where.scheme = { category: { name: { contains: category, mode: 'insensitive' } } };
     }
 
+    if (since) {
+      where.OR = [
+        { updatedAt: { gte: since } },
+        { nav: { is: { updatedAt: { gte: since } } } },
+        { metrics: { is: { updatedAt: { gte: since } } } },
+        { scheme: { is: { updatedAt: { gte: since } } } },
+      ];
+    }
+
     const schemePlans = await this.prisma.schemePlan.findMany({
       where,
       include: {
@@ -664,6 +686,20 @@ export class FundsController {
     const categories = [...new Set(funds.map(f => f.category))].sort();
     const assetClasses = [...new Set(funds.map(f => f.asset_class))].sort();
 
+    // In delta mode also report plans that left the ML universe (inactive or no longer direct-growth)
+    let deleted: number[] = [];
+    if (since) {
+      const removed = await this.prisma.schemePlan.findMany({
+        where: {
+          updatedAt: { gte: since },
+          mfapiSchemeCode: { not: null },
+          NOT: { plan: 'direct', option: 'growth', status: 'active' },
+        },
+        select: { mfapiSchemeCode: true },
+      });
+      deleted = removed.map(p => p.mfapiSchemeCode as number);
+    }
+
     return {
       funds,
       total: funds.length,
@@ -671,6 +707,73 @@ export class FundsController {
         categories,
         asset_classes: assetClasses,
       },
+      delta: since !== null,
+      deleted,
+      watermark: watermark.toISOString(),
+    };
+  }
+
+  @Public()
+  @Get('ml/funds/nav-history')
+  @ApiOperation({ summary: 'Get NAV history after a date for many funds (for ML Service NAV store sync)' })
+  @ApiQuery({ name: 'since', required: true, description: 'Only NAVs dated after this day (YYYY-MM-DD)' })
+  @ApiQuery({ name: 'scheme_codes', required: false, description: 'Comma-separated AMFI scheme codes (default: all ML funds)' })
+  async getMlNavHistory(
+    @Query('since') since: string,
+    @Query('scheme_codes') schemeCodes?: string,
+  ) {
+    const sinceDate = new Date(since);
+    if (!since || isNaN(sinceDate.getTime())) {
+      throw new BadRequestException(`Invalid since: ${since}`);
+    }
+
+    const planWhere: any = {
+      plan: 'direct',
+      option: 'growth',
+      status: 'active',
+      mfapiSchemeCode: { not: null },
+    };
+    if (schemeCodes) {
+      const codes = schemeCodes.split(',').map(c => parseInt(c.trim(), 10)).filter(c => !isNaN(c));
+      planWhere.mfapiSchemeCode = { in: codes };
+    }
+
+    const rows = await this.prisma.schemePlanNavHistory.findMany({
+      where: {
+        navDate: { gt: sinceDate },
+        schemePlan: planWhere,
+      },
+      select: {
+        navDate: true,
+        nav: true,
+        schemePlan: { select: { mfapiSchemeCode: true } },
+      },
+      orderBy: [{ schemePlanId: 'asc' }, { navDate: 'asc' }],
+    });
+
+    // Group per scheme as parallel date / NAV arrays (compact for large backfills)
+    const bySchemeCode = new Map<number, { scheme_code: number; dates: string[]; navs: number[] }>();
+    let latestDate: string | null = null;
+    for (const row of rows) {
+      const code = row.schemePlan.mfapiSchemeCode as number;
+      let scheme = bySchemeCode.get(code);
+      if (!scheme) {
+        scheme = { scheme_code: code, dates: [], navs: [] };
+        bySchemeCode.set(code, scheme);
+      }
+      const date = row.navDate.toISOString().slice(0, 10);
+      scheme.dates.push(date);
+      scheme.navs.push(Number(row.nav));
+      if (latestDate === null || date > latestDate) {
+        latestDate = date;
+      }
+    }
+
+    return {
+      since: sinceDate.toISOString().slice(0, 10),
+      latest_date: latestDate,
+      total_rows: rows.length,
+      schemes: [...bySchemeCode.values()],
     };
   }
 
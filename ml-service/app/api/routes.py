@@ -2,13 +2,15 @@
 API routes for ML service.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 
 from app.schemas import (
     ClassifyRequest,
     ClassifyResponse,
     BlendedClassifyResponse,
+    ClassifyBatchRequest,
+    BlendedClassifyBatchResponse,
     PersonaDistributionItem,
     AllocationBreakdown,
     PersonaResult,
@@ -18,28 +20,41 @@ from app.schemas import (
     RecommendationResponse,
     BlendedRecommendationRequest,
     BlendedRecommendationResponse,
+    BlendedRecommendationBatchRequest,
+    BlendedRecommendationBatchResponse,
     AllocationTarget,
     RiskRequest,
     RiskResponse,
     PortfolioAnalysisRequest,
     PortfolioAnalysisResponse,
+    PortfolioAnalysisBatchRequest,
+    PortfolioAnalysisBatchResponse,
+    ProjectionRequest,
+    ProjectionResponse,
+    ProjectionBand,
+    BacktestRequest,
+    BacktestResponse,
+    BacktestMetrics,
+    BacktestSeries,
+    RollingReturnStats,
+    BacktestBatchRequest,
+    BacktestBatchItem,
+    BacktestBatchResponse,
 )
 from app.services import (
-    PersonaService,
-    PortfolioService,
-    RecommendationService,
-    RiskService,
+    persona_service,
+    portfolio_service,
+    recommendation_service,
+    risk_service,
     portfolio_analysis_service,
+    projection_service,
+    backtest_service,
 )
+from app.services.executor_service import executor_service
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
-# Service instances
-persona_service = PersonaService()
-portfolio_service = PortfolioService()
-recommendation_service = RecommendationService()
-risk_service = RiskService()
-
 
 @router.post("/classify", response_model=ClassifyResponse, tags=["Persona"])
 async def classify_profile(request: ClassifyRequest) -> ClassifyResponse:
@@ -49,8 +64,8 @@ async def classify_profile(request: ClassifyRequest) -> ClassifyResponse:
     Returns the matched persona with confidence score and probability distribution.
     """
     try:
-        persona, confidence, probabilities, latency_ms = persona_service.classify(
-            request.profile
+        persona, confidence, probabilities, latency_ms = await executor_service.run(
+            "classify", persona_service.classify, request.profile
         )
 
         return ClassifyResponse(
@@ -82,38 +97,80 @@ async def classify_profile_blended(request: ClassifyRequest) -> BlendedClassifyR
     Their blended allocation would combine all three strategies proportionally.
     """
     try:
-        result = persona_service.classify_blended(request.profile)
-
-        # Convert distribution to response format
-        distribution_items = []
-        for item in result.distribution:
-            distribution_items.append(
-                PersonaDistributionItem(
-                    persona=PersonaResult(
-                        id=item["persona"]["id"],
-                        name=item["persona"]["name"],
-                        slug=item["persona"]["slug"],
-                        risk_band=item["persona"]["risk_band"],
-                        description=item["persona"].get("description"),
-                    ),
-                    weight=item["weight"],
-                    allocation=AllocationBreakdown(**item["allocation"]),
-                )
-            )
+        # Classification depends only on the profile and the persona rule table
+        cache_key = response_cache.key("classify_blended", persona_service.rules_version, request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return response_cache.respond(cached, request.request_id)
+
+        result = await executor_service.run(
+            "classify_blended", persona_service.classify_blended, request.profile
+        )
+        response = _blended_classify_response(request.request_id, result)
+        response_cache.put(cache_key, response)
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return BlendedClassifyResponse(
+
+@router.post("/classify/batch", response_model=BlendedClassifyBatchResponse, tags=["Persona"])
+async def classify_profiles_batch(request: ClassifyBatchRequest) -> BlendedClassifyBatchResponse:
+    """
+    Blended classification for many profiles in one call (e.g. nightly reclassification).
+
+    Each item gets the same result as `/classify/blended`, in request order.
+    Profiles are scored together with vectorized rule tables.
+    """
+    try:
+        results, latency_ms = await executor_service.run(
+            "classify_batch",
+            persona_service.classify_blended_batch,
+            [item.profile for item in request.items]
+        )
+
+        return BlendedClassifyBatchResponse(
             request_id=request.request_id,
-            primary_persona=result.primary_persona,
-            distribution=distribution_items,
-            blended_allocation=AllocationBreakdown(**result.blended_allocation),
-            confidence=result.confidence,
-            model_version=result.model_version,
-            latency_ms=result.latency_ms,
+            results=[
+                _blended_classify_response(item.request_id, result)
+                for item, result in zip(request.items, results)
+            ],
+            model_version=persona_service.get_model_version(),
+            latency_ms=latency_ms,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _blended_classify_response(request_id: Optional[str], result) -> BlendedClassifyResponse:
+    """Convert a BlendedClassificationResult to the response model."""
+    # Convert distribution to response format
+    distribution_items = []
+    for item in result.distribution:
+        distribution_items.append(
+            PersonaDistributionItem(
+                persona=PersonaResult(
+                    id=item["persona"]["id"],
+                    name=item["persona"]["name"],
+                    slug=item["persona"]["slug"],
+                    risk_band=item["persona"]["risk_band"],
+                    description=item["persona"].get("description"),
+                ),
+                weight=item["weight"],
+                allocation=AllocationBreakdown(**item["allocation"]),
+            )
+        )
+
+    return BlendedClassifyResponse(
+        request_id=request_id,
+        primary_persona=result.primary_persona,
+        distribution=distribution_items,
+        blended_allocation=AllocationBreakdown(**result.blended_allocation),
+        confidence=result.confidence,
+        model_version=result.model_version,
+        latency_ms=result.latency_ms,
+    )
+
+
 @router.post("/optimize", response_model=OptimizeResponse, tags=["Portfolio"])
 async def optimize_portfolio(request: OptimizeRequest) -> OptimizeResponse:
     """
@@ -122,11 +179,20 @@ async def optimize_portfolio(request: OptimizeRequest) -> OptimizeResponse:
     Returns optimized fund allocations with expected metrics.
     """
     try:
-        allocations, metrics, latency_ms = portfolio_service.optimize(
+        if request.method == "mvo":
+            from app.services.nav_history_service import nav_history_service
+            # Backfill NAV history for later covariance models; this request
+            # uses the current model (prior correlations for unseen schemes)
+            nav_history_service.ensure_in_background(f.scheme_code for f in request.available_funds)
+
+        allocations, metrics, latency_ms = await executor_service.run(
+            "optimize",
+            portfolio_service.optimize,
             persona_id=request.persona_id,
             profile=request.profile,
             available_funds=request.available_funds,
             constraints=request.constraints,
+            method=request.method,
         )
 
         return OptimizeResponse(
@@ -146,9 +212,18 @@ async def recommend_funds(request: RecommendationRequest) -> RecommendationRespo
     Get fund recommendations based on persona and preferences.
 
     Returns ranked fund recommendations with allocation suggestions.
+    Repeated requests are served from the response cache until the fund
+    universe changes.
     """
     try:
-        recommendations, persona_alignment, latency_ms = recommendation_service.recommend(
+        cache_key = response_cache.key("recommend", recommendation_service.universe.version, request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return response_cache.respond(cached, request.request_id)
+
+        recommendations, persona_alignment, latency_ms = await executor_service.run(
+            "recommend",
+            recommendation_service.recommend,
             persona_id=request.persona_id,
             profile=request.profile,
             top_n=request.top_n,
@@ -156,13 +231,15 @@ async def recommend_funds(request: RecommendationRequest) -> RecommendationRespo
             exclude_funds=request.exclude_funds,
         )
 
-        return RecommendationResponse(
+        response = RecommendationResponse(
             request_id=request.request_id,
             recommendations=recommendations,
             persona_alignment=persona_alignment,
             model_version=recommendation_service.get_model_version(),
             latency_ms=latency_ms,
         )
+        response_cache.put(cache_key, response)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -183,8 +260,16 @@ async def recommend_funds_blended(request: BlendedRecommendationRequest) -> Blen
     - Asset class breakdown showing target vs actual allocation
     - Alignment score indicating how well recommendations match targets
     - Suggested investment amounts if total investment is provided
+
+    Repeated requests are served from the response cache until the fund
+    universe changes.
     """
     try:
+        cache_key = response_cache.key("recommend_blended", recommendation_service.universe.version, request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return response_cache.respond(cached, request.request_id)
+
         # Convert request allocation to AllocationTarget
         blended_allocation = AllocationTarget(
             equity=request.blended_allocation.equity,
@@ -201,7 +286,9 @@ async def recommend_funds_blended(request: BlendedRecommendationRequest) -> Blen
             alignment_score,
             alignment_message,
             latency_ms,
-        ) = recommendation_service.recommend_blended(
+        ) = await executor_service.run(
+            "recommend_blended",
+            recommendation_service.recommend_blended,
             blended_allocation=blended_allocation,
             profile=request.profile,
             top_n=request.top_n,
@@ -210,7 +297,7 @@ async def recommend_funds_blended(request: BlendedRecommendationRequest) -> Blen
             exclude_funds=request.exclude_funds,
         )
 
-        return BlendedRecommendationResponse(
+        response = BlendedRecommendationResponse(
             request_id=request.request_id,
             recommendations=recommendations,
             asset_class_breakdown=asset_class_breakdown,
@@ -220,6 +307,58 @@ async def recommend_funds_blended(request: BlendedRecommendationRequest) -> Blen
             model_version=f"{recommendation_service.get_model_version()}-blended",
             latency_ms=latency_ms,
         )
+        response_cache.put(cache_key, response)
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recommend/blended/batch", response_model=BlendedRecommendationBatchResponse, tags=["Recommendations"])
+async def recommend_funds_blended_batch(request: BlendedRecommendationBatchRequest) -> BlendedRecommendationBatchResponse:
+    """
+    Get blended fund recommendations for many clients in one call.
+
+    Each item is handled exactly like a `/recommend/blended` request and results
+    are returned in the same order. All items are served from the same fund
+    universe snapshot, and fund selection is shared between items that need
+    the same asset class, fund count and filters.
+    """
+    try:
+        results, latency_ms = await executor_service.run(
+            "recommend_blended_batch",
+            recommendation_service.recommend_blended_batch,
+            [
+                {
+                    "blended_allocation": item.blended_allocation,
+                    "top_n": item.top_n,
+                    "investment_amount": item.investment_amount,
+                    "category_filters": item.category_filters,
+                    "exclude_funds": item.exclude_funds,
+                }
+                for item in request.items
+            ],
+        )
+
+        model_version = f"{recommendation_service.get_model_version()}-blended"
+        return BlendedRecommendationBatchResponse(
+            request_id=request.request_id,
+            results=[
+                BlendedRecommendationResponse(
+                    request_id=item.request_id,
+                    recommendations=recommendations,
+                    asset_class_breakdown=asset_class_breakdown,
+                    target_allocation=item.blended_allocation,
+                    alignment_score=alignment_score,
+                    alignment_message=alignment_message,
+                    model_version=model_version,
+                    latency_ms=latency_ms,
+                )
+                for item, (recommendations, asset_class_breakdown, alignment_score, alignment_message)
+                in zip(request.items, results)
+            ],
+            model_version=model_version,
+            latency_ms=latency_ms,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -252,7 +391,11 @@ async def analyze_portfolio(request: PortfolioAnalysisRequest) -> PortfolioAnaly
     - LOW: <5% adjustments
     """
     try:
-        result = await portfolio_analysis_service.analyze(
+        universe = await portfolio_analysis_service.load_universe()
+        result = await executor_service.run(
+            "analyze",
+            portfolio_analysis_service.analyze,
+            universe,
             holdings=request.holdings,
             target_allocation=request.target_allocation,
             profile=request.profile,
@@ -274,6 +417,195 @@ async def analyze_portfolio(request: PortfolioAnalysisRequest) -> PortfolioAnaly
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/analyze/portfolio/batch", response_model=PortfolioAnalysisBatchResponse, tags=["Portfolio Analysis"])
+async def analyze_portfolios_batch(request: PortfolioAnalysisBatchRequest) -> PortfolioAnalysisBatchResponse:
+    """
+    Analyze many clients' portfolios in one call (advisor "analyze all clients" view).
+
+    Each item gets the same result as `/analyze/portfolio`, in request order.
+    All holdings are joined against the fund universe in one lookup and
+    allocations / gaps are computed together; rebalancing actions are
+    generated per client.
+    """
+    try:
+        universe = await portfolio_analysis_service.load_universe()
+        results, latency_ms = await executor_service.run(
+            "analyze_batch",
+            portfolio_analysis_service.analyze_batch,
+            universe,
+            [(item.holdings, item.target_allocation, item.profile) for item in request.items],
+        )
+        for item, result in zip(request.items, results):
+            result.request_id = item.request_id
+
+        return PortfolioAnalysisBatchResponse(
+            request_id=request.request_id,
+            results=results,
+            model_version=portfolio_analysis_service.get_model_version(),
+            latency_ms=latency_ms,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/project", response_model=ProjectionResponse, tags=["Projection"])
+async def project_goal(request: ProjectionRequest) -> ProjectionResponse:
+    """
+    Monte Carlo projection of a SIP / lump sum plan.
+
+    Simulates `num_paths` monthly return paths (lognormal, from the expected
+    return and volatility, e.g. an optimizer's `expected_metrics`) and returns
+    percentile bands of the corpus at each year end, plus the probability of
+    reaching `target_corpus`. Results are reproducible for a fixed `seed`.
+    """
+    try:
+        result = await executor_service.run(
+            "project",
+            projection_service.project,
+            expected_return=request.expected_return,
+            volatility=request.expected_volatility,
+            horizon_years=request.horizon_years,
+            monthly_sip=request.monthly_sip,
+            lump_sum=request.lump_sum,
+            step_up_pct=request.step_up_pct,
+            target_corpus=request.target_corpus,
+            paths=request.num_paths,
+            percentiles=request.percentiles,
+            seed=request.seed,
+        )
+
+        return ProjectionResponse(
+            request_id=request.request_id,
+            years=result.years,
+            bands=[
+                ProjectionBand(percentile=percentile, values=values)
+                for percentile, values in result.bands.items()
+            ],
+            total_invested=result.total_invested,
+            mean_final_value=result.mean_final_value,
+            median_final_value=result.median_final_value,
+            probability_of_target=result.probability_of_target,
+            num_paths=result.paths,
+            model_version=projection_service.get_model_version(),
+            latency_ms=result.latency_ms,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/backtest", response_model=BacktestResponse, tags=["Backtest"])
+async def backtest_portfolio(request: BacktestRequest) -> BacktestResponse:
+    """
+    Backtest target weights on stored NAV history.
+
+    Replays the weights (e.g. from `/optimize` or `/recommend/blended`)
+    with a lump sum, monthly SIP and periodic rebalancing, and returns
+    XIRR, time-weighted CAGR, volatility, max drawdown, rolling returns and
+    (optionally) the daily value series.
+    """
+    try:
+        from app.services.nav_history_service import nav_history_service
+        await nav_history_service.ensure(h.scheme_code for h in request.holdings)
+
+        run, summary, missing, latency_ms = await executor_service.run(
+            "backtest",
+            backtest_service.backtest,
+            {h.scheme_code: h.weight for h in request.holdings},
+            **_backtest_settings(request),
+        )
+
+        series = None
+        if request.include_series:
+            series = BacktestSeries(
+                dates=run.dates.tolist(),
+                values=[round(float(v), 2) for v in run.values[:, 0]],
+                invested=run.flows.cumsum().tolist(),
+            )
+
+        return BacktestResponse(
+            request_id=request.request_id,
+            start_date=run.dates[0].item(),
+            end_date=run.dates[-1].item(),
+            metrics=_backtest_metrics(summary),
+            rolling_returns=[RollingReturnStats(**stats) for stats in summary.rolling_returns],
+            series=series,
+            missing_schemes=missing,
+            model_version=backtest_service.get_model_version(),
+            latency_ms=latency_ms,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/backtest/batch", response_model=BacktestBatchResponse, tags=["Backtest"])
+async def backtest_portfolios_batch(request: BacktestBatchRequest) -> BacktestBatchResponse:
+    """
+    Backtest many candidate portfolios in one call.
+
+    All portfolios share the window (the span every requested scheme has
+    NAVs for), rebalancing and cash flows, and are evaluated together as
+    one matrix product per step. Results are in request order.
+    """
+    try:
+        from app.services.nav_history_service import nav_history_service
+        await nav_history_service.ensure(
+            h.scheme_code for portfolio in request.portfolios for h in portfolio.holdings
+        )
+
+        run, summaries, missing, latency_ms = await executor_service.run(
+            "backtest_batch",
+            backtest_service.backtest_batch,
+            [{h.scheme_code: h.weight for h in portfolio.holdings} for portfolio in request.portfolios],
+            **_backtest_settings(request),
+        )
+
+        return BacktestBatchResponse(
+            request_id=request.request_id,
+            start_date=run.dates[0].item(),
+            end_date=run.dates[-1].item(),
+            results=[
+                BacktestBatchItem(
+                    portfolio_id=portfolio.portfolio_id,
+                    metrics=_backtest_metrics(summary),
+                    rolling_returns=[RollingReturnStats(**stats) for stats in summary.rolling_returns],
+                )
+                for portfolio, summary in zip(request.portfolios, summaries)
+            ],
+            missing_schemes=missing,
+            model_version=backtest_service.get_model_version(),
+            latency_ms=latency_ms,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _backtest_settings(request) -> dict:
+    """Keyword arguments for BacktestService from the shared request settings."""
+    return {
+        "start_date": request.start_date,
+        "end_date": request.end_date,
+        "rebalance": request.rebalance,
+        "monthly_sip": request.monthly_sip,
+        "lump_sum": request.lump_sum,
+        "rolling_windows": request.rolling_windows_years,
+    }
+
+
+def _backtest_metrics(summary) -> BacktestMetrics:
+    """Convert a BacktestSummary to the response model."""
+    return BacktestMetrics(
+        final_value=summary.final_value,
+        total_invested=summary.total_invested,
+        absolute_return=summary.absolute_return,
+        xirr=summary.xirr,
+        cagr=summary.cagr,
+        volatility=summary.volatility,
+        max_drawdown=summary.max_drawdown,
+        max_drawdown_peak=summary.max_drawdown_peak,
+        max_drawdown_trough=summary.max_drawdown_trough,
+    )
+
+
 @router.post("/risk", response_model=RiskResponse, tags=["Risk"])
 async def assess_risk(request: RiskRequest) -> RiskResponse:
     """
@@ -289,7 +621,9 @@ async def assess_risk(request: RiskRequest) -> RiskResponse:
             recommendations,
             persona_alignment,
             latency_ms,
-        ) = risk_service.assess(
+        ) = await executor_service.run(
+            "risk",
+            risk_service.assess,
             profile=request.profile,
             current_portfolio=request.current_portfolio,
             proposed_portfolio=request.proposed_portfolio,
@@ -314,6 +648,10 @@ async def get_funds_universe(
     asset_class: Optional[str] = None,
     category: Optional[str] = None,
     source: str = "live",  # "live" or "cache"
+    sort_by: Optional[str] = Query(
+        None,
+        pattern="^(return_1y|return_3y|return_5y|volatility|sharpe_ratio|expense_ratio)$",
+    ),
 ):
     """
     Get the complete fund universe available for recommendations.
@@ -321,22 +659,21 @@ async def get_funds_universe(
     - source: "live" fetches real data from MFAPI.in, "cache" uses cached data
     - Optionally filter by asset_class (equity, debt, hybrid, gold, international, liquid)
     - Optionally filter by category (Flexi Cap, Mid Cap, etc.)
+    - Optionally sort by a metric, highest first (missing values last)
     """
-    from app.services.fund_data_service import fund_data_service, CATEGORY_TO_ASSET_CLASS
+    from app.services.fund_data_service import fund_data_service
 
-    # Fetch real fund data
-    all_funds = await fund_data_service.get_all_funds()
+    # Fetch real fund data; filters read the snapshot's row indexes
+    universe = await fund_data_service.get_universe()
+    rows = []
+    if universe is not None:
+        rows = universe.select_rows(
+            category_asset_class=asset_class, category=category, sort_by=sort_by
+        ).tolist()
 
     funds = []
-    for fund in all_funds:
-        fund_asset_class = CATEGORY_TO_ASSET_CLASS.get(fund.category, "equity")
-
-        # Apply filters
-        if asset_class and fund_asset_class != asset_class:
-            continue
-        if category and fund.category != category:
-            continue
-
+    for row in rows:
+        fund = universe.funds[row]
         funds.append({
             "scheme_code": fund.scheme_code,
             "scheme_name": fund.scheme_name,
@@ -348,21 +685,17 @@ async def get_funds_universe(
             "volatility": fund.volatility or 0,
             "sharpe_ratio": fund.sharpe_ratio or 0,
             "expense_ratio": fund.expense_ratio or 0,
-            "asset_class": fund_asset_class,
+            "asset_class": universe.asset_class_names[universe.category_asset_class_ids[row]],
             "nav": fund.nav,
             "last_updated": fund.last_updated.isoformat() if fund.last_updated else None,
         })
 
-    # Get unique categories and asset classes for filters
-    all_categories = sorted(set(f.category for f in all_funds))
-    all_asset_classes = sorted(set(CATEGORY_TO_ASSET_CLASS.get(f.category, "equity") for f in all_funds))
-
     return {
         "funds": funds,
         "total": len(funds),
         "filters": {
-            "categories": all_categories,
-            "asset_classes": all_asset_classes,
+            "categories": sorted(universe.category_names) if universe is not None else [],
+            "asset_classes": sorted(universe.category_asset_classes()) if universe is not None else [],
         },
         "data_source": "mfapi.in",
         "cache_expiry": fund_data_service._cache_expiry.isoformat() if fund_data_service._cache_expiry else None,
@@ -433,6 +766,10 @@ async def refresh_funds():
 @router.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
+    from app.services.covariance_service import covariance_service
+    from app.services.fund_data_service import fund_data_service
+    from app.services.nav_history_service import nav_history_service
+
     return {
         "status": "healthy",
         "services": {
@@ -440,7 +777,13 @@ async def health_check():
             "portfolio_optimizer": portfolio_service.get_model_version(),
             "fund_recommender": recommendation_service.get_model_version(),
             "risk_assessor": risk_service.get_model_version(),
+            "goal_projector": projection_service.get_model_version(),
         },
+        "fund_data": fund_data_service.refresh_stats(),
+        "nav_history": nav_history_service.sync_stats(),
+        "covariance": covariance_service.stats(),
+        "executor": executor_service.stats(),
+        "response_cache": response_cache.stats(),
     }
 
 
@@ -477,5 +820,19 @@ async def list_models():
                 "type": "rules-based",
                 "description": "Assesses portfolio risk and provides recommendations",
             },
+            {
+                "name": "Goal Projector",
+                "slug": "goal-projector",
+                "version": projection_service.get_model_version(),
+                "type": "monte-carlo",
+                "description": "Projects SIP / lump sum corpus ranges and goal probability",
+            },
+            {
+                "name": "Backtester",
+                "slug": "backtester",
+                "version": backtest_service.get_model_version(),
+                "type": "historical-simulation",
+                "description": "Replays portfolio weights on NAV history (XIRR, drawdown, rolling returns)",
+            },
         ]
     }
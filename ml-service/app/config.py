@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -20,6 +20,18 @@ class Settings(BaseSettings):
         "http://localhost:8081",
     ]
 
+    # gRPC server (grpc.aio on the application event loop): RPCs beyond the
+    # concurrency limit are rejected with RESOURCE_EXHAUSTED; keepalive keeps
+    # idle ml-gateway channels open through proxies
+    GRPC_MAX_CONCURRENT_RPCS: Optional[int] = 512
+    GRPC_MAX_MESSAGE_BYTES: int = 16 * 1024 * 1024
+    GRPC_KEEPALIVE_TIME_MS: int = 30000
+    GRPC_KEEPALIVE_TIMEOUT_MS: int = 10000
+    GRPC_MIN_PING_INTERVAL_MS: int = 10000
+    # Streaming RPCs micro-batch requests for the vectorised batch paths
+    GRPC_STREAM_MAX_BATCH: int = 256
+    GRPC_STREAM_MAX_WAIT_MS: float = 5.0
+
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
@@ -30,6 +42,32 @@ class Settings(BaseSettings):
     # Backend
     BACKEND_URL: str = "http://localhost:3501"
 
+    # Fund universe refresh (runs in the background ahead of the 30 minute cache expiry;
+    # refreshes are deltas since the last watermark, with a full resync every few hours)
+    FUND_REFRESH_INTERVAL_SECONDS: int = 300
+    FUND_REFRESH_JITTER_SECONDS: int = 30
+
+    # Share one fund universe between uvicorn workers: one worker downloads and
+    # writes the snapshot store, the others memory-map it (polled for changes)
+    FUND_UNIVERSE_SHARED: bool = True
+    FUND_UNIVERSE_POLL_SECONDS: float = 2.0
+
+    # NAV history store (MODEL_STORE_PATH/nav_history): years of daily NAVs kept
+    # per scheme and how often new NAVs are pulled from the backend
+    NAV_HISTORY_YEARS: int = 5
+    NAV_HISTORY_SYNC_INTERVAL_SECONDS: int = 3600
+
+    # Execution lanes for CPU-bound service calls (see executor_service):
+    # thread pool size, process pool size (0 disables the process lane) and
+    # per-endpoint lane overrides, e.g. {"risk": "inline", "project": "thread"}
+    EXECUTOR_THREADS: int = 8
+    EXECUTOR_PROCESSES: int = 2
+    EXECUTOR_ROUTES: Dict[str, str] = {}
+
+    # Responses of /recommend, /recommend/blended and /classify/blended cached per
+    # request body and fund universe version (0 disables the cache)
+    RESPONSE_CACHE_SIZE: int = 4096
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10ml_service.proto\x12\nml_service\"\xc1\x02\n\x07Profile\x12\x0b\n\x03\x61ge\x18\x01 \x01(\x05\x12\x11\n\x04goal\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x1a\n\rtarget_amount\x18\x03 \x01(\x01H\x01\x88\x01\x01\x12\x18\n\x0btarget_year\x18\x04 \x01(\x05H\x02\x88\x01\x01\x12\x18\n\x0bmonthly_sip\x18\x05 \x01(\x01H\x03\x88\x01\x01\x12\x15\n\x08lump_sum\x18\x06 \x01(\x01H\x04\x88\x01\x01\x12\x11\n\tliquidity\x18\x07 \x01(\t\x12\x16\n\x0erisk_tolerance\x18\x08 \x01(\t\x12\x11\n\tknowledge\x18\t \x01(\t\x12\x12\n\nvolatility\x18\n \x01(\t\x12\x15\n\rhorizon_years\x18\x0b \x01(\x05\x42\x07\n\x05_goalB\x10\n\x0e_target_amountB\x0e\n\x0c_target_yearB\x0e\n\x0c_monthly_sipB\x0b\n\t_lump_sum\"\xd6\x02\n\x04\x46und\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x16\n\treturn_1y\x18\x04 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\treturn_3y\x18\x05 \x01(\x01H\x01\x88\x01\x01\x12\x16\n\treturn_5y\x18\x06 \x01(\x01H\x02\x88\x01\x01\x12\x17\n\nvolatility\x18\x07 \x01(\x01H\x03\x88\x01\x01\x12\x19\n\x0csharpe_ratio\x18\x08 \x01(\x01H\x04\x88\x01\x01\x12\x1a\n\rexpense_ratio\x18\t \x01(\x01H\x05\x88\x01\x01\x12\x13\n\x06weight\x18\n \x01(\x01H\x06\x88\x01\x01\x42\x0c\n\n_return_1yB\x0c\n\n_return_3yB\x0c\n\n_return_5yB\r\n\x0b_volatilityB\x0f\n\r_sharpe_ratioB\x10\n\x0e_expense_ratioB\t\n\x07_weight\"\x8d\x01\n\x0f\x43lassifyRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12$\n\x07profile\x18\x02 \x01(\x0b\x32\x13.ml_service.Profile\x12\x1a\n\rmodel_version\x18\x03 \x01(\tH\x01\x88\x01\x01\x42\r\n\x0b_request_idB\x10\n\x0e_model_version\"n\n\x07Persona\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04slug\x18\x03 \x01(\t\x12\x11\n\trisk_band\x18\x04 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x05 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_description\"\x9d\x02\n\x10\x43lassifyResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12$\n\x07persona\x18\x02 \x01(\x0b\x32\x13.ml_service.Persona\x12\x12\n\nconfidence\x18\x03 \x01(\x01\x12\x46\n\rprobabilities\x18\x04 \x03(\x0b\x32/.ml_service.ClassifyResponse.ProbabilitiesEntry\x12\x15\n\rmodel_version\x18\x05 \x01(\t\x12\x12\n\nlatency_ms\x18\x06 \x01(\x05\x1a\x34\n\x12ProbabilitiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x42\r\n\x0b_request_id\"\x84\x02\n\x15RecommendationRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\npersona_id\x18\x02 \x01(\t\x12?\n\x07profile\x18\x03 \x03(\x0b\x32..ml_service.RecommendationRequest.ProfileEntry\x12\r\n\x05top_n\x18\x04 \x01(\x05\x12\x18\n\x10\x63\x61tegory_filters\x18\x05 \x03(\t\x12\x15\n\rexclude_funds\x18\x06 \x03(\x05\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_id\"\xa6\x02\n\x12\x46undRecommendation\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x17\n\nfund_house\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\r\n\x05score\x18\x05 \x01(\x01\x12\x1c\n\x14suggested_allocation\x18\x06 \x01(\x01\x12\x11\n\treasoning\x18\x07 \x01(\t\x12<\n\x07metrics\x18\x08 \x03(\x0b\x32+.ml_service.FundRecommendation.MetricsEntry\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x42\r\n\x0b_fund_house\"\xbf\x01\n\x16RecommendationResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x37\n\x0frecommendations\x18\x02 \x03(\x0b\x32\x1e.ml_service.FundRecommendation\x12\x19\n\x11persona_alignment\x18\x03 \x01(\t\x12\x15\n\rmodel_version\x18\x04 \x01(\t\x12\x12\n\nlatency_ms\x18\x05 \x01(\x05\x42\r\n\x0b_request_id\"\xe8\x01\n\x17OptimizationConstraints\x12\x16\n\x0emax_equity_pct\x18\x01 \x01(\x01\x12\x14\n\x0cmin_debt_pct\x18\x02 \x01(\x01\x12\x1b\n\x13max_single_fund_pct\x18\x03 \x01(\x01\x12\x11\n\tmin_funds\x18\x04 \x01(\x05\x12\x11\n\tmax_funds\x18\x05 \x01(\x05\x12\x1a\n\rtarget_return\x18\x06 \x01(\x01H\x00\x88\x01\x01\x12\x1b\n\x0emax_volatility\x18\x07 \x01(\x01H\x01\x88\x01\x01\x42\x10\n\x0e_target_returnB\x11\n\x0f_max_volatility\"\xb2\x02\n\x0fOptimizeRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\npersona_id\x18\x02 \x01(\t\x12\x39\n\x07profile\x18\x03 \x03(\x0b\x32(.ml_service.OptimizeRequest.ProfileEntry\x12)\n\x0f\x61vailable_funds\x18\x04 \x03(\x0b\x32\x10.ml_service.Fund\x12=\n\x0b\x63onstraints\x18\x05 \x01(\x0b\x32#.ml_service.OptimizationConstraintsH\x01\x88\x01\x01\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_idB\x0e\n\x0c_constraints\"\x88\x01\n\x10\x41llocationResult\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x0e\n\x06weight\x18\x04 \x01(\x01\x12\x18\n\x0bmonthly_sip\x18\x05 \x01(\x01H\x00\x88\x01\x01\x42\x0e\n\x0c_monthly_sip\"\xbc\x01\n\x10PortfolioMetrics\x12\x17\n\x0f\x65xpected_return\x18\x01 \x01(\x01\x12\x1b\n\x13\x65xpected_volatility\x18\x02 \x01(\x01\x12\x14\n\x0csharpe_ratio\x18\x03 \x01(\x01\x12\x19\n\x0cmax_drawdown\x18\x04 \x01(\x01H\x00\x88\x01\x01\x12\x1c\n\x0fprojected_value\x18\x05 \x01(\x01H\x01\x88\x01\x01\x42\x0f\n\r_max_drawdownB\x12\n\x10_projected_value\"\xd0\x01\n\x10OptimizeResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x31\n\x0b\x61llocations\x18\x02 \x03(\x0b\x32\x1c.ml_service.AllocationResult\x12\x36\n\x10\x65xpected_metrics\x18\x03 \x01(\x0b\x32\x1c.ml_service.PortfolioMetrics\x12\x15\n\rmodel_version\x18\x04 \x01(\t\x12\x12\n\nlatency_ms\x18\x05 \x01(\x05\x42\r\n\x0b_request_id\"\xf7\x01\n\x0bRiskRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x35\n\x07profile\x18\x02 \x03(\x0b\x32$.ml_service.RiskRequest.ProfileEntry\x12+\n\x11\x63urrent_portfolio\x18\x03 \x03(\x0b\x32\x10.ml_service.Fund\x12,\n\x12proposed_portfolio\x18\x04 \x03(\x0b\x32\x10.ml_service.Fund\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_id\"l\n\nRiskFactor\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x63ontribution\x18\x02 \x01(\x01\x12\x10\n\x08severity\x18\x03 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_description\"\xeb\x01\n\x0cRiskResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\nrisk_level\x18\x02 \x01(\t\x12\x12\n\nrisk_score\x18\x03 \x01(\x01\x12,\n\x0crisk_factors\x18\x04 \x03(\x0b\x32\x16.ml_service.RiskFactor\x12\x17\n\x0frecommendations\x18\x05 \x03(\t\x12\x19\n\x11persona_alignment\x18\x06 \x01(\t\x12\x15\n\rmodel_version\x18\x07 \x01(\t\x12\x12\n\nlatency_ms\x18\x08 \x01(\x05\x42\r\n\x0b_request_id\"\x0f\n\rHealthRequest\"?\n\rServiceStatus\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x0f\n\x07healthy\x18\x03 \x01(\x08\"M\n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12+\n\x08services\x18\x02 \x03(\x0b\x32\x19.ml_service.ServiceStatus2\x8d\x03\n\tMLService\x12L\n\x0f\x43lassifyProfile\x12\x1b.ml_service.ClassifyRequest\x1a\x1c.ml_service.ClassifyResponse\x12[\n\x12GetRecommendations\x12!.ml_service.RecommendationRequest\x1a\".ml_service.RecommendationResponse\x12N\n\x11OptimizePortfolio\x12\x1b.ml_service.OptimizeRequest\x1a\x1c.ml_service.OptimizeResponse\x12?\n\nAssessRisk\x12\x17.ml_service.RiskRequest\x1a\x18.ml_service.RiskResponse\x12\x44\n\x0bHealthCheck\x12\x19.ml_service.HealthRequest\x1a\x1a.ml_service.HealthResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10ml_service.proto\x12\nml_service\"\xc1\x02\n\x07Profile\x12\x0b\n\x03\x61ge\x18\x01 \x01(\x05\x12\x11\n\x04goal\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x1a\n\rtarget_amount\x18\x03 \x01(\x01H\x01\x88\x01\x01\x12\x18\n\x0btarget_year\x18\x04 \x01(\x05H\x02\x88\x01\x01\x12\x18\n\x0bmonthly_sip\x18\x05 \x01(\x01H\x03\x88\x01\x01\x12\x15\n\x08lump_sum\x18\x06 \x01(\x01H\x04\x88\x01\x01\x12\x11\n\tliquidity\x18\x07 \x01(\t\x12\x16\n\x0erisk_tolerance\x18\x08 \x01(\t\x12\x11\n\tknowledge\x18\t \x01(\t\x12\x12\n\nvolatility\x18\n \x01(\t\x12\x15\n\rhorizon_years\x18\x0b \x01(\x05\x42\x07\n\x05_goalB\x10\n\x0e_target_amountB\x0e\n\x0c_target_yearB\x0e\n\x0c_monthly_sipB\x0b\n\t_lump_sum\"\xd6\x02\n\x04\x46und\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x16\n\treturn_1y\x18\x04 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\treturn_3y\x18\x05 \x01(\x01H\x01\x88\x01\x01\x12\x16\n\treturn_5y\x18\x06 \x01(\x01H\x02\x88\x01\x01\x12\x17\n\nvolatility\x18\x07 \x01(\x01H\x03\x88\x01\x01\x12\x19\n\x0csharpe_ratio\x18\x08 \x01(\x01H\x04\x88\x01\x01\x12\x1a\n\rexpense_ratio\x18\t \x01(\x01H\x05\x88\x01\x01\x12\x13\n\x06weight\x18\n \x01(\x01H\x06\x88\x01\x01\x42\x0c\n\n_return_1yB\x0c\n\n_return_3yB\x0c\n\n_return_5yB\r\n\x0b_volatilityB\x0f\n\r_sharpe_ratioB\x10\n\x0e_expense_ratioB\t\n\x07_weight\"$\n\x11\x42lendedAllocation\x12\x0f\n\x07weights\x18\x01 \x03(\x01\"\x8d\x01\n\x0f\x43lassifyRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12$\n\x07profile\x18\x02 \x01(\x0b\x32\x13.ml_service.Profile\x12\x1a\n\rmodel_version\x18\x03 \x01(\tH\x01\x88\x01\x01\x42\r\n\x0b_request_idB\x10\n\x0e_model_version\"n\n\x07Persona\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04slug\x18\x03 \x01(\t\x12\x11\n\trisk_band\x18\x04 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x05 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_description\"\x9d\x02\n\x10\x43lassifyResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12$\n\x07persona\x18\x02 \x01(\x0b\x32\x13.ml_service.Persona\x12\x12\n\nconfidence\x18\x03 \x01(\x01\x12\x46\n\rprobabilities\x18\x04 \x03(\x0b\x32/.ml_service.ClassifyResponse.ProbabilitiesEntry\x12\x15\n\rmodel_version\x18\x05 \x01(\t\x12\x12\n\nlatency_ms\x18\x06 \x01(\x05\x1a\x34\n\x12ProbabilitiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x42\r\n\x0b_request_id\"x\n\rPersonaWeight\x12$\n\x07persona\x18\x01 \x01(\x0b\x32\x13.ml_service.Persona\x12\x0e\n\x06weight\x18\x02 \x01(\x01\x12\x31\n\nallocation\x18\x03 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\"\x9a\x02\n\x17\x42lendedClassifyResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12,\n\x0fprimary_persona\x18\x02 \x01(\x0b\x32\x13.ml_service.Persona\x12/\n\x0c\x64istribution\x18\x03 \x03(\x0b\x32\x19.ml_service.PersonaWeight\x12\x39\n\x12\x62lended_allocation\x18\x04 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x12\n\nconfidence\x18\x05 \x01(\x01\x12\x15\n\rmodel_version\x18\x06 \x01(\t\x12\x12\n\nlatency_ms\x18\x07 \x01(\x05\x42\r\n\x0b_request_id\"j\n\x14\x43lassifyBatchRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12*\n\x05items\x18\x02 \x03(\x0b\x32\x1b.ml_service.ClassifyRequestB\r\n\x0b_request_id\"\x84\x02\n\x15RecommendationRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\npersona_id\x18\x02 \x01(\t\x12?\n\x07profile\x18\x03 \x03(\x0b\x32..ml_service.RecommendationRequest.ProfileEntry\x12\r\n\x05top_n\x18\x04 \x01(\x05\x12\x18\n\x10\x63\x61tegory_filters\x18\x05 \x03(\t\x12\x15\n\rexclude_funds\x18\x06 \x03(\x05\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_id\"\x84\x03\n\x12\x46undRecommendation\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x17\n\nfund_house\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\r\n\x05score\x18\x05 \x01(\x01\x12\x1c\n\x14suggested_allocation\x18\x06 \x01(\x01\x12\x11\n\treasoning\x18\x07 \x01(\t\x12<\n\x07metrics\x18\x08 \x03(\x0b\x32+.ml_service.FundRecommendation.MetricsEntry\x12\x18\n\x0b\x61sset_class\x18\t \x01(\tH\x01\x88\x01\x01\x12\x1d\n\x10suggested_amount\x18\n \x01(\x01H\x02\x88\x01\x01\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x42\r\n\x0b_fund_houseB\x0e\n\x0c_asset_classB\x13\n\x11_suggested_amount\"\xbf\x01\n\x16RecommendationResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x37\n\x0frecommendations\x18\x02 \x03(\x0b\x32\x1e.ml_service.FundRecommendation\x12\x19\n\x11persona_alignment\x18\x03 \x01(\t\x12\x15\n\rmodel_version\x18\x04 \x01(\t\x12\x12\n\nlatency_ms\x18\x05 \x01(\x05\x42\r\n\x0b_request_id\"\x8c\x04\n\x1c\x42lendedRecommendationRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x39\n\x12\x62lended_allocation\x18\x02 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12_\n\x14persona_distribution\x18\x03 \x03(\x0b\x32\x41.ml_service.BlendedRecommendationRequest.PersonaDistributionEntry\x12\x46\n\x07profile\x18\x04 \x03(\x0b\x32\x35.ml_service.BlendedRecommendationRequest.ProfileEntry\x12\r\n\x05top_n\x18\x05 \x01(\x05\x12\x1e\n\x11investment_amount\x18\x06 \x01(\x01H\x01\x88\x01\x01\x12\x18\n\x10\x63\x61tegory_filters\x18\x07 \x03(\t\x12\x15\n\rexclude_funds\x18\x08 \x03(\x05\x1a:\n\x18PersonaDistributionEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_idB\x14\n\x12_investment_amount\"\xa0\x01\n\x13\x41ssetClassBreakdown\x12\x13\n\x0b\x61sset_class\x18\x01 \x01(\t\x12\x19\n\x11target_allocation\x18\x02 \x01(\x01\x12\x19\n\x11\x61\x63tual_allocation\x18\x03 \x01(\x01\x12\x12\n\nfund_count\x18\x04 \x01(\x05\x12\x19\n\x0ctotal_amount\x18\x05 \x01(\x01H\x00\x88\x01\x01\x42\x0f\n\r_total_amount\"\xd9\x02\n\x1d\x42lendedRecommendationResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x37\n\x0frecommendations\x18\x02 \x03(\x0b\x32\x1e.ml_service.FundRecommendation\x12>\n\x15\x61sset_class_breakdown\x18\x03 \x03(\x0b\x32\x1f.ml_service.AssetClassBreakdown\x12\x38\n\x11target_allocation\x18\x04 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x17\n\x0f\x61lignment_score\x18\x05 \x01(\x01\x12\x19\n\x11\x61lignment_message\x18\x06 \x01(\t\x12\x15\n\rmodel_version\x18\x07 \x01(\t\x12\x12\n\nlatency_ms\x18\x08 \x01(\x05\x42\r\n\x0b_request_id\"\x84\x01\n!BlendedRecommendationBatchRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x37\n\x05items\x18\x02 \x03(\x0b\x32(.ml_service.BlendedRecommendationRequestB\r\n\x0b_request_id\"\xb3\x01\n\"BlendedRecommendationBatchResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12:\n\x07results\x18\x02 \x03(\x0b\x32).ml_service.BlendedRecommendationResponse\x12\x15\n\rmodel_version\x18\x03 \x01(\t\x12\x12\n\nlatency_ms\x18\x04 \x01(\x05\x42\r\n\x0b_request_id\"\xe8\x01\n\x17OptimizationConstraints\x12\x16\n\x0emax_equity_pct\x18\x01 \x01(\x01\x12\x14\n\x0cmin_debt_pct\x18\x02 \x01(\x01\x12\x1b\n\x13max_single_fund_pct\x18\x03 \x01(\x01\x12\x11\n\tmin_funds\x18\x04 \x01(\x05\x12\x11\n\tmax_funds\x18\x05 \x01(\x05\x12\x1a\n\rtarget_return\x18\x06 \x01(\x01H\x00\x88\x01\x01\x12\x1b\n\x0emax_volatility\x18\x07 \x01(\x01H\x01\x88\x01\x01\x42\x10\n\x0e_target_returnB\x11\n\x0f_max_volatility\"\xd2\x02\n\x0fOptimizeRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\npersona_id\x18\x02 \x01(\t\x12\x39\n\x07profile\x18\x03 \x03(\x0b\x32(.ml_service.OptimizeRequest.ProfileEntry\x12)\n\x0f\x61vailable_funds\x18\x04 \x03(\x0b\x32\x10.ml_service.Fund\x12=\n\x0b\x63onstraints\x18\x05 \x01(\x0b\x32#.ml_service.OptimizationConstraintsH\x01\x88\x01\x01\x12\x13\n\x06method\x18\x06 \x01(\tH\x02\x88\x01\x01\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_idB\x0e\n\x0c_constraintsB\t\n\x07_method\"\x88\x01\n\x10\x41llocationResult\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x0e\n\x06weight\x18\x04 \x01(\x01\x12\x18\n\x0bmonthly_sip\x18\x05 \x01(\x01H\x00\x88\x01\x01\x42\x0e\n\x0c_monthly_sip\"\xbc\x01\n\x10PortfolioMetrics\x12\x17\n\x0f\x65xpected_return\x18\x01 \x01(\x01\x12\x1b\n\x13\x65xpected_volatility\x18\x02 \x01(\x01\x12\x14\n\x0csharpe_ratio\x18\x03 \x01(\x01\x12\x19\n\x0cmax_drawdown\x18\x04 \x01(\x01H\x00\x88\x01\x01\x12\x1c\n\x0fprojected_value\x18\x05 \x01(\x01H\x01\x88\x01\x01\x42\x0f\n\r_max_drawdownB\x12\n\x10_projected_value\"\xd0\x01\n\x10OptimizeResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x31\n\x0b\x61llocations\x18\x02 \x03(\x0b\x32\x1c.ml_service.AllocationResult\x12\x36\n\x10\x65xpected_metrics\x18\x03 \x01(\x0b\x32\x1c.ml_service.PortfolioMetrics\x12\x15\n\rmodel_version\x18\x04 \x01(\t\x12\x12\n\nlatency_ms\x18\x05 \x01(\x05\x42\r\n\x0b_request_id\"\xf7\x01\n\x0bRiskRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x35\n\x07profile\x18\x02 \x03(\x0b\x32$.ml_service.RiskRequest.ProfileEntry\x12+\n\x11\x63urrent_portfolio\x18\x03 \x03(\x0b\x32\x10.ml_service.Fund\x12,\n\x12proposed_portfolio\x18\x04 \x03(\x0b\x32\x10.ml_service.Fund\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_id\"l\n\nRiskFactor\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x63ontribution\x18\x02 \x01(\x01\x12\x10\n\x08severity\x18\x03 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_description\"\xeb\x01\n\x0cRiskResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\nrisk_level\x18\x02 \x01(\t\x12\x12\n\nrisk_score\x18\x03 \x01(\x01\x12,\n\x0crisk_factors\x18\x04 \x03(\x0b\x32\x16.ml_service.RiskFactor\x12\x17\n\x0frecommendations\x18\x05 \x03(\t\x12\x19\n\x11persona_alignment\x18\x06 \x01(\t\x12\x15\n\rmodel_version\x18\x07 \x01(\t\x12\x12\n\nlatency_ms\x18\x08 \x01(\x05\x42\r\n\x0b_request_id\"\x9f\x02\n\x10PortfolioHolding\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x18\n\x0bscheme_name\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61mount\x18\x03 \x01(\x01H\x01\x88\x01\x01\x12\x12\n\x05units\x18\x04 \x01(\x01H\x02\x88\x01\x01\x12\x1a\n\rpurchase_date\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x1b\n\x0epurchase_price\x18\x06 \x01(\x01H\x04\x88\x01\x01\x12\x1c\n\x0fpurchase_amount\x18\x07 \x01(\x01H\x05\x88\x01\x01\x42\x0e\n\x0c_scheme_nameB\t\n\x07_amountB\x08\n\x06_unitsB\x10\n\x0e_purchase_dateB\x11\n\x0f_purchase_priceB\x12\n\x10_purchase_amount\"\xa0\x02\n\x18PortfolioAnalysisRequest\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12.\n\x08holdings\x18\x02 \x03(\x0b\x32\x1c.ml_service.PortfolioHolding\x12\x38\n\x11target_allocation\x18\x03 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x42\n\x07profile\x18\x04 \x03(\x0b\x32\x31.ml_service.PortfolioAnalysisRequest.ProfileEntry\x1a.\n\x0cProfileEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\r\n\x0b_request_id\"\xa7\x04\n\x0f\x45nrichedHolding\x12\x13\n\x0bscheme_code\x18\x01 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x13\n\x0b\x61sset_class\x18\x04 \x01(\t\x12\x15\n\rcurrent_value\x18\x05 \x01(\x01\x12\x0e\n\x06weight\x18\x06 \x01(\x01\x12\x12\n\x05units\x18\x07 \x01(\x01H\x00\x88\x01\x01\x12\x10\n\x03nav\x18\x08 \x01(\x01H\x01\x88\x01\x01\x12\x16\n\treturn_1y\x18\t \x01(\x01H\x02\x88\x01\x01\x12\x16\n\treturn_3y\x18\n \x01(\x01H\x03\x88\x01\x01\x12\x17\n\nvolatility\x18\x0b \x01(\x01H\x04\x88\x01\x01\x12\x19\n\x0csharpe_ratio\x18\x0c \x01(\x01H\x05\x88\x01\x01\x12 \n\x13holding_period_days\x18\r \x01(\x05H\x06\x88\x01\x01\x12\x17\n\ntax_status\x18\x0e \x01(\tH\x07\x88\x01\x01\x12\x1c\n\x0fpurchase_amount\x18\x0f \x01(\x01H\x08\x88\x01\x01\x12\x1c\n\x0funrealized_gain\x18\x10 \x01(\x01H\t\x88\x01\x01\x42\x08\n\x06_unitsB\x06\n\x04_navB\x0c\n\n_return_1yB\x0c\n\n_return_3yB\r\n\x0b_volatilityB\x0f\n\r_sharpe_ratioB\x16\n\x14_holding_period_daysB\r\n\x0b_tax_statusB\x12\n\x10_purchase_amountB\x12\n\x10_unrealized_gain\"\xd7\x04\n\x11RebalancingAction\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\x12\x10\n\x08priority\x18\x02 \x01(\t\x12\x13\n\x0bscheme_code\x18\x03 \x01(\x05\x12\x13\n\x0bscheme_name\x18\x04 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x05 \x01(\t\x12\x13\n\x0b\x61sset_class\x18\x06 \x01(\t\x12\x1a\n\rcurrent_value\x18\x07 \x01(\x01H\x00\x88\x01\x01\x12\x1b\n\x0e\x63urrent_weight\x18\x08 \x01(\x01H\x01\x88\x01\x01\x12\x1a\n\rcurrent_units\x18\t \x01(\x01H\x02\x88\x01\x01\x12\x14\n\x0ctarget_value\x18\n \x01(\x01\x12\x15\n\rtarget_weight\x18\x0b \x01(\x01\x12\x1a\n\x12transaction_amount\x18\x0c \x01(\x01\x12\x1e\n\x11transaction_units\x18\r \x01(\x01H\x03\x88\x01\x01\x12\x17\n\ntax_status\x18\x0e \x01(\tH\x04\x88\x01\x01\x12 \n\x13holding_period_days\x18\x0f \x01(\x05H\x05\x88\x01\x01\x12\x1b\n\x0e\x65stimated_gain\x18\x10 \x01(\x01H\x06\x88\x01\x01\x12\x15\n\x08tax_note\x18\x11 \x01(\tH\x07\x88\x01\x01\x12\x0e\n\x06reason\x18\x12 \x01(\tB\x10\n\x0e_current_valueB\x11\n\x0f_current_weightB\x10\n\x0e_current_unitsB\x14\n\x12_transaction_unitsB\r\n\x0b_tax_statusB\x16\n\x14_holding_period_daysB\x11\n\x0f_estimated_gainB\x0b\n\t_tax_note\"E\n\x11\x43\x61tegoryBreakdown\x12\x12\n\nallocation\x18\x01 \x01(\x01\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\r\n\x05value\x18\x03 \x01(\x01\"\xc1\x03\n\x0e\x43urrentMetrics\x12\x13\n\x0btotal_value\x18\x01 \x01(\x01\x12\x16\n\x0etotal_holdings\x18\x02 \x01(\x05\x12\x1f\n\x12weighted_return_1y\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1f\n\x12weighted_return_3y\x18\x04 \x01(\x01H\x01\x88\x01\x01\x12 \n\x13weighted_volatility\x18\x05 \x01(\x01H\x02\x88\x01\x01\x12\x1c\n\x0fweighted_sharpe\x18\x06 \x01(\x01H\x03\x88\x01\x01\x12M\n\x12\x63\x61tegory_breakdown\x18\x07 \x03(\x0b\x32\x31.ml_service.CurrentMetrics.CategoryBreakdownEntry\x1aW\n\x16\x43\x61tegoryBreakdownEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12,\n\x05value\x18\x02 \x01(\x0b\x32\x1d.ml_service.CategoryBreakdown:\x02\x38\x01\x42\x15\n\x13_weighted_return_1yB\x15\n\x13_weighted_return_3yB\x16\n\x14_weighted_volatilityB\x12\n\x10_weighted_sharpe\"\xc0\x01\n\x0f\x41nalysisSummary\x12\x12\n\nis_aligned\x18\x01 \x01(\x08\x12\x17\n\x0f\x61lignment_score\x18\x02 \x01(\x01\x12\x16\n\x0eprimary_issues\x18\x03 \x03(\t\x12\x19\n\x11total_sell_amount\x18\x04 \x01(\x01\x12\x18\n\x10total_buy_amount\x18\x05 \x01(\x01\x12\x17\n\x0fnet_transaction\x18\x06 \x01(\x01\x12\x1a\n\x12tax_impact_summary\x18\x07 \x01(\t\"\xe9\x03\n\x19PortfolioAnalysisResponse\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x39\n\x12\x63urrent_allocation\x18\x02 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x38\n\x11target_allocation\x18\x03 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x36\n\x0f\x61llocation_gaps\x18\x04 \x01(\x0b\x32\x1d.ml_service.BlendedAllocation\x12\x33\n\x0f\x63urrent_metrics\x18\x05 \x01(\x0b\x32\x1a.ml_service.CurrentMetrics\x12-\n\x08holdings\x18\x06 \x03(\x0b\x32\x1b.ml_service.EnrichedHolding\x12:\n\x13rebalancing_actions\x18\x07 \x03(\x0b\x32\x1d.ml_service.RebalancingAction\x12,\n\x07summary\x18\x08 \x01(\x0b\x32\x1b.ml_service.AnalysisSummary\x12\x15\n\rmodel_version\x18\t \x01(\t\x12\x12\n\nlatency_ms\x18\n \x01(\x01\x42\r\n\x0b_request_id\"\x0f\n\rHealthRequest\"?\n\rServiceStatus\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x0f\n\x07healthy\x18\x03 \x01(\x08\"M\n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12+\n\x08services\x18\x02 \x03(\x0b\x32\x19.ml_service.ServiceStatus2\xda\x08\n\tMLService\x12L\n\x0f\x43lassifyProfile\x12\x1b.ml_service.ClassifyRequest\x1a\x1c.ml_service.ClassifyResponse\x12X\n\rClassifyBatch\x12 .ml_service.ClassifyBatchRequest\x1a#.ml_service.BlendedClassifyResponse0\x01\x12S\n\x0f\x43lassifyBlended\x12\x1b.ml_service.ClassifyRequest\x1a#.ml_service.BlendedClassifyResponse\x12[\n\x12GetRecommendations\x12!.ml_service.RecommendationRequest\x1a\".ml_service.RecommendationResponse\x12p\n\x19GetBlendedRecommendations\x12(.ml_service.BlendedRecommendationRequest\x1a).ml_service.BlendedRecommendationResponse\x12\x7f\n\x1eGetBlendedRecommendationsBatch\x12-.ml_service.BlendedRecommendationBatchRequest\x1a..ml_service.BlendedRecommendationBatchResponse\x12V\n\x0eStreamClassify\x12\x1b.ml_service.ClassifyRequest\x1a#.ml_service.BlendedClassifyResponse(\x01\x30\x01\x12p\n\x15StreamRecommendations\x12(.ml_service.BlendedRecommendationRequest\x1a).ml_service.BlendedRecommendationResponse(\x01\x30\x01\x12N\n\x11OptimizePortfolio\x12\x1b.ml_service.OptimizeRequest\x1a\x1c.ml_service.OptimizeResponse\x12?\n\nAssessRisk\x12\x17.ml_service.RiskRequest\x1a\x18.ml_service.RiskResponse\x12_\n\x10\x41nalyzePortfolio\x12$.ml_service.PortfolioAnalysisRequest\x1a%.ml_service.PortfolioAnalysisResponse\x12\x44\n\x0bHealthCheck\x12\x19.ml_service.HealthRequest\x1a\x1a.ml_service.HealthResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -37,58 +37,108 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_RECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_options = b'8\001'
   _globals['_FUNDRECOMMENDATION_METRICSENTRY']._loaded_options = None
   _globals['_FUNDRECOMMENDATION_METRICSENTRY']._serialized_options = b'8\001'
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PERSONADISTRIBUTIONENTRY']._loaded_options = None
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PERSONADISTRIBUTIONENTRY']._serialized_options = b'8\001'
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PROFILEENTRY']._loaded_options = None
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_options = b'8\001'
   _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._loaded_options = None
   _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._serialized_options = b'8\001'
   _globals['_RISKREQUEST_PROFILEENTRY']._loaded_options = None
   _globals['_RISKREQUEST_PROFILEENTRY']._serialized_options = b'8\001'
+  _globals['_PORTFOLIOANALYSISREQUEST_PROFILEENTRY']._loaded_options = None
+  _globals['_PORTFOLIOANALYSISREQUEST_PROFILEENTRY']._serialized_options = b'8\001'
+  _globals['_CURRENTMETRICS_CATEGORYBREAKDOWNENTRY']._loaded_options = None
+  _globals['_CURRENTMETRICS_CATEGORYBREAKDOWNENTRY']._serialized_options = b'8\001'
   _globals['_PROFILE']._serialized_start=33
   _globals['_PROFILE']._serialized_end=354
   _globals['_FUND']._serialized_start=357
   _globals['_FUND']._serialized_end=699
-  _globals['_CLASSIFYREQUEST']._serialized_start=702
-  _globals['_CLASSIFYREQUEST']._serialized_end=843
-  _globals['_PERSONA']._serialized_start=845
-  _globals['_PERSONA']._serialized_end=955
-  _globals['_CLASSIFYRESPONSE']._serialized_start=958
-  _globals['_CLASSIFYRESPONSE']._serialized_end=1243
-  _globals['_CLASSIFYRESPONSE_PROBABILITIESENTRY']._serialized_start=1176
-  _globals['_CLASSIFYRESPONSE_PROBABILITIESENTRY']._serialized_end=1228
-  _globals['_RECOMMENDATIONREQUEST']._serialized_start=1246
-  _globals['_RECOMMENDATIONREQUEST']._serialized_end=1506
-  _globals['_RECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_start=1445
-  _globals['_RECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_end=1491
-  _globals['_FUNDRECOMMENDATION']._serialized_start=1509
-  _globals['_FUNDRECOMMENDATION']._serialized_end=1803
-  _globals['_FUNDRECOMMENDATION_METRICSENTRY']._serialized_start=1742
-  _globals['_FUNDRECOMMENDATION_METRICSENTRY']._serialized_end=1788
-  _globals['_RECOMMENDATIONRESPONSE']._serialized_start=1806
-  _globals['_RECOMMENDATIONRESPONSE']._serialized_end=1997
-  _globals['_OPTIMIZATIONCONSTRAINTS']._serialized_start=2000
-  _globals['_OPTIMIZATIONCONSTRAINTS']._serialized_end=2232
-  _globals['_OPTIMIZEREQUEST']._serialized_start=2235
-  _globals['_OPTIMIZEREQUEST']._serialized_end=2541
-  _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._serialized_start=1445
-  _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._serialized_end=1491
-  _globals['_ALLOCATIONRESULT']._serialized_start=2544
-  _globals['_ALLOCATIONRESULT']._serialized_end=2680
-  _globals['_PORTFOLIOMETRICS']._serialized_start=2683
-  _globals['_PORTFOLIOMETRICS']._serialized_end=2871
-  _globals['_OPTIMIZERESPONSE']._serialized_start=2874
-  _globals['_OPTIMIZERESPONSE']._serialized_end=3082
-  _globals['_RISKREQUEST']._serialized_start=3085
-  _globals['_RISKREQUEST']._serialized_end=3332
-  _globals['_RISKREQUEST_PROFILEENTRY']._serialized_start=1445
-  _globals['_RISKREQUEST_PROFILEENTRY']._serialized_end=1491
-  _globals['_RISKFACTOR']._serialized_start=3334
-  _globals['_RISKFACTOR']._serialized_end=3442
-  _globals['_RISKRESPONSE']._serialized_start=3445
-  _globals['_RISKRESPONSE']._serialized_end=3680
-  _globals['_HEALTHREQUEST']._serialized_start=3682
-  _globals['_HEALTHREQUEST']._serialized_end=3697
-  _globals['_SERVICESTATUS']._serialized_start=3699
-  _globals['_SERVICESTATUS']._serialized_end=3762
-  _globals['_HEALTHRESPONSE']._serialized_start=3764
-  _globals['_HEALTHRESPONSE']._serialized_end=3841
-  _globals['_MLSERVICE']._serialized_start=3844
-  _globals['_MLSERVICE']._serialized_end=4241
+  _globals['_BLENDEDALLOCATION']._serialized_start=701
+  _globals['_BLENDEDALLOCATION']._serialized_end=737
+  _globals['_CLASSIFYREQUEST']._serialized_start=740
+  _globals['_CLASSIFYREQUEST']._serialized_end=881
+  _globals['_PERSONA']._serialized_start=883
+  _globals['_PERSONA']._serialized_end=993
+  _globals['_CLASSIFYRESPONSE']._serialized_start=996
+  _globals['_CLASSIFYRESPONSE']._serialized_end=1281
+  _globals['_CLASSIFYRESPONSE_PROBABILITIESENTRY']._serialized_start=1214
+  _globals['_CLASSIFYRESPONSE_PROBABILITIESENTRY']._serialized_end=1266
+  _globals['_PERSONAWEIGHT']._serialized_start=1283
+  _globals['_PERSONAWEIGHT']._serialized_end=1403
+  _globals['_BLENDEDCLASSIFYRESPONSE']._serialized_start=1406
+  _globals['_BLENDEDCLASSIFYRESPONSE']._serialized_end=1688
+  _globals['_CLASSIFYBATCHREQUEST']._serialized_start=1690
+  _globals['_CLASSIFYBATCHREQUEST']._serialized_end=1796
+  _globals['_RECOMMENDATIONREQUEST']._serialized_start=1799
+  _globals['_RECOMMENDATIONREQUEST']._serialized_end=2059
+  _globals['_RECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_start=1998
+  _globals['_RECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_end=2044
+  _globals['_FUNDRECOMMENDATION']._serialized_start=2062
+  _globals['_FUNDRECOMMENDATION']._serialized_end=2450
+  _globals['_FUNDRECOMMENDATION_METRICSENTRY']._serialized_start=2352
+  _globals['_FUNDRECOMMENDATION_METRICSENTRY']._serialized_end=2398
+  _globals['_RECOMMENDATIONRESPONSE']._serialized_start=2453
+  _globals['_RECOMMENDATIONRESPONSE']._serialized_end=2644
+  _globals['_BLENDEDRECOMMENDATIONREQUEST']._serialized_start=2647
+  _globals['_BLENDEDRECOMMENDATIONREQUEST']._serialized_end=3171
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PERSONADISTRIBUTIONENTRY']._serialized_start=3028
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PERSONADISTRIBUTIONENTRY']._serialized_end=3086
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_start=1998
+  _globals['_BLENDEDRECOMMENDATIONREQUEST_PROFILEENTRY']._serialized_end=2044
+  _globals['_ASSETCLASSBREAKDOWN']._serialized_start=3174
+  _globals['_ASSETCLASSBREAKDOWN']._serialized_end=3334
+  _globals['_BLENDEDRECOMMENDATIONRESPONSE']._serialized_start=3337
+  _globals['_BLENDEDRECOMMENDATIONRESPONSE']._serialized_end=3682
+  _globals['_BLENDEDRECOMMENDATIONBATCHREQUEST']._serialized_start=3685
+  _globals['_BLENDEDRECOMMENDATIONBATCHREQUEST']._serialized_end=3817
+  _globals['_BLENDEDRECOMMENDATIONBATCHRESPONSE']._serialized_start=3820
+  _globals['_BLENDEDRECOMMENDATIONBATCHRESPONSE']._serialized_end=3999
+  _globals['_OPTIMIZATIONCONSTRAINTS']._serialized_start=4002
+  _globals['_OPTIMIZATIONCONSTRAINTS']._serialized_end=4234
+  _globals['_OPTIMIZEREQUEST']._serialized_start=4237
+  _globals['_OPTIMIZEREQUEST']._serialized_end=4575
+  _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._serialized_start=1998
+  _globals['_OPTIMIZEREQUEST_PROFILEENTRY']._serialized_end=2044
+  _globals['_ALLOCATIONRESULT']._serialized_start=4578
+  _globals['_ALLOCATIONRESULT']._serialized_end=4714
+  _globals['_PORTFOLIOMETRICS']._serialized_start=4717
+  _globals['_PORTFOLIOMETRICS']._serialized_end=4905
+  _globals['_OPTIMIZERESPONSE']._serialized_start=4908
+  _globals['_OPTIMIZERESPONSE']._serialized_end=5116
+  _globals['_RISKREQUEST']._serialized_start=5119
+  _globals['_RISKREQUEST']._serialized_end=5366
+  _globals['_RISKREQUEST_PROFILEENTRY']._serialized_start=1998
+  _globals['_RISKREQUEST_PROFILEENTRY']._serialized_end=2044
+  _globals['_RISKFACTOR']._serialized_start=5368
+  _globals['_RISKFACTOR']._serialized_end=5476
+  _globals['_RISKRESPONSE']._serialized_start=5479
+  _globals['_RISKRESPONSE']._serialized_end=5714
+  _globals['_PORTFOLIOHOLDING']._serialized_start=5717
+  _globals['_PORTFOLIOHOLDING']._serialized_end=6004
+  _globals['_PORTFOLIOANALYSISREQUEST']._serialized_start=6007
+  _globals['_PORTFOLIOANALYSISREQUEST']._serialized_end=6295
+  _globals['_PORTFOLIOANALYSISREQUEST_PROFILEENTRY']._serialized_start=1998
+  _globals['_PORTFOLIOANALYSISREQUEST_PROFILEENTRY']._serialized_end=2044
+  _globals['_ENRICHEDHOLDING']._serialized_start=6298
+  _globals['_ENRICHEDHOLDING']._serialized_end=6849
+  _globals['_REBALANCINGACTION']._serialized_start=6852
+  _globals['_REBALANCINGACTION']._serialized_end=7451
+  _globals['_CATEGORYBREAKDOWN']._serialized_start=7453
+  _globals['_CATEGORYBREAKDOWN']._serialized_end=7522
+  _globals['_CURRENTMETRICS']._serialized_start=7525
+  _globals['_CURRENTMETRICS']._serialized_end=7974
+  _globals['_CURRENTMETRICS_CATEGORYBREAKDOWNENTRY']._serialized_start=7797
+  _globals['_CURRENTMETRICS_CATEGORYBREAKDOWNENTRY']._serialized_end=7884
+  _globals['_ANALYSISSUMMARY']._serialized_start=7977
+  _globals['_ANALYSISSUMMARY']._serialized_end=8169
+  _globals['_PORTFOLIOANALYSISRESPONSE']._serialized_start=8172
+  _globals['_PORTFOLIOANALYSISRESPONSE']._serialized_end=8661
+  _globals['_HEALTHREQUEST']._serialized_start=8663
+  _globals['_HEALTHREQUEST']._serialized_end=8678
+  _globals['_SERVICESTATUS']._serialized_start=8680
+  _globals['_SERVICESTATUS']._serialized_end=8743
+  _globals['_HEALTHRESPONSE']._serialized_start=8745
+  _globals['_HEALTHRESPONSE']._serialized_end=8822
+  _globals['_MLSERVICE']._serialized_start=8825
+  _globals['_MLSERVICE']._serialized_end=9939
 # @@protoc_insertion_point(module_scope)
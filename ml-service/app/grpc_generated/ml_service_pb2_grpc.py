@@ -40,11 +40,41 @@ class MLServiceStub(object):
                 request_serializer=ml__service__pb2.ClassifyRequest.SerializeToString,
                 response_deserializer=ml__service__pb2.ClassifyResponse.FromString,
                 _registered_method=True)
+        self.ClassifyBatch = channel.unary_stream(
+                '/ml_service.MLService/ClassifyBatch',
+                request_serializer=ml__service__pb2.ClassifyBatchRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedClassifyResponse.FromString,
+                _registered_method=True)
+        self.ClassifyBlended = channel.unary_unary(
+                '/ml_service.MLService/ClassifyBlended',
+                request_serializer=ml__service__pb2.ClassifyRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedClassifyResponse.FromString,
+                _registered_method=True)
         self.GetRecommendations = channel.unary_unary(
                 '/ml_service.MLService/GetRecommendations',
                 request_serializer=ml__service__pb2.RecommendationRequest.SerializeToString,
                 response_deserializer=ml__service__pb2.RecommendationResponse.FromString,
                 _registered_method=True)
+        self.GetBlendedRecommendations = channel.unary_unary(
+                '/ml_service.MLService/GetBlendedRecommendations',
+                request_serializer=ml__service__pb2.BlendedRecommendationRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedRecommendationResponse.FromString,
+                _registered_method=True)
+        self.GetBlendedRecommendationsBatch = channel.unary_unary(
+                '/ml_service.MLService/GetBlendedRecommendationsBatch',
+                request_serializer=ml__service__pb2.BlendedRecommendationBatchRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedRecommendationBatchResponse.FromString,
+                _registered_method=True)
+        self.StreamClassify = channel.stream_stream(
+                '/ml_service.MLService/StreamClassify',
+                request_serializer=ml__service__pb2.ClassifyRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedClassifyResponse.FromString,
+                _registered_method=True)
+        self.StreamRecommendations = channel.stream_stream(
+                '/ml_service.MLService/StreamRecommendations',
+                request_serializer=ml__service__pb2.BlendedRecommendationRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.BlendedRecommendationResponse.FromString,
+                _registered_method=True)
         self.OptimizePortfolio = channel.unary_unary(
                 '/ml_service.MLService/OptimizePortfolio',
                 request_serializer=ml__service__pb2.OptimizeRequest.SerializeToString,
@@ -55,6 +85,11 @@ class MLServiceStub(object):
                 request_serializer=ml__service__pb2.RiskRequest.SerializeToString,
                 response_deserializer=ml__service__pb2.RiskResponse.FromString,
                 _registered_method=True)
+        self.AnalyzePortfolio = channel.unary_unary(
+                '/ml_service.MLService/AnalyzePortfolio',
+                request_serializer=ml__service__pb2.PortfolioAnalysisRequest.SerializeToString,
+                response_deserializer=ml__service__pb2.PortfolioAnalysisResponse.FromString,
+                _registered_method=True)
         self.HealthCheck = channel.unary_unary(
                 '/ml_service.MLService/HealthCheck',
                 request_serializer=ml__service__pb2.HealthRequest.SerializeToString,
@@ -73,6 +108,20 @@ class MLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ClassifyBatch(self, request, context):
+        """Blended classification for many profiles; results are streamed back in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClassifyBlended(self, request, context):
+        """Classify user profile into a weighted distribution across all personas
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetRecommendations(self, request, context):
         """Get fund recommendations based on persona
         """
@@ -80,6 +129,34 @@ class MLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetBlendedRecommendations(self, request, context):
+        """Get fund recommendations matching blended allocation targets
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBlendedRecommendationsBatch(self, request, context):
+        """Get blended-allocation fund recommendations for many clients at once
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamClassify(self, request_iterator, context):
+        """Streaming variants for bulk jobs: requests are micro-batched on the server
+        and results are streamed back in request order as each batch finishes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamRecommendations(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def OptimizePortfolio(self, request, context):
         """Optimize portfolio allocation
         """
@@ -94,6 +171,13 @@ class MLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AnalyzePortfolio(self, request, context):
+        """Analyze current holdings against a target allocation (rebalancing roadmap)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def HealthCheck(self, request, context):
         """Health check
         """
@@ -109,11 +193,41 @@ def add_MLServiceServicer_to_server(servicer, server):
                     request_deserializer=ml__service__pb2.ClassifyRequest.FromString,
                     response_serializer=ml__service__pb2.ClassifyResponse.SerializeToString,
             ),
+            'ClassifyBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.ClassifyBatch,
+                    request_deserializer=ml__service__pb2.ClassifyBatchRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedClassifyResponse.SerializeToString,
+            ),
+            'ClassifyBlended': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClassifyBlended,
+                    request_deserializer=ml__service__pb2.ClassifyRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedClassifyResponse.SerializeToString,
+            ),
             'GetRecommendations': grpc.unary_unary_rpc_method_handler(
                     servicer.GetRecommendations,
                     request_deserializer=ml__service__pb2.RecommendationRequest.FromString,
                     response_serializer=ml__service__pb2.RecommendationResponse.SerializeToString,
             ),
+            'GetBlendedRecommendations': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBlendedRecommendations,
+                    request_deserializer=ml__service__pb2.BlendedRecommendationRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedRecommendationResponse.SerializeToString,
+            ),
+            'GetBlendedRecommendationsBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBlendedRecommendationsBatch,
+                    request_deserializer=ml__service__pb2.BlendedRecommendationBatchRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedRecommendationBatchResponse.SerializeToString,
+            ),
+            'StreamClassify': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamClassify,
+                    request_deserializer=ml__service__pb2.ClassifyRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedClassifyResponse.SerializeToString,
+            ),
+            'StreamRecommendations': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamRecommendations,
+                    request_deserializer=ml__service__pb2.BlendedRecommendationRequest.FromString,
+                    response_serializer=ml__service__pb2.BlendedRecommendationResponse.SerializeToString,
+            ),
             'OptimizePortfolio': grpc.unary_unary_rpc_method_handler(
                     servicer.OptimizePortfolio,
                     request_deserializer=ml__service__pb2.OptimizeRequest.FromString,
@@ -124,6 +238,11 @@ def add_MLServiceServicer_to_server(servicer, server):
                     request_deserializer=ml__service__pb2.RiskRequest.FromString,
                     response_serializer=ml__service__pb2.RiskResponse.SerializeToString,
             ),
+            'AnalyzePortfolio': grpc.unary_unary_rpc_method_handler(
+                    servicer.AnalyzePortfolio,
+                    request_deserializer=ml__service__pb2.PortfolioAnalysisRequest.FromString,
+                    response_serializer=ml__service__pb2.PortfolioAnalysisResponse.SerializeToString,
+            ),
             'HealthCheck': grpc.unary_unary_rpc_method_handler(
                     servicer.HealthCheck,
                     request_deserializer=ml__service__pb2.HealthRequest.FromString,
@@ -168,6 +287,60 @@ class MLService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ClassifyBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ml_service.MLService/ClassifyBatch',
+            ml__service__pb2.ClassifyBatchRequest.SerializeToString,
+            ml__service__pb2.BlendedClassifyResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ClassifyBlended(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ml_service.MLService/ClassifyBlended',
+            ml__service__pb2.ClassifyRequest.SerializeToString,
+            ml__service__pb2.BlendedClassifyResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetRecommendations(request,
             target,
@@ -195,6 +368,114 @@ class MLService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetBlendedRecommendations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ml_service.MLService/GetBlendedRecommendations',
+            ml__service__pb2.BlendedRecommendationRequest.SerializeToString,
+            ml__service__pb2.BlendedRecommendationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetBlendedRecommendationsBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ml_service.MLService/GetBlendedRecommendationsBatch',
+            ml__service__pb2.BlendedRecommendationBatchRequest.SerializeToString,
+            ml__service__pb2.BlendedRecommendationBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamClassify(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/ml_service.MLService/StreamClassify',
+            ml__service__pb2.ClassifyRequest.SerializeToString,
+            ml__service__pb2.BlendedClassifyResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamRecommendations(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/ml_service.MLService/StreamRecommendations',
+            ml__service__pb2.BlendedRecommendationRequest.SerializeToString,
+            ml__service__pb2.BlendedRecommendationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def OptimizePortfolio(request,
             target,
@@ -249,6 +530,33 @@ class MLService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def AnalyzePortfolio(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ml_service.MLService/AnalyzePortfolio',
+            ml__service__pb2.PortfolioAnalysisRequest.SerializeToString,
+            ml__service__pb2.PortfolioAnalysisResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def HealthCheck(request,
             target,
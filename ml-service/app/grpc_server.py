@@ -1,41 +1,126 @@
 """
 gRPC Server for ML Service.
+
+Runs as a grpc.aio server on the application's event loop. Handlers share
+the service instances, fund universe snapshot and execution lanes with the
+REST routes, so CPU-bound calls are dispatched exactly as their REST
+counterparts are and concurrency is bounded by ``max_concurrent_rpcs``
+rather than by a thread pool size.
 """
 
+import asyncio
 import grpc
-from concurrent import futures
 import logging
+from typing import Any, AsyncIterator, List, Optional
 
 from app.grpc_generated import ml_service_pb2, ml_service_pb2_grpc
 from app.services import (
-    PersonaService,
-    PortfolioService,
-    RecommendationService,
-    RiskService,
+    persona_service,
+    portfolio_service,
+    recommendation_service,
+    risk_service,
+    portfolio_analysis_service,
 )
+from app.services.executor_service import executor_service
 from app.schemas.profile import ProfileInput, Liquidity, RiskTolerance, Knowledge, Volatility
 from app.schemas.portfolio import FundInput, OptimizationConstraints
+from app.schemas.recommendation import AllocationTarget
+from app.schemas.portfolio_analysis import (
+    AllocationTarget as PortfolioAllocationTarget,
+    PortfolioHoldingInput,
+)
 
 logger = logging.getLogger(__name__)
 
+# Order of the weights in a proto BlendedAllocation
+ALLOCATION_ASSET_CLASSES = ("equity", "debt", "hybrid", "gold", "international", "liquid")
+
+
+# Streaming RPC defaults: largest micro-batch and how long to wait for it to fill
+STREAM_MAX_BATCH = 256
+STREAM_MAX_WAIT_MS = 5
+
+
+async def _micro_batches(
+    request_iterator: AsyncIterator[Any], max_batch: int, max_wait_ms: float
+) -> AsyncIterator[List[Any]]:
+    """
+    Group a request stream into batches of at most ``max_batch``.
+
+    A batch is emitted once it is full, the stream ends, or ``max_wait_ms``
+    has passed since its first request arrived. Requests keep being read
+    (up to a few batches ahead) while the caller processes a batch, so
+    reading, computing and writing overlap.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=4 * max_batch)
+    end = object()
+
+    async def read():
+        error = None
+        try:
+            async for request in request_iterator:
+                await queue.put(request)
+        except Exception as e:
+            error = e
+        await queue.put(end)
+        if error is not None:
+            raise error
+
+    reader = asyncio.create_task(read())
+    loop = asyncio.get_running_loop()
+    try:
+        done = False
+        while not done:
+            first = await queue.get()
+            if first is end:
+                break
+            batch = [first]
+            deadline = loop.time() + max_wait_ms / 1000
+            while len(batch) < max_batch:
+                try:
+                    request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if request is end:
+                    done = True
+                    break
+                batch.append(request)
+            yield batch
+        # Surface errors from reading the request stream
+        await reader
+    finally:
+        if not reader.done():
+            reader.cancel()
+
 
 class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
     """gRPC servicer implementing ML Service methods."""
 
-    def __init__(self):
-        self.persona_service = PersonaService()
-        self.portfolio_service = PortfolioService()
-        self.recommendation_service = RecommendationService()
-        self.risk_service = RiskService()
+    def __init__(self, stream_max_batch: int = STREAM_MAX_BATCH, stream_max_wait_ms: float = STREAM_MAX_WAIT_MS):
+        self.stream_max_batch = stream_max_batch
+        self.stream_max_wait_ms = stream_max_wait_ms
+        self.persona_service = persona_service
+        self.portfolio_service = portfolio_service
+        self.recommendation_service = recommendation_service
+        self.risk_service = risk_service
+        self.portfolio_analysis_service = portfolio_analysis_service
 
-    def ClassifyProfile(self, request, context):
+    async def ClassifyProfile(self, request, context):
         """Classify user profile into investment persona."""
         try:
             # Convert proto Profile to ProfileInput
             profile = self._proto_to_profile_input(request.profile)
 
             # Call service
-            persona, confidence, probabilities, latency_ms = self.persona_service.classify(profile)
+            persona, confidence, probabilities, latency_ms = await executor_service.run(
+                "classify", self.persona_service.classify, profile
+            )
 
             # Build response
             response = ml_service_pb2.ClassifyResponse(
@@ -60,14 +145,62 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
             context.set_details(str(e))
             return ml_service_pb2.ClassifyResponse()
 
-    def GetRecommendations(self, request, context):
+    async def ClassifyBlended(self, request, context):
+        """Classify user profile into a blended persona distribution."""
+        try:
+            profile = self._proto_to_profile_input(request.profile)
+            result = await executor_service.run(
+                "classify_blended", self.persona_service.classify_blended, profile
+            )
+            return self._blended_classification_to_proto(request.request_id, result)
+
+        except Exception as e:
+            logger.error(f"ClassifyBlended error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ml_service_pb2.BlendedClassifyResponse()
+
+    async def ClassifyBatch(self, request, context):
+        """Blended classification for many profiles, streamed back in request order."""
+        try:
+            profiles = [self._proto_to_profile_input(item.profile) for item in request.items]
+            results, _ = await executor_service.run(
+                "classify_batch", self.persona_service.classify_blended_batch, profiles
+            )
+        except Exception as e:
+            logger.error(f"ClassifyBatch error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return
+
+        for item, result in zip(request.items, results):
+            yield self._blended_classification_to_proto(item.request_id, result)
+
+    async def StreamClassify(self, request_iterator, context):
+        """Blended classification for a stream of profiles, micro-batched, results in request order."""
+        try:
+            async for batch in _micro_batches(request_iterator, self.stream_max_batch, self.stream_max_wait_ms):
+                profiles = [self._proto_to_profile_input(item.profile) for item in batch]
+                results, _ = await executor_service.run(
+                    "classify_batch", self.persona_service.classify_blended_batch, profiles
+                )
+                for item, result in zip(batch, results):
+                    yield self._blended_classification_to_proto(item.request_id, result)
+        except Exception as e:
+            logger.error(f"StreamClassify error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+
+    async def GetRecommendations(self, request, context):
         """Get fund recommendations based on persona."""
         try:
             # Convert profile map to dict
             profile = dict(request.profile)
 
             # Call service
-            recommendations, persona_alignment, latency_ms = self.recommendation_service.recommend(
+            recommendations, persona_alignment, latency_ms = await executor_service.run(
+                "recommend",
+                self.recommendation_service.recommend,
                 persona_id=request.persona_id,
                 profile=profile,
                 top_n=request.top_n or 5,
@@ -105,7 +238,74 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
             context.set_details(str(e))
             return ml_service_pb2.RecommendationResponse()
 
-    def OptimizePortfolio(self, request, context):
+    async def GetBlendedRecommendations(self, request, context):
+        """Get fund recommendations matching blended allocation targets."""
+        try:
+            kwargs = self._proto_to_blended_kwargs(request)
+            result = await executor_service.run(
+                "recommend_blended", self.recommendation_service.recommend_blended, **kwargs
+            )
+            return self._blended_result_to_proto(
+                request.request_id,
+                kwargs["blended_allocation"],
+                result,
+                f"{self.recommendation_service.get_model_version()}-blended",
+                result[4],
+            )
+
+        except Exception as e:
+            logger.error(f"GetBlendedRecommendations error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ml_service_pb2.BlendedRecommendationResponse()
+
+    async def GetBlendedRecommendationsBatch(self, request, context):
+        """Get blended-allocation fund recommendations for many clients at once."""
+        try:
+            items = [self._proto_to_blended_kwargs(item) for item in request.items]
+            results, latency_ms = await executor_service.run(
+                "recommend_blended_batch", self.recommendation_service.recommend_blended_batch, items
+            )
+
+            model_version = f"{self.recommendation_service.get_model_version()}-blended"
+            response = ml_service_pb2.BlendedRecommendationBatchResponse(
+                request_id=request.request_id or "",
+                results=[
+                    self._blended_result_to_proto(
+                        proto_item.request_id, item["blended_allocation"], result, model_version, latency_ms
+                    )
+                    for proto_item, item, result in zip(request.items, items, results)
+                ],
+                model_version=model_version,
+                latency_ms=latency_ms,
+            )
+            return response
+
+        except Exception as e:
+            logger.error(f"GetBlendedRecommendationsBatch error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ml_service_pb2.BlendedRecommendationBatchResponse()
+
+    async def StreamRecommendations(self, request_iterator, context):
+        """Blended-allocation recommendations for a stream of clients, micro-batched, results in request order."""
+        model_version = f"{self.recommendation_service.get_model_version()}-blended"
+        try:
+            async for batch in _micro_batches(request_iterator, self.stream_max_batch, self.stream_max_wait_ms):
+                items = [self._proto_to_blended_kwargs(item) for item in batch]
+                results, latency_ms = await executor_service.run(
+                    "recommend_blended_batch", self.recommendation_service.recommend_blended_batch, items
+                )
+                for proto_item, item, result in zip(batch, items, results):
+                    yield self._blended_result_to_proto(
+                        proto_item.request_id, item["blended_allocation"], result, model_version, latency_ms
+                    )
+        except Exception as e:
+            logger.error(f"StreamRecommendations error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+
+    async def OptimizePortfolio(self, request, context):
         """Optimize portfolio allocation."""
         try:
             # Convert profile map to dict
@@ -141,12 +341,21 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
                     max_volatility=c.max_volatility if c.HasField('max_volatility') else None,
                 )
 
+            method = request.method if request.HasField('method') else "mvo"
+            if method == "mvo":
+                from app.services.nav_history_service import nav_history_service
+                # Backfill NAV history for later covariance models (not awaited)
+                nav_history_service.ensure_in_background(f.scheme_code for f in available_funds)
+
             # Call service
-            allocations, metrics, latency_ms = self.portfolio_service.optimize(
+            allocations, metrics, latency_ms = await executor_service.run(
+                "optimize",
+                self.portfolio_service.optimize,
                 persona_id=request.persona_id,
                 profile=profile,
                 available_funds=available_funds,
                 constraints=constraints,
+                method=method,
             )
 
             # Build response
@@ -184,7 +393,7 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
             context.set_details(str(e))
             return ml_service_pb2.OptimizeResponse()
 
-    def AssessRisk(self, request, context):
+    async def AssessRisk(self, request, context):
         """Assess portfolio risk."""
         try:
             # Convert profile map to dict
@@ -221,7 +430,9 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
                 recommendations,
                 persona_alignment,
                 latency_ms,
-            ) = self.risk_service.assess(
+            ) = await executor_service.run(
+                "risk",
+                self.risk_service.assess,
                 profile=profile,
                 current_portfolio=current_portfolio,
                 proposed_portfolio=proposed_portfolio,
@@ -256,7 +467,27 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
             context.set_details(str(e))
             return ml_service_pb2.RiskResponse()
 
-    def HealthCheck(self, request, context):
+    async def AnalyzePortfolio(self, request, context):
+        """Analyze current holdings against a target allocation."""
+        try:
+            universe = await self.portfolio_analysis_service.load_universe()
+            result = await executor_service.run(
+                "analyze",
+                self.portfolio_analysis_service.analyze,
+                universe,
+                holdings=[self._proto_to_holding(h) for h in request.holdings],
+                target_allocation=self._proto_to_allocation(request.target_allocation, PortfolioAllocationTarget),
+                profile=dict(request.profile),
+            )
+            return self._analysis_to_proto(request.request_id, result)
+
+        except Exception as e:
+            logger.error(f"AnalyzePortfolio error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ml_service_pb2.PortfolioAnalysisResponse()
+
+    async def HealthCheck(self, request, context):
         """Health check."""
         services = [
             ml_service_pb2.ServiceStatus(
@@ -282,6 +513,154 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
         ]
         return ml_service_pb2.HealthResponse(status="healthy", services=services)
 
+    def _proto_to_allocation(self, proto_allocation, model=AllocationTarget):
+        """Convert proto BlendedAllocation weights to an AllocationTarget (or another model with the same fields)."""
+        weights = list(proto_allocation.weights)
+        if len(weights) > len(ALLOCATION_ASSET_CLASSES):
+            raise ValueError(f"Expected at most {len(ALLOCATION_ASSET_CLASSES)} allocation weights, got {len(weights)}")
+        return model(**dict(zip(ALLOCATION_ASSET_CLASSES, weights)))
+
+    def _allocation_to_proto(self, allocation):
+        """Convert an AllocationTarget (or asset class -> value dict, e.g. gaps) to proto BlendedAllocation weights."""
+        if isinstance(allocation, dict):
+            weights = [allocation.get(asset_class, 0.0) for asset_class in ALLOCATION_ASSET_CLASSES]
+        else:
+            weights = [getattr(allocation, asset_class) for asset_class in ALLOCATION_ASSET_CLASSES]
+        return ml_service_pb2.BlendedAllocation(weights=weights)
+
+    def _blended_classification_to_proto(self, request_id: str, result):
+        """Build a proto BlendedClassifyResponse from a BlendedClassificationResult."""
+        primary = result.primary_persona
+        return ml_service_pb2.BlendedClassifyResponse(
+            request_id=request_id or "",
+            primary_persona=ml_service_pb2.Persona(
+                id=primary.id,
+                name=primary.name,
+                slug=primary.slug,
+                risk_band=primary.risk_band,
+                description=primary.description or "",
+            ),
+            distribution=[
+                ml_service_pb2.PersonaWeight(
+                    persona=ml_service_pb2.Persona(
+                        id=item["persona"]["id"],
+                        name=item["persona"]["name"],
+                        slug=item["persona"]["slug"],
+                        risk_band=item["persona"]["risk_band"],
+                        description=item["persona"].get("description") or "",
+                    ),
+                    weight=item["weight"],
+                    allocation=self._allocation_to_proto(item["allocation"]),
+                )
+                for item in result.distribution
+            ],
+            blended_allocation=self._allocation_to_proto(result.blended_allocation),
+            confidence=result.confidence,
+            model_version=result.model_version,
+            latency_ms=result.latency_ms,
+        )
+
+    def _proto_to_blended_kwargs(self, request) -> dict:
+        """Convert a proto BlendedRecommendationRequest to recommend_blended keyword arguments."""
+        return {
+            "blended_allocation": self._proto_to_allocation(request.blended_allocation),
+            "profile": dict(request.profile),
+            "top_n": request.top_n or 6,
+            "investment_amount": request.investment_amount if request.HasField('investment_amount') else None,
+            "category_filters": list(request.category_filters) if request.category_filters else None,
+            "exclude_funds": list(request.exclude_funds) if request.exclude_funds else None,
+        }
+
+    def _blended_result_to_proto(
+        self, request_id: str, allocation: AllocationTarget, result: tuple, model_version: str, latency_ms: int
+    ):
+        """Build a proto BlendedRecommendationResponse from a recommend_blended result."""
+        recommendations, asset_class_breakdown, alignment_score, alignment_message = result[:4]
+        return ml_service_pb2.BlendedRecommendationResponse(
+            request_id=request_id or "",
+            recommendations=[
+                ml_service_pb2.FundRecommendation(
+                    scheme_code=rec.scheme_code,
+                    scheme_name=rec.scheme_name,
+                    fund_house=rec.fund_house or "",
+                    category=rec.category,
+                    score=rec.score,
+                    suggested_allocation=rec.suggested_allocation,
+                    reasoning=rec.reasoning,
+                    metrics={k: v for k, v in (rec.metrics or {}).items() if v is not None},
+                    asset_class=rec.asset_class or "",
+                    suggested_amount=rec.suggested_amount,
+                )
+                for rec in recommendations
+            ],
+            asset_class_breakdown=[
+                ml_service_pb2.AssetClassBreakdown(
+                    asset_class=b.asset_class,
+                    target_allocation=b.target_allocation,
+                    actual_allocation=b.actual_allocation,
+                    fund_count=b.fund_count,
+                    total_amount=b.total_amount,
+                )
+                for b in asset_class_breakdown
+            ],
+            target_allocation=self._allocation_to_proto(allocation),
+            alignment_score=alignment_score,
+            alignment_message=alignment_message,
+            model_version=model_version,
+            latency_ms=latency_ms,
+        )
+
+    def _proto_to_holding(self, proto_holding) -> PortfolioHoldingInput:
+        """Convert a proto PortfolioHolding to PortfolioHoldingInput."""
+        h = proto_holding
+        return PortfolioHoldingInput(
+            scheme_code=h.scheme_code,
+            scheme_name=h.scheme_name if h.HasField('scheme_name') else None,
+            amount=h.amount if h.HasField('amount') else None,
+            units=h.units if h.HasField('units') else None,
+            purchase_date=h.purchase_date if h.HasField('purchase_date') else None,
+            purchase_price=h.purchase_price if h.HasField('purchase_price') else None,
+            purchase_amount=h.purchase_amount if h.HasField('purchase_amount') else None,
+        )
+
+    def _analysis_to_proto(self, request_id: str, result):
+        """Build a proto PortfolioAnalysisResponse from a PortfolioAnalysisResponse model."""
+        metrics = result.current_metrics
+        summary = result.summary
+        return ml_service_pb2.PortfolioAnalysisResponse(
+            request_id=request_id or "",
+            current_allocation=self._allocation_to_proto(result.current_allocation),
+            target_allocation=self._allocation_to_proto(result.target_allocation),
+            allocation_gaps=self._allocation_to_proto(result.allocation_gaps),
+            current_metrics=ml_service_pb2.CurrentMetrics(
+                total_value=metrics.total_value,
+                total_holdings=metrics.total_holdings,
+                weighted_return_1y=metrics.weighted_return_1y,
+                weighted_return_3y=metrics.weighted_return_3y,
+                weighted_volatility=metrics.weighted_volatility,
+                weighted_sharpe=metrics.weighted_sharpe,
+                category_breakdown={
+                    category: ml_service_pb2.CategoryBreakdown(**breakdown)
+                    for category, breakdown in metrics.category_breakdown.items()
+                },
+            ),
+            holdings=[ml_service_pb2.EnrichedHolding(**h.model_dump()) for h in result.holdings],
+            rebalancing_actions=[
+                ml_service_pb2.RebalancingAction(**a.model_dump()) for a in result.rebalancing_actions
+            ],
+            summary=ml_service_pb2.AnalysisSummary(
+                is_aligned=summary.is_aligned,
+                alignment_score=summary.alignment_score,
+                primary_issues=summary.primary_issues,
+                total_sell_amount=summary.total_sell_amount,
+                total_buy_amount=summary.total_buy_amount,
+                net_transaction=summary.net_transaction,
+                tax_impact_summary=summary.tax_impact_summary,
+            ),
+            model_version=result.model_version,
+            latency_ms=result.latency_ms,
+        )
+
     def _proto_to_profile_input(self, proto_profile) -> ProfileInput:
         """Convert proto Profile to ProfileInput."""
         return ProfileInput(
@@ -299,17 +678,53 @@ class MLServiceServicer(ml_service_pb2_grpc.MLServiceServicer):
         )
 
 
-def serve(port: int = 50051, max_workers: int = 10):
-    """Start the gRPC server."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
-    ml_service_pb2_grpc.add_MLServiceServicer_to_server(MLServiceServicer(), server)
+async def serve(
+    port: int = 50051,
+    max_concurrent_rpcs: Optional[int] = None,
+    max_message_bytes: int = 4 * 1024 * 1024,
+    keepalive_time_ms: int = 30000,
+    keepalive_timeout_ms: int = 10000,
+    min_ping_interval_ms: int = 10000,
+    stream_max_batch: int = STREAM_MAX_BATCH,
+    stream_max_wait_ms: float = STREAM_MAX_WAIT_MS,
+) -> grpc.aio.Server:
+    """
+    Start the gRPC server on the running event loop.
+
+    RPCs beyond ``max_concurrent_rpcs`` (None = unbounded) are rejected
+    with RESOURCE_EXHAUSTED. Keepalive pings are sent every
+    ``keepalive_time_ms`` and client pings are accepted at most every
+    ``min_ping_interval_ms``, so idle ml-gateway channels survive proxies
+    without being closed as abusive. Streaming RPCs group requests into
+    batches of up to ``stream_max_batch``, waiting at most
+    ``stream_max_wait_ms`` for a batch to fill.
+    """
+    server = grpc.aio.server(
+        maximum_concurrent_rpcs=max_concurrent_rpcs,
+        options=[
+            ("grpc.max_receive_message_length", max_message_bytes),
+            ("grpc.max_send_message_length", max_message_bytes),
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", min_ping_interval_ms),
+            ("grpc.http2.max_pings_without_data", 0),
+        ],
+    )
+    ml_service_pb2_grpc.add_MLServiceServicer_to_server(
+        MLServiceServicer(stream_max_batch=stream_max_batch, stream_max_wait_ms=stream_max_wait_ms), server
+    )
     server.add_insecure_port(f"[::]:{port}")
-    server.start()
+    await server.start()
     logger.info(f"gRPC server started on port {port}")
     return server
 
 
+async def _serve_forever():
+    server = await serve()
+    await server.wait_for_termination()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    server = serve()
-    server.wait_for_termination()
+    asyncio.run(_serve_forever())
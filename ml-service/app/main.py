@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import os
 import threading
 
 from app.config import settings
@@ -33,16 +34,56 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
-    # Initialize fund data service (pre-populate cache)
+    # Execution lanes for CPU-bound service calls (pools start on first use)
+    from app.services.executor_service import executor_service
+    executor_service.configure(
+        threads=settings.EXECUTOR_THREADS,
+        processes=settings.EXECUTOR_PROCESSES,
+        routes=settings.EXECUTOR_ROUTES,
+    )
+
+    # Cached responses for repeated recommendation / classification requests
+    from app.services.response_cache import response_cache
+    response_cache.configure(settings.RESPONSE_CACHE_SIZE)
+
+    # Initialize fund data service (pre-populate cache, from the on-disk snapshot if present)
+    from app.services.fund_data_service import fund_data_service
+    fund_data_service.set_snapshot_store(os.path.join(settings.MODEL_STORE_PATH, "fund_universe"))
+    if settings.FUND_UNIVERSE_SHARED:
+        fund_data_service.enable_shared_snapshot(poll_seconds=settings.FUND_UNIVERSE_POLL_SECONDS)
     try:
-        from app.services.fund_data_service import fund_data_service
         await fund_data_service.initialize()
         logger.info("Fund data service initialized")
     except Exception as e:
         logger.warning(f"Failed to initialize fund data service: {e}")
 
-    # Start gRPC server in a separate thread
-    grpc_server = start_grpc_server(port=settings.GRPC_PORT)
+    # Keep the fund universe fresh in the background so requests never wait on a download
+    fund_data_service.start_background_refresh(
+        interval_seconds=settings.FUND_REFRESH_INTERVAL_SECONDS,
+        jitter_seconds=settings.FUND_REFRESH_JITTER_SECONDS,
+    )
+
+    # NAV history store: load what is on disk, then backfill / sync in the background
+    from app.services.nav_history_service import nav_history_service
+    nav_history_service.set_store_path(
+        os.path.join(settings.MODEL_STORE_PATH, "nav_history"), years=settings.NAV_HISTORY_YEARS
+    )
+    nav_history_service.start_background_sync(
+        interval_seconds=settings.NAV_HISTORY_SYNC_INTERVAL_SECONDS,
+        jitter_seconds=settings.FUND_REFRESH_JITTER_SECONDS,
+    )
+
+    # Start the gRPC server on this event loop
+    grpc_server = await start_grpc_server(
+        port=settings.GRPC_PORT,
+        max_concurrent_rpcs=settings.GRPC_MAX_CONCURRENT_RPCS,
+        max_message_bytes=settings.GRPC_MAX_MESSAGE_BYTES,
+        keepalive_time_ms=settings.GRPC_KEEPALIVE_TIME_MS,
+        keepalive_timeout_ms=settings.GRPC_KEEPALIVE_TIMEOUT_MS,
+        min_ping_interval_ms=settings.GRPC_MIN_PING_INTERVAL_MS,
+        stream_max_batch=settings.GRPC_STREAM_MAX_BATCH,
+        stream_max_wait_ms=settings.GRPC_STREAM_MAX_WAIT_MS,
+    )
     logger.info(f"gRPC server started on port {settings.GRPC_PORT}")
 
     logger.info("ML Service started successfully")
@@ -52,8 +93,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down ML Service...")
     if grpc_server:
-        grpc_server.stop(grace=5)
+        await grpc_server.stop(grace=5)
         logger.info("gRPC server stopped")
+    await fund_data_service.stop_background_refresh()
+    await nav_history_service.stop_background_sync()
+    executor_service.shutdown(wait=False)
 
 # Create FastAPI app
 app = FastAPI(
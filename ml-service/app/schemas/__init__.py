@@ -3,6 +3,8 @@ from .profile import (
     ClassifyRequest,
     ClassifyResponse,
     BlendedClassifyResponse,
+    ClassifyBatchRequest,
+    BlendedClassifyBatchResponse,
     PersonaDistributionItem,
     AllocationBreakdown,
     PersonaResult,
@@ -19,16 +21,33 @@ from .recommendation import (
     RecommendationResponse,
     BlendedRecommendationRequest,
     BlendedRecommendationResponse,
+    BlendedRecommendationBatchRequest,
+    BlendedRecommendationBatchResponse,
     FundRecommendation,
     AllocationTarget,
     AssetClassBreakdown,
 )
 from .risk import RiskRequest, RiskResponse, RiskFactor
+from .projection import ProjectionRequest, ProjectionResponse, ProjectionBand
+from .backtest import (
+    BacktestHolding,
+    BacktestRequest,
+    BacktestResponse,
+    BacktestMetrics,
+    BacktestSeries,
+    RollingReturnStats,
+    BacktestPortfolio,
+    BacktestBatchRequest,
+    BacktestBatchItem,
+    BacktestBatchResponse,
+)
 from .portfolio_analysis import (
     PortfolioHoldingInput,
     AllocationTarget as PortfolioAllocationTarget,
     PortfolioAnalysisRequest,
     PortfolioAnalysisResponse,
+    PortfolioAnalysisBatchRequest,
+    PortfolioAnalysisBatchResponse,
     EnrichedHolding,
     RebalancingAction,
     CurrentMetrics,
@@ -40,6 +59,8 @@ __all__ = [
     "ClassifyRequest",
     "ClassifyResponse",
     "BlendedClassifyResponse",
+    "ClassifyBatchRequest",
+    "BlendedClassifyBatchResponse",
     "PersonaDistributionItem",
     "AllocationBreakdown",
     "PersonaResult",
@@ -52,17 +73,34 @@ __all__ = [
     "RecommendationResponse",
     "BlendedRecommendationRequest",
     "BlendedRecommendationResponse",
+    "BlendedRecommendationBatchRequest",
+    "BlendedRecommendationBatchResponse",
     "FundRecommendation",
     "AllocationTarget",
     "AssetClassBreakdown",
     "RiskRequest",
     "RiskResponse",
     "RiskFactor",
+    "ProjectionRequest",
+    "ProjectionResponse",
+    "ProjectionBand",
+    "BacktestHolding",
+    "BacktestRequest",
+    "BacktestResponse",
+    "BacktestMetrics",
+    "BacktestSeries",
+    "RollingReturnStats",
+    "BacktestPortfolio",
+    "BacktestBatchRequest",
+    "BacktestBatchItem",
+    "BacktestBatchResponse",
     # Portfolio Analysis
     "PortfolioHoldingInput",
     "PortfolioAllocationTarget",
     "PortfolioAnalysisRequest",
     "PortfolioAnalysisResponse",
+    "PortfolioAnalysisBatchRequest",
+    "PortfolioAnalysisBatchResponse",
     "EnrichedHolding",
     "RebalancingAction",
     "CurrentMetrics",
@@ -0,0 +1,133 @@
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class BacktestHolding(BaseModel):
+    """Target weight of one scheme."""
+
+    scheme_code: int = Field(..., description="Mutual fund scheme code")
+    weight: float = Field(..., gt=0, le=1, description="Target weight (0-1)")
+
+
+class BacktestSettings(BaseModel):
+    """Window, rebalancing and cash flows shared by backtest requests."""
+
+    start_date: Optional[date] = Field(None, description="First day (default: earliest stored NAV)")
+    end_date: Optional[date] = Field(None, description="Last day (default: latest stored NAV)")
+    rebalance: str = Field(
+        "yearly",
+        pattern="^(none|monthly|quarterly|half-yearly|yearly)$",
+        description="Rebalance back to target weights this often",
+    )
+    monthly_sip: float = Field(0, ge=0, description="SIP invested on the first trading day of each month")
+    lump_sum: float = Field(100000, ge=0, description="Amount invested on the first day")
+    rolling_windows_years: List[int] = Field(
+        default_factory=lambda: [1, 3], description="Rolling return windows (years)"
+    )
+
+
+class BacktestRequest(BacktestSettings):
+    """Request to backtest one portfolio."""
+
+    request_id: Optional[str] = None
+    holdings: List[BacktestHolding] = Field(..., min_length=1)
+    include_series: bool = Field(True, description="Return daily values")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "request_id": "bt-123",
+                "holdings": [
+                    {"scheme_code": 120503, "weight": 0.6},
+                    {"scheme_code": 119551, "weight": 0.4},
+                ],
+                "rebalance": "quarterly",
+                "monthly_sip": 10000,
+                "lump_sum": 100000,
+            }
+        }
+
+
+class RollingReturnStats(BaseModel):
+    """Distribution of annualised rolling returns for one window length."""
+
+    window_years: int
+    observations: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    positive_pct: Optional[float] = Field(None, description="Share of windows with a positive return")
+
+
+class BacktestMetrics(BaseModel):
+    """Performance metrics of a backtested portfolio (returns as decimals)."""
+
+    final_value: float
+    total_invested: float
+    absolute_return: float
+    xirr: Optional[float] = Field(None, description="Money-weighted annual return")
+    cagr: Optional[float] = Field(None, description="Time-weighted annual return")
+    volatility: Optional[float] = Field(None, description="Annualised volatility of daily returns")
+    max_drawdown: float = Field(..., ge=0, description="Largest peak-to-trough fall")
+    max_drawdown_peak: Optional[date] = None
+    max_drawdown_trough: Optional[date] = None
+
+
+class BacktestSeries(BaseModel):
+    """Daily portfolio value and cumulative amount invested."""
+
+    dates: List[date]
+    values: List[float]
+    invested: List[float]
+
+
+class BacktestResponse(BaseModel):
+    """Response from a single-portfolio backtest."""
+
+    request_id: Optional[str] = None
+    start_date: date
+    end_date: date
+    metrics: BacktestMetrics
+    rolling_returns: List[RollingReturnStats]
+    series: Optional[BacktestSeries] = None
+    missing_schemes: List[int] = Field(
+        default_factory=list, description="Schemes without NAV history (left out, weights renormalised)"
+    )
+    model_version: str
+    latency_ms: int
+
+
+class BacktestPortfolio(BaseModel):
+    """One candidate portfolio in a batch backtest."""
+
+    portfolio_id: Optional[str] = None
+    holdings: List[BacktestHolding] = Field(..., min_length=1)
+
+
+class BacktestBatchRequest(BacktestSettings):
+    """Request to backtest many candidate portfolios over the same window."""
+
+    request_id: Optional[str] = None
+    portfolios: List[BacktestPortfolio] = Field(..., min_length=1, max_length=1000)
+
+
+class BacktestBatchItem(BaseModel):
+    """Backtest result for one candidate portfolio."""
+
+    portfolio_id: Optional[str] = None
+    metrics: BacktestMetrics
+    rolling_returns: List[RollingReturnStats]
+
+
+class BacktestBatchResponse(BaseModel):
+    """Response from a batch backtest (results in request order)."""
+
+    request_id: Optional[str] = None
+    start_date: date
+    end_date: date
+    results: List[BacktestBatchItem]
+    missing_schemes: List[int] = Field(default_factory=list)
+    model_version: str
+    latency_ms: int
@@ -24,8 +24,8 @@ class OptimizationConstraints(BaseModel):
     max_single_fund_pct: float = Field(30, ge=0, le=100, description="Max single fund weight")
     min_funds: int = Field(3, ge=1, description="Minimum number of funds")
     max_funds: int = Field(10, ge=1, description="Maximum number of funds")
-    target_return: Optional[float] = Field(None, description="Target annual return")
-    max_volatility: Optional[float] = Field(None, description="Maximum portfolio volatility")
+    target_return: Optional[float] = Field(None, description="Target annual return (%)")
+    max_volatility: Optional[float] = Field(None, description="Maximum annualized portfolio volatility (%)")
 
 
 class OptimizeRequest(BaseModel):
@@ -36,6 +36,11 @@ class OptimizeRequest(BaseModel):
     profile: dict = Field(..., description="User profile data")
     available_funds: List[FundInput] = Field(..., description="Funds to choose from")
     constraints: Optional[OptimizationConstraints] = None
+    method: str = Field(
+        "mvo",
+        pattern="^(mvo|heuristic)$",
+        description="'mvo' (mean-variance over NAV return covariance) or 'heuristic' (score-based split)",
+    )
 
     class Config:
         json_schema_extra = {
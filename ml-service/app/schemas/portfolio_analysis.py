@@ -142,7 +142,9 @@ class CurrentMetrics(BaseModel):
     total_holdings: int = Field(..., ge=0, description="Number of holdings")
     weighted_return_1y: Optional[float] = None
     weighted_return_3y: Optional[float] = None
-    weighted_volatility: Optional[float] = None
+    weighted_volatility: Optional[float] = Field(
+        None, description="Annualised portfolio volatility (%), sqrt(w'Σw) across holdings"
+    )
     weighted_sharpe: Optional[float] = None
     category_breakdown: Dict[str, Dict] = Field(
         default_factory=dict,
@@ -239,3 +241,21 @@ class PortfolioAnalysisResponse(BaseModel):
                 "latency_ms": 45,
             }
         }
+
+
+class PortfolioAnalysisBatchRequest(BaseModel):
+    """Portfolio analysis for many clients in one call (e.g. an advisor's book)."""
+
+    request_id: Optional[str] = Field(None, description="Request ID for tracking")
+    items: List[PortfolioAnalysisRequest] = Field(
+        ..., min_length=1, max_length=5000, description="Per-client requests, answered in order"
+    )
+
+
+class PortfolioAnalysisBatchResponse(BaseModel):
+    """Response from batch portfolio analysis."""
+
+    request_id: Optional[str] = None
+    results: List[PortfolioAnalysisResponse]
+    model_version: str
+    latency_ms: float
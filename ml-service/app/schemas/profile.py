@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from enum import Enum
 
 
@@ -74,6 +74,15 @@ class ClassifyRequest(BaseModel):
     model_version: Optional[str] = Field(None, description="Specific model version to use")
 
 
+class ClassifyBatchRequest(BaseModel):
+    """Request for classifying many profiles in one call."""
+
+    request_id: Optional[str] = Field(None, description="Unique request ID")
+    items: List[ClassifyRequest] = Field(
+        ..., min_length=1, max_length=10000, description="Profiles to classify, answered in order"
+    )
+
+
 class PersonaResult(BaseModel):
     """Persona classification result."""
 
@@ -230,3 +239,14 @@ class BlendedClassifyResponse(BaseModel):
                 "latency_ms": 8,
             }
         }
+
+
+class BlendedClassifyBatchResponse(BaseModel):
+    """Response from batch blended persona classification."""
+
+    request_id: Optional[str] = None
+    results: List[BlendedClassifyResponse] = Field(
+        ..., description="One blended classification per request item, in request order"
+    )
+    model_version: str = Field(..., description="Model version used")
+    latency_ms: int = Field(..., description="Processing time in milliseconds")
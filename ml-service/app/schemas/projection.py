@@ -0,0 +1,63 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ProjectionRequest(BaseModel):
+    """Request for a Monte Carlo goal projection."""
+
+    request_id: Optional[str] = None
+    expected_return: float = Field(
+        ..., ge=-0.5, le=1.0, description="Expected annual return (decimal, e.g. 0.12)"
+    )
+    expected_volatility: float = Field(
+        ..., ge=0, le=1.0, description="Annualized volatility (decimal, e.g. 0.15)"
+    )
+    horizon_years: int = Field(..., ge=1, le=50, description="Investment horizon in years")
+    monthly_sip: float = Field(0, ge=0, description="Monthly SIP amount")
+    lump_sum: float = Field(0, ge=0, description="Initial lump sum investment")
+    step_up_pct: float = Field(0, ge=0, le=100, description="Yearly SIP step-up (%)")
+    target_corpus: Optional[float] = Field(None, gt=0, description="Goal corpus to reach")
+    num_paths: int = Field(10000, ge=100, le=100000, description="Simulated paths")
+    percentiles: List[float] = Field(
+        default_factory=lambda: [10, 25, 50, 75, 90],
+        description="Percentile bands to report (0-100)",
+    )
+    seed: Optional[int] = Field(42, description="Random seed (null for a fresh sample)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "request_id": "proj-123",
+                "expected_return": 0.12,
+                "expected_volatility": 0.15,
+                "horizon_years": 20,
+                "monthly_sip": 25000,
+                "lump_sum": 200000,
+                "step_up_pct": 10,
+                "target_corpus": 50000000,
+            }
+        }
+
+
+class ProjectionBand(BaseModel):
+    """Corpus at one percentile for each year end."""
+
+    percentile: float
+    values: List[float] = Field(..., description="Corpus at the end of each year")
+
+
+class ProjectionResponse(BaseModel):
+    """Response from a Monte Carlo goal projection."""
+
+    request_id: Optional[str] = None
+    years: List[int] = Field(..., description="Year numbers the band values refer to")
+    bands: List[ProjectionBand]
+    total_invested: float = Field(..., description="Lump sum plus all SIP installments")
+    mean_final_value: float
+    median_final_value: float
+    probability_of_target: Optional[float] = Field(
+        None, ge=0, le=1, description="Share of paths reaching the target corpus"
+    )
+    num_paths: int
+    model_version: str
+    latency_ms: int
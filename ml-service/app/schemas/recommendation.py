@@ -85,6 +85,15 @@ class BlendedRecommendationRequest(BaseModel):
         }
 
 
+class BlendedRecommendationBatchRequest(BaseModel):
+    """Blended recommendations for many clients in one call."""
+
+    request_id: Optional[str] = None
+    items: List[BlendedRecommendationRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Per-client requests, answered in order"
+    )
+
+
 class FundRecommendation(BaseModel):
     """Single fund recommendation."""
 
@@ -212,3 +221,14 @@ class BlendedRecommendationResponse(BaseModel):
                 "latency_ms": 35,
             }
         }
+
+
+class BlendedRecommendationBatchResponse(BaseModel):
+    """Response from batch blended fund recommendation."""
+
+    request_id: Optional[str] = None
+    results: List[BlendedRecommendationResponse] = Field(
+        ..., description="One response per request item, in request order"
+    )
+    model_version: str
+    latency_ms: int
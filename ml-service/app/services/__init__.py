@@ -1,14 +1,24 @@
-from .persona_service import PersonaService
-from .portfolio_service import PortfolioService
-from .recommendation_service import RecommendationService
-from .risk_service import RiskService
+from .persona_service import PersonaService, persona_service
+from .portfolio_service import PortfolioService, portfolio_service
+from .recommendation_service import RecommendationService, recommendation_service
+from .risk_service import RiskService, risk_service
 from .portfolio_analysis_service import PortfolioAnalysisService, portfolio_analysis_service
+from .projection_service import ProjectionService, projection_service
+from .backtest_service import BacktestService, backtest_service
 
 __all__ = [
     "PersonaService",
+    "persona_service",
     "PortfolioService",
+    "portfolio_service",
     "RecommendationService",
+    "recommendation_service",
     "RiskService",
+    "risk_service",
     "PortfolioAnalysisService",
     "portfolio_analysis_service",
+    "ProjectionService",
+    "projection_service",
+    "BacktestService",
+    "backtest_service",
 ]
@@ -0,0 +1,308 @@
+"""
+Historical backtests over the NAV history store.
+
+Replays target weights (e.g. from ``optimize`` or ``recommend_blended``)
+over aligned daily NAVs with periodic rebalancing and monthly SIP flows,
+and reports value, XIRR, time-weighted return, volatility, max drawdown
+and rolling returns.
+
+Within a rebalancing period the units held only change through SIP
+purchases, so with weights ``w``, NAVs ``n_i(t)`` and flows ``a(t)`` the
+value on day ``t`` of period ``k`` (starting on day ``r_k``) is
+
+    V(t) = V_k * sum_i w_i n_i(t) / n_i(r_k) + sum_i w_i n_i(t) C_i(t)
+
+where ``C_i`` is the period-local cumulative sum of ``a / n_i`` and ``V_k``
+the value carried into the period. Period start values follow the linear
+recurrence ``V_{k+1} = G_k V_k + F_k``, which is solved with a cumulative
+product and a cumulative sum. Nothing loops over days or periods, and
+every quantity is a matrix product with the weights, so many candidate
+portfolios are backtested with one (days x schemes) @ (schemes x
+portfolios) product per term.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.nav_history_service import TRADING_DAYS, nav_history_service
+
+# Months between rebalances (None = buy and hold)
+REBALANCE_MONTHS = {
+    "none": None,
+    "monthly": 1,
+    "quarterly": 3,
+    "half-yearly": 6,
+    "yearly": 12,
+}
+
+# Newton iterations for XIRR
+XIRR_ITERATIONS = 50
+XIRR_TOLERANCE = 1e-9
+
+
+@dataclass
+class BacktestRun:
+    """Daily values for a set of portfolios sharing dates and cash flows."""
+    dates: np.ndarray
+    values: np.ndarray          # (days, portfolios)
+    flows: np.ndarray           # (days,) amount invested each day
+    index: np.ndarray           # (days, portfolios) time-weighted index, starts at 1
+
+
+@dataclass
+class BacktestSummary:
+    """Metrics for one backtested portfolio."""
+    final_value: float
+    total_invested: float
+    absolute_return: float
+    xirr: Optional[float]
+    cagr: Optional[float]
+    volatility: Optional[float]
+    max_drawdown: float
+    max_drawdown_peak: Optional[str]
+    max_drawdown_trough: Optional[str]
+    rolling_returns: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def run_backtest(
+    dates: np.ndarray,
+    navs: np.ndarray,
+    weights: np.ndarray,
+    rebalance: str = "yearly",
+    monthly_sip: float = 0.0,
+    lump_sum: float = 0.0,
+) -> BacktestRun:
+    """
+    Backtest portfolios over aligned NAVs.
+
+    ``navs`` is (days x schemes) without gaps, ``weights`` is (portfolios x
+    schemes) with rows summing to 1. The lump sum is invested on the first
+    day and the SIP on the first trading day of every month (including the
+    first). Rebalancing to the target weights happens on the first trading
+    day of every ``rebalance`` period.
+    """
+    if rebalance not in REBALANCE_MONTHS:
+        raise ValueError(f"Unknown rebalancing frequency: {rebalance}")
+    days = len(dates)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    month_start = np.concatenate([[True], months[1:] != months[:-1]])
+
+    # Step 1: cash flows and rebalancing periods
+    flows = np.where(month_start, monthly_sip, 0.0)
+    flows[0] += lump_sum
+    period_start = np.zeros(days, dtype=bool)
+    period_start[0] = True
+    step = REBALANCE_MONTHS[rebalance]
+    if step is not None:
+        period_start |= month_start & ((months - months[0]) % step == 0)
+    starts = np.flatnonzero(period_start)
+    period = np.cumsum(period_start) - 1
+
+    # Step 2: per-scheme terms, shared by all portfolios
+    units_bought = np.cumsum(flows[:, None] / navs, axis=0)
+    units_before = np.vstack([np.zeros((1, navs.shape[1])), units_bought[starts[1:] - 1]])
+    growth = navs / navs[starts][period]
+    flow_value = navs * (units_bought - units_before[period])
+
+    # Step 3: value carried into each period, V_{k+1} = G_k V_k + F_k with V_0 = 0
+    ends = starts[1:]
+    period_growth = (navs[ends] / navs[starts[:-1]]) @ weights.T
+    period_flows = (navs[ends] * (units_bought[ends - 1] - units_before[:-1])) @ weights.T
+    cumulative = np.vstack([np.ones((1, len(weights))), np.cumprod(period_growth, axis=0)])
+    carried = cumulative * np.vstack([
+        np.zeros((1, len(weights))),
+        np.cumsum(period_flows / cumulative[1:], axis=0),
+    ])
+
+    values = carried[period] * (growth @ weights.T) + flow_value @ weights.T
+
+    # Step 4: time-weighted index (strips the effect of flows)
+    daily = (values[1:] - flows[1:, None]) / values[:-1]
+    index = np.vstack([np.ones((1, len(weights))), np.cumprod(daily, axis=0)])
+    return BacktestRun(dates=dates, values=values, flows=flows, index=index)
+
+
+def xirr(dates: np.ndarray, flows: np.ndarray, final_values: np.ndarray) -> np.ndarray:
+    """
+    Annualised money-weighted return for each final value (NaN if no solution).
+
+    ``flows`` are the amounts invested on ``dates`` (shared by all
+    portfolios). Solved by Newton's method on log(1 + r) for all portfolios
+    at once.
+    """
+    invested = flows > 0
+    years = (dates[-1] - dates[invested]).astype(float) / 365.0
+    amounts = flows[invested]
+    total = amounts.sum()
+    horizon = max(float((amounts * years).sum() / total), 1 / 365)
+
+    rate = np.log(np.maximum(final_values, 1e-9) / total) / horizon
+    for _ in range(XIRR_ITERATIONS):
+        growth = np.exp(np.outer(rate, years))
+        value = final_values - growth @ amounts
+        slope = -(growth * years) @ amounts
+        step = value / np.where(slope != 0, slope, -1e-12)
+        rate = np.clip(rate - step, -5.0, 5.0)
+        if np.all(np.abs(step) < XIRR_TOLERANCE):
+            break
+    return np.where(np.abs(value) <= 1e-6 * total, np.expm1(rate), np.nan)
+
+
+def rolling_returns(dates: np.ndarray, index: np.ndarray, window_years: int) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Annualised returns over every ``window_years`` window ending on each day.
+
+    Returns per-portfolio mean / median / min / max and the share of
+    positive windows, or None when the history is shorter than the window.
+    """
+    lookback = dates - np.timedelta64(365 * window_years + window_years // 4, "D")
+    start = np.searchsorted(dates, lookback, side="right") - 1
+    valid = start >= 0
+    if not valid.any():
+        return None
+    returns = (index[valid] / index[start[valid]]) ** (1 / window_years) - 1
+    return {
+        "observations": int(valid.sum()),
+        "mean": returns.mean(axis=0),
+        "median": np.median(returns, axis=0),
+        "min": returns.min(axis=0),
+        "max": returns.max(axis=0),
+        "positive_pct": (returns > 0).mean(axis=0),
+    }
+
+
+def summarize(run: BacktestRun, rolling_windows: List[int]) -> List[BacktestSummary]:
+    """Metrics for every portfolio in a run."""
+    dates, values, index = run.dates, run.values, run.index
+    final_values = values[-1]
+    total_invested = float(run.flows.sum())
+    span_years = (dates[-1] - dates[0]).astype(float) / 365.0
+
+    money_weighted = xirr(dates, run.flows, final_values)
+    cagr = index[-1] ** (1 / span_years) - 1 if span_years > 0 else np.full(len(final_values), np.nan)
+    daily = index[1:] / index[:-1] - 1
+    volatility = daily.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS) if len(daily) > 1 else np.full(len(final_values), np.nan)
+
+    # Max drawdown of the time-weighted index, with its peak and trough dates
+    peak_value = np.maximum.accumulate(index, axis=0)
+    drawdown = index / peak_value - 1
+    trough = drawdown.argmin(axis=0)
+    rows = np.arange(len(index))[:, None]
+    peak_row = np.maximum.accumulate(np.where(index >= peak_value, rows, 0), axis=0)
+    peak = peak_row[trough, np.arange(index.shape[1])]
+
+    windows = {years: rolling_returns(dates, index, years) for years in rolling_windows}
+
+    def number(value) -> Optional[float]:
+        return round(float(value), 4) if np.isfinite(value) else None
+
+    summaries = []
+    for p in range(values.shape[1]):
+        max_drawdown = float(drawdown[trough[p], p])
+        summaries.append(BacktestSummary(
+            final_value=round(float(final_values[p]), 2),
+            total_invested=round(total_invested, 2),
+            absolute_return=round(float(final_values[p] / total_invested - 1), 4),
+            xirr=number(money_weighted[p]),
+            cagr=number(cagr[p]),
+            volatility=number(volatility[p]),
+            max_drawdown=round(-max_drawdown, 4),
+            max_drawdown_peak=str(dates[peak[p]]) if max_drawdown < 0 else None,
+            max_drawdown_trough=str(dates[trough[p]]) if max_drawdown < 0 else None,
+            rolling_returns=[
+                {
+                    "window_years": years,
+                    "observations": stats["observations"],
+                    "mean": number(stats["mean"][p]),
+                    "median": number(stats["median"][p]),
+                    "min": number(stats["min"][p]),
+                    "max": number(stats["max"][p]),
+                    "positive_pct": number(stats["positive_pct"][p]),
+                }
+                for years, stats in windows.items()
+                if stats is not None
+            ],
+        ))
+    return summaries
+
+
+class BacktestService:
+    """Backtests target-weight portfolios on stored NAV history."""
+
+    def __init__(self):
+        self.model_version = "backtest-v1"
+
+    def backtest_batch(
+        self,
+        portfolios: List[Dict[int, float]],
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        rebalance: str = "yearly",
+        monthly_sip: float = 0.0,
+        lump_sum: float = 0.0,
+        rolling_windows: Optional[List[int]] = None,
+    ) -> tuple:
+        """
+        Backtest many portfolios ({scheme_code: weight}) over the same dates.
+
+        The backtest starts on the first day every scheme with history has
+        a NAV, so all portfolios cover the same window. Schemes without
+        any history are dropped and the remaining weights renormalised.
+
+        Returns:
+            Tuple of (run, summaries, missing_scheme_codes, latency_ms)
+        """
+        start_time = time.time()
+        if monthly_sip <= 0 and lump_sum <= 0:
+            raise ValueError("Backtest needs a lump sum or a monthly SIP")
+
+        # Step 1: aligned NAVs for the union of schemes
+        codes = sorted({code for portfolio in portfolios for code in portfolio})
+        matrix = nav_history_service.nav_matrix(codes, start_date, end_date)
+        present = ~np.isnan(matrix.navs).all(axis=0) if len(matrix.navs) else np.zeros(len(codes), dtype=bool)
+        missing = [code for code, ok in zip(codes, present) if not ok]
+        navs = matrix.navs[:, present]
+        complete = ~np.isnan(navs).any(axis=1)
+        if complete.sum() < 2:
+            raise ValueError("Not enough overlapping NAV history for these schemes")
+        first = int(np.argmax(complete))
+        dates, navs = matrix.dates[first:], navs[first:]
+
+        # Step 2: weight matrix over the available schemes
+        column = {code: i for i, code in enumerate(c for c, ok in zip(codes, present) if ok)}
+        weights = np.zeros((len(portfolios), len(column)))
+        for p, portfolio in enumerate(portfolios):
+            for code, weight in portfolio.items():
+                if code in column:
+                    weights[p, column[code]] = weight
+        totals = weights.sum(axis=1, keepdims=True)
+        if np.any(totals <= 0):
+            raise ValueError("A portfolio has no schemes with NAV history")
+        weights /= totals
+
+        # Step 3: simulate and summarise
+        run = run_backtest(dates, navs, weights, rebalance, monthly_sip, lump_sum)
+        summaries = summarize(run, rolling_windows if rolling_windows is not None else [1, 3])
+
+        latency_ms = int((time.time() - start_time) * 1000)
+        return run, summaries, missing, latency_ms
+
+    def backtest(self, weights: Dict[int, float], **kwargs) -> tuple:
+        """
+        Backtest a single portfolio (see backtest_batch).
+
+        Returns:
+            Tuple of (run, summary, missing_scheme_codes, latency_ms)
+        """
+        run, summaries, missing, latency_ms = self.backtest_batch([weights], **kwargs)
+        return run, summaries[0], missing, latency_ms
+
+    def get_model_version(self) -> str:
+        return self.model_version
+
+
+# Global instance
+backtest_service = BacktestService()
@@ -0,0 +1,388 @@
+"""
+Covariance service.
+
+Precomputes a low-rank factor covariance for every scheme in the NAV
+history store after each sync and serves covariance sub-matrices for
+arbitrary sets of scheme codes.
+
+Model (statistical factor model on daily returns over the lookback):
+
+    Σ = B Bᵀ + diag(s)
+
+The factors are the leading principal components of the standardised
+return matrix, so ``B`` is (schemes x factors) and a sub-matrix for ``m``
+schemes costs one (m x k) @ (k x m) product. Specific variances ``s`` are
+the part of each scheme's variance the factors leave unexplained, which
+keeps every sub-matrix positive definite. Truncating to ``k`` factors is
+itself a shrinkage of the sample correlation matrix towards a structured
+target; with a few hundred observations and thousands of schemes the
+sample covariance is singular and unusable directly.
+
+Frequently requested subsets are memoised in an LRU keyed by the model
+version and the exact scheme code tuple.
+
+Schemes the model does not cover (too little history) fall back to their
+stated volatility and prior asset-class correlations; ``blended_covariance``
+and ``portfolio_volatilities`` combine the two.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.nav_history_service import NavHistoryService, TRADING_DAYS, nav_history_service
+
+logger = logging.getLogger(__name__)
+
+# Daily returns used for estimation (about three years)
+LOOKBACK_DAYS = 3 * TRADING_DAYS
+
+# Schemes need at least this many returns in the window to be modelled
+MIN_OBSERVATIONS = 120
+
+# Number of statistical factors kept
+NUM_FACTORS = 20
+
+# Floor on the specific share of a scheme's variance
+MIN_SPECIFIC_SHARE = 0.02
+
+# Prior correlations between asset classes, used for schemes the model does not cover
+ASSET_CLASS_CORRELATIONS = {
+    ("equity", "equity"): 0.85,
+    ("equity", "hybrid"): 0.80,
+    ("equity", "debt"): 0.10,
+    ("hybrid", "hybrid"): 0.80,
+    ("hybrid", "debt"): 0.35,
+    ("debt", "debt"): 0.60,
+}
+ASSET_CLASS_INDEX = {"equity": 0, "hybrid": 1, "debt": 2, "liquid": 2}
+
+# Portfolios per chunk in portfolio_volatilities (bounds the (P, m, m) temporaries)
+BATCH_CHUNK = 1024
+
+
+def _prior_correlation_matrix() -> np.ndarray:
+    size = max(ASSET_CLASS_INDEX.values()) + 1
+    matrix = np.eye(size)
+    for (a, b), rho in ASSET_CLASS_CORRELATIONS.items():
+        matrix[ASSET_CLASS_INDEX[a], ASSET_CLASS_INDEX[b]] = rho
+        matrix[ASSET_CLASS_INDEX[b], ASSET_CLASS_INDEX[a]] = rho
+    return matrix
+
+
+# Off-diagonal prior correlation between two different schemes, by class
+PRIOR_CORRELATIONS = _prior_correlation_matrix()
+
+
+def asset_class_index(asset_class: Optional[str]) -> int:
+    """Prior class for an asset class name (unknown classes count as equity)."""
+    return ASSET_CLASS_INDEX.get(asset_class, 0)
+
+
+@dataclass
+class FactorModel:
+    """Factor covariance for the modelled schemes (annualised)."""
+    version: int
+    scheme_codes: np.ndarray
+    loadings: np.ndarray
+    specific_variance: np.ndarray
+    volatility: np.ndarray
+    built_at: datetime
+    observations: int
+
+    def __post_init__(self):
+        self._index = {int(code): i for i, code in enumerate(self.scheme_codes.tolist())}
+
+    def rows_of(self, scheme_codes: List[int]) -> np.ndarray:
+        index = self._index
+        return np.array([index.get(code, -1) for code in scheme_codes], dtype=np.int64)
+
+
+def build_factor_model(
+    returns: np.ndarray,
+    scheme_codes: List[int],
+    version: int,
+    num_factors: int = NUM_FACTORS,
+    min_observations: int = MIN_OBSERVATIONS,
+) -> Optional[FactorModel]:
+    """
+    Fit the factor model to daily returns (days x schemes, NaN = missing).
+
+    Schemes with fewer than ``min_observations`` returns are left out.
+    Missing returns are treated as zero after standardising, i.e. they
+    carry no co-movement information.
+    """
+    present = ~np.isnan(returns)
+    counts = present.sum(axis=0)
+    keep = counts >= min_observations
+    if not keep.any():
+        return None
+    returns, present, counts = returns[:, keep], present[:, keep], counts[keep]
+    codes = np.asarray(scheme_codes, dtype=np.int64)[keep]
+
+    # Step 1: standardise each scheme over the days it has data
+    filled = np.where(present, returns, 0.0)
+    mean = filled.sum(axis=0) / counts
+    centered = np.where(present, returns - mean, 0.0)
+    daily_vol = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(counts - 1, 1))
+    daily_vol = np.where(daily_vol > 0, daily_vol, 1e-8)
+    z = centered / daily_vol
+    observations = len(z)
+
+    # Step 2: principal components from the (days x days) Gram matrix
+    k = max(1, min(num_factors, observations - 1, z.shape[1]))
+    eigenvalues, eigenvectors = np.linalg.eigh(z @ z.T)
+    order = np.argsort(eigenvalues)[::-1][:k]
+    eigenvalues = np.clip(eigenvalues[order], 0.0, None)
+    eigenvectors = eigenvectors[:, order]
+    # Correlation loadings: corr ≈ L Lᵀ with L = Zᵀ U / sqrt(T - 1)
+    loadings = (z.T @ eigenvectors) / np.sqrt(max(observations - 1, 1))
+
+    # Step 3: specific share so that diag(L Lᵀ) + specific = 1
+    communality = (loadings ** 2).sum(axis=1)
+    scale = np.sqrt(np.minimum(1.0, (1 - MIN_SPECIFIC_SHARE) / np.maximum(communality, 1e-12)))
+    loadings *= scale[:, None]
+    specific = 1.0 - (loadings ** 2).sum(axis=1)
+
+    # Step 4: back to annualised covariance units
+    volatility = daily_vol * np.sqrt(TRADING_DAYS)
+    return FactorModel(
+        version=version,
+        scheme_codes=codes,
+        loadings=loadings * volatility[:, None],
+        specific_variance=specific * volatility ** 2,
+        volatility=volatility,
+        built_at=datetime.now(),
+        observations=observations,
+    )
+
+
+class CovarianceService:
+    """Factor covariance for the fund universe with an LRU of sub-matrices."""
+
+    def __init__(self, cache_size: int = 256):
+        self._model: Optional[FactorModel] = None
+        self._versions = 0
+        self._build_lock = threading.Lock()
+        self._last_build_ms: Optional[int] = None
+        self._cache: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def model(self) -> Optional[FactorModel]:
+        return self._model
+
+    @property
+    def version(self) -> int:
+        """Model version (0 until a model is built)."""
+        model = self._model
+        return model.version if model is not None else 0
+
+    def rebuild(self, source: NavHistoryService = nav_history_service):
+        """Refit the model from the NAV history store and swap it in."""
+        with self._build_lock:
+            start_time = time.time()
+            state = source.store.state()
+            codes = list(state.codes)
+            if not codes or not state.n_days:
+                return
+            first = max(0, state.n_days - LOOKBACK_DAYS - 1)
+            _, returns = source.return_matrix(codes, start=state.dates(first, first + 1)[0])
+            self._versions += 1
+            model = build_factor_model(returns, codes, version=self._versions)
+            if model is None:
+                return
+            self._model = model
+            with self._cache_lock:
+                self._cache.clear()
+            self._last_build_ms = int((time.time() - start_time) * 1000)
+            logger.info(
+                f"Covariance model v{model.version}: {len(model.scheme_codes)} schemes, "
+                f"{model.loadings.shape[1]} factors, {model.observations} days in {self._last_build_ms}ms"
+            )
+
+    def covariance(self, scheme_codes: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annualised covariance sub-matrix for the schemes, in the given order.
+
+        Returns ``(matrix, available)``; rows and columns of schemes the
+        model does not cover (``available`` False) are NaN. Results are
+        shared between callers and read-only.
+        """
+        model = self._model
+        key = (model.version if model is not None else 0, tuple(scheme_codes))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        n = len(scheme_codes)
+        matrix = np.full((n, n), np.nan)
+        if model is None:
+            available = np.zeros(n, dtype=bool)
+        else:
+            rows = model.rows_of(scheme_codes)
+            available = rows >= 0
+            known = rows[available]
+            loadings = model.loadings[known]
+            block = loadings @ loadings.T
+            block[np.diag_indices_from(block)] += model.specific_variance[known]
+            matrix[np.ix_(available, available)] = block
+
+        matrix.flags.writeable = False
+        available.flags.writeable = False
+        result = (matrix, available)
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def blended_covariance(
+        self,
+        scheme_codes: List[int],
+        volatilities: List[float],
+        asset_classes: List[str],
+    ) -> np.ndarray:
+        """
+        Annualised covariance for the schemes, modelled or not.
+
+        ``volatilities`` (annualised, as fractions) and ``asset_classes``
+        are used for schemes the model does not cover. The result is not
+        guaranteed positive semi-definite when both kinds are mixed.
+        """
+        covariance, _ = self._blended_covariances(
+            np.asarray([scheme_codes], dtype=np.int64),
+            np.asarray([volatilities], dtype=float),
+            np.asarray([[asset_class_index(c) for c in asset_classes]], dtype=np.int64),
+        )
+        return covariance[0]
+
+    def portfolio_volatility(
+        self,
+        scheme_codes: List[int],
+        weights: List[float],
+        volatilities: List[float],
+        asset_classes: List[str],
+    ) -> float:
+        """Annualised volatility sqrt(w'Σw) of one portfolio (see portfolio_volatilities)."""
+        return float(self.portfolio_volatilities([scheme_codes], [weights], [volatilities], [asset_classes])[0])
+
+    def portfolio_volatilities(
+        self,
+        scheme_codes: List[List[int]],
+        weights: List[List[float]],
+        volatilities: List[List[float]],
+        asset_classes: List[List[str]],
+    ) -> np.ndarray:
+        """
+        Annualised volatility sqrt(w'Σw) for many portfolios at once.
+
+        Each portfolio is given by parallel lists of scheme codes, weights,
+        fallback volatilities (fractions; NaN if unknown) and asset classes.
+        Portfolios are padded to a common size and evaluated as one batched
+        product per chunk. Holdings that are neither modelled nor have a
+        volatility are left out.
+        """
+        count = len(scheme_codes)
+        size = max((len(codes) for codes in scheme_codes), default=0)
+        out = np.zeros(count)
+        if size == 0:
+            return out
+
+        codes = np.full((count, size), -1, dtype=np.int64)
+        w = np.zeros((count, size))
+        vols = np.full((count, size), np.nan)
+        classes = np.zeros((count, size), dtype=np.int64)
+        for p in range(count):
+            m = len(scheme_codes[p])
+            codes[p, :m] = scheme_codes[p]
+            w[p, :m] = weights[p]
+            vols[p, :m] = volatilities[p]
+            classes[p, :m] = [asset_class_index(c) for c in asset_classes[p]]
+
+        for start in range(0, count, BATCH_CHUNK):
+            chunk = slice(start, start + BATCH_CHUNK)
+            covariance, known = self._blended_covariances(codes[chunk], vols[chunk], classes[chunk])
+            chunk_weights = np.where(known, w[chunk], 0.0)
+            variance = np.einsum("pi,pij,pj->p", chunk_weights, np.nan_to_num(covariance), chunk_weights)
+            out[chunk] = np.sqrt(np.clip(variance, 0.0, None))
+        return out
+
+    def _blended_covariances(
+        self,
+        codes: np.ndarray,
+        volatilities: np.ndarray,
+        classes: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Covariance matrices for a (P, m) batch of schemes, shape (P, m, m).
+
+        Also returns the (P, m) mask of schemes with a known volatility.
+        """
+        model = self._model
+        correlations = PRIOR_CORRELATIONS[classes[:, :, None], classes[:, None, :]]
+        diagonal = np.arange(codes.shape[1])
+        correlations[:, diagonal, diagonal] = 1.0
+
+        modelled = np.zeros(codes.shape, dtype=bool)
+        if model is not None:
+            rows = model.rows_of(codes.ravel().tolist()).reshape(codes.shape)
+            modelled = rows >= 0
+            volatilities = np.where(modelled, model.volatility[rows], volatilities)
+
+        covariance = correlations * volatilities[:, :, None] * volatilities[:, None, :]
+        if modelled.any():
+            loadings = np.where(modelled[:, :, None], model.loadings[rows], 0.0)
+            block = loadings @ loadings.transpose(0, 2, 1)
+            block[:, diagonal, diagonal] += np.where(modelled, model.specific_variance[rows], 0.0)
+            both = modelled[:, :, None] & modelled[:, None, :]
+            covariance = np.where(both, block, covariance)
+        return covariance, ~np.isnan(volatilities)
+
+    def correlation(self, scheme_codes: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Correlation sub-matrix (same conventions as ``covariance``)."""
+        matrix, available = self.covariance(scheme_codes)
+        vol = np.sqrt(np.diag(matrix))
+        return matrix / np.outer(vol, vol), available
+
+    def volatility(self, scheme_codes: List[int]) -> np.ndarray:
+        """Annualised volatility per scheme (NaN where not modelled)."""
+        model = self._model
+        out = np.full(len(scheme_codes), np.nan)
+        if model is not None:
+            rows = model.rows_of(scheme_codes)
+            out[rows >= 0] = model.volatility[rows[rows >= 0]]
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        """Model and cache statistics for health reporting."""
+        model = self._model
+        return {
+            "version": self.version,
+            "schemes": len(model.scheme_codes) if model is not None else 0,
+            "factors": model.loadings.shape[1] if model is not None else 0,
+            "observations": model.observations if model is not None else 0,
+            "built_at": model.built_at.isoformat() if model is not None else None,
+            "last_build_ms": self._last_build_ms,
+            "cache_entries": len(self._cache),
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+        }
+
+
+# Global instance, rebuilt after every NAV history sync that changed data
+covariance_service = CovarianceService()
+nav_history_service.add_sync_listener(covariance_service.rebuild)
@@ -0,0 +1,220 @@
+"""
+Execution lanes for CPU-bound service calls.
+
+Route handlers are ``async def`` but the services they call are
+synchronous; running them on the event loop stalls every other request in
+the worker while one large optimisation or batch is computed. Calls are
+instead dispatched by endpoint to one of three lanes:
+
+* ``inline``  - called directly on the loop (trivial calls, where a thread
+  hop would cost more than the work)
+* ``thread``  - a shared thread pool (NumPy, OSQP and the service caches
+  release the GIL or are thread-safe; in-process state such as the fund
+  universe and covariance model is shared)
+* ``process`` - a process pool for heavy, self-contained work (Monte Carlo
+  simulation). Only endpoints whose callables need no in-process state
+  may use it; others configured for it run on the thread lane.
+
+Lanes and routes are configured from settings (EXECUTOR_*). Every lane
+reports in-flight and queued calls, and every endpoint its call counts and
+latency, on /health.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+LANES = (INLINE, THREAD, PROCESS)
+
+# Default lane per endpoint (unknown endpoints use the thread lane)
+DEFAULT_ROUTES = {
+    "classify": INLINE,
+    "classify_blended": INLINE,
+    "classify_batch": THREAD,
+    "optimize": THREAD,
+    "recommend": THREAD,
+    "recommend_blended": THREAD,
+    "recommend_blended_batch": THREAD,
+    "risk": THREAD,
+    "analyze": THREAD,
+    "analyze_batch": THREAD,
+    "project": PROCESS,
+    "backtest": THREAD,
+    "backtest_batch": THREAD,
+}
+
+# Endpoints whose callables are picklable and need no in-process state
+PROCESS_SAFE = frozenset({"project"})
+
+
+class _LaneStats:
+    """Counters for one lane (updated on the event loop thread only)."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers) if self.workers else 0,
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+class _EndpointStats:
+    """Call count and latency for one endpoint."""
+
+    def __init__(self, lane: str):
+        self.lane = lane
+        self.calls = 0
+        self.failed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lane": self.lane,
+            "calls": self.calls,
+            "failed": self.failed,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else None,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class ExecutorService:
+    """Dispatches synchronous service calls to the inline, thread or process lane."""
+
+    def __init__(self, threads: int = 8, processes: int = 2, routes: Optional[Dict[str, str]] = None):
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.configure(threads, processes, routes)
+
+    def configure(self, threads: int, processes: int, routes: Optional[Dict[str, str]] = None):
+        """
+        Set pool sizes and route overrides (endpoint -> lane).
+
+        Pools are created on first use, so this must be called before any
+        call is dispatched. With ``processes=0`` the process lane is disabled
+        and its endpoints run on the thread lane.
+        """
+        self._thread_count = max(1, threads)
+        self._process_count = max(0, processes)
+        self._routes: Dict[str, str] = dict(DEFAULT_ROUTES)
+        for endpoint, lane in (routes or {}).items():
+            if lane not in LANES:
+                raise ValueError(f"Unknown execution lane for {endpoint}: {lane}")
+            self._routes[endpoint] = lane
+        self._lanes = {
+            INLINE: _LaneStats(0),
+            THREAD: _LaneStats(self._thread_count),
+            PROCESS: _LaneStats(self._process_count),
+        }
+        self._endpoints: Dict[str, _EndpointStats] = {}
+
+    def lane_for(self, endpoint: str) -> str:
+        """Lane an endpoint's calls run on."""
+        lane = self._routes.get(endpoint, THREAD)
+        if lane == PROCESS and (endpoint not in PROCESS_SAFE or self._process_count == 0):
+            return THREAD
+        return lane
+
+    async def run(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the endpoint's lane and return its result.
+
+        Exceptions raised by ``fn`` propagate to the caller unchanged.
+        """
+        lane = self.lane_for(endpoint)
+        lane_stats = self._lanes[lane]
+        endpoint_stats = self._endpoints.get(endpoint)
+        if endpoint_stats is None or endpoint_stats.lane != lane:
+            endpoint_stats = self._endpoints[endpoint] = _EndpointStats(lane)
+
+        start_time = time.perf_counter()
+        lane_stats.in_flight += 1
+        lane_stats.max_in_flight = max(lane_stats.max_in_flight, lane_stats.in_flight)
+        try:
+            if lane == INLINE:
+                result = fn(*args, **kwargs)
+            else:
+                call = functools.partial(fn, *args, **kwargs)
+                result = await asyncio.get_running_loop().run_in_executor(self._executor(lane), call)
+        except BaseException as e:
+            lane_stats.failed += 1
+            endpoint_stats.failed += 1
+            if isinstance(e, BrokenProcessPool):
+                self._reset_process_pool()
+            raise
+        finally:
+            lane_stats.in_flight -= 1
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            endpoint_stats.calls += 1
+            endpoint_stats.total_ms += elapsed_ms
+            endpoint_stats.max_ms = max(endpoint_stats.max_ms, elapsed_ms)
+        lane_stats.completed += 1
+        return result
+
+    def _executor(self, lane: str) -> Executor:
+        with self._pool_lock:
+            if lane == PROCESS:
+                if self._processes is None:
+                    # Spawned workers: forking a process that runs gRPC and
+                    # event loop threads is unsafe
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self._process_count,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    logger.info(f"Started process lane with {self._process_count} workers")
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self._thread_count, thread_name_prefix="ml-exec"
+                )
+            return self._threads
+
+    def _reset_process_pool(self):
+        """Drop a broken process pool (a worker died); the next call starts a new one."""
+        with self._pool_lock:
+            pool, self._processes = self._processes, None
+        if pool is not None:
+            logger.warning("Process lane broken; restarting it on the next call")
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop both pools (pending calls are cancelled)."""
+        with self._pool_lock:
+            pools = [self._threads, self._processes]
+            self._threads = self._processes = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-lane queue depth and per-endpoint latency for health reporting."""
+        return {
+            "lanes": {lane: stats.to_dict() for lane, stats in self._lanes.items()},
+            "endpoints": {endpoint: stats.to_dict() for endpoint, stats in sorted(self._endpoints.items())},
+        }
+
+
+# Global instance (configured from settings at startup)
+executor_service = ExecutorService()
@@ -6,12 +6,19 @@ This service fetches from Backend's /api/v1/funds/live/ml/funds endpoint.
 
 import httpx
 import asyncio
+import itertools
 import logging
 import os
-from typing import List, Dict, Optional
+import random
+import threading
+import time
+from typing import Any, Callable, List, Dict, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
+from app.services import universe_store
+from app.services.fund_universe import FundUniverse
+
 logger = logging.getLogger(__name__)
 
 # Backend URL - the source of truth for fund data
@@ -88,159 +95,586 @@ class FundData:
     last_updated: Optional[datetime] = None
 
 
+def _parse_fund(fund_dict: Dict) -> FundData:
+    """Build a FundData record from a Backend /ml/funds entry."""
+    return FundData(
+        scheme_code=fund_dict.get("scheme_code", 0),
+        scheme_name=fund_dict.get("scheme_name", ""),
+        fund_house=fund_dict.get("fund_house", "Unknown"),
+        category=fund_dict.get("category", "Other"),
+        nav=fund_dict.get("nav", 0),
+        return_1y=fund_dict.get("return_1y"),
+        return_3y=fund_dict.get("return_3y"),
+        return_5y=fund_dict.get("return_5y"),
+        volatility=fund_dict.get("volatility"),
+        sharpe_ratio=fund_dict.get("sharpe_ratio"),
+        expense_ratio=fund_dict.get("expense_ratio"),
+        asset_class=fund_dict.get("asset_class", "equity"),
+        last_updated=datetime.now(),
+    )
+
+
 class FundDataService:
     """Service to fetch fund data from Backend database."""
 
     def __init__(self):
         self._cache: Dict[int, FundData] = {}
+        self._universe: Optional[FundUniverse] = None
+        self._versions = itertools.count(1)
+        self._snapshot_listeners: List[Callable[[FundUniverse], None]] = []
         self._cache_expiry: Optional[datetime] = None
         self._cache_duration = timedelta(minutes=30)  # Cache for 30 minutes
         self._initialized = False
+        # Single-flight refresh: concurrent callers await the same task
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Event loop that owns refreshes (the app loop); other threads hand work to it
+        self._owner_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Guards the swap of cache, universe and expiry so readers never see a mix
+        self._swap_lock = threading.Lock()
+        # Background refresher (see start_background_refresh)
+        self._refresher_task: Optional[asyncio.Task] = None
+        # Refresh statistics (reported on /health)
+        self._last_refresh_at: Optional[datetime] = None
+        self._last_refresh_duration_ms: Optional[int] = None
+        self._last_refresh_error: Optional[str] = None
+        self._consecutive_failures = 0
+        self._total_failures = 0
+        # Delta sync: backend watermark from the last sync, plus a periodic full resync
+        self._watermark: Optional[str] = None
+        self._last_full_sync_at: Optional[datetime] = None
+        self._full_resync_interval = timedelta(hours=6)
+        self._last_sync_mode: Optional[str] = None
+        # On-disk copy of the last good snapshot (see set_snapshot_store)
+        self._store_path: Optional[str] = None
+        # Sharing across worker processes (see enable_shared_snapshot)
+        self._shared = False
+        self._is_publisher = True
+        self._lock_file = None
+        self._follow_poll_seconds = 2.0
+        self._snapshot_id: Optional[str] = None
 
     async def initialize(self):
-        """Initialize the fund data cache."""
+        """
+        Initialize the fund data cache.
+
+        If a persisted snapshot is available it is served straight away and
+        revalidated against the Backend in the background; otherwise this
+        waits for the first download.
+        """
+        if self._owner_loop is None:
+            self._owner_loop = asyncio.get_running_loop()
         if not self._initialized:
-            await self.refresh_all_funds()
+            if await self._load_persisted_snapshot():
+                if not self.is_follower():
+                    self._start_refresh()
+            else:
+                await self.refresh_all_funds()
             self._initialized = True
 
+    def set_snapshot_store(self, path: str):
+        """Persist each snapshot fetched from the Backend under ``path`` and load it at startup."""
+        self._store_path = path
+
+    def enable_shared_snapshot(self, poll_seconds: float = 2.0):
+        """
+        Share one universe between all worker processes using the snapshot store.
+
+        The process holding an exclusive lock on the store is the publisher:
+        it alone talks to the Backend and writes each new snapshot. The others
+        are followers: they poll the store's CURRENT pointer and memory-map
+        each new snapshot, so column data is held once in the page cache
+        rather than per worker. If the publisher exits its lock is released
+        and the next follower to poll takes over.
+        """
+        if not self._store_path:
+            raise ValueError("set_snapshot_store() must be called before enable_shared_snapshot()")
+        self._shared = True
+        self._follow_poll_seconds = poll_seconds
+        self._is_publisher = self._try_become_publisher()
+        logger.info(f"Fund universe sharing enabled (role: {'publisher' if self._is_publisher else 'follower'})")
+
+    @property
+    def follow_poll_seconds(self) -> float:
+        """Seconds between polls of the shared snapshot store while following."""
+        return self._follow_poll_seconds
+
+    def _try_become_publisher(self) -> bool:
+        """Take the store lock without blocking. Returns True if this process holds it."""
+        if self._lock_file is not None:
+            return True
+        try:
+            import fcntl
+        except ImportError:
+            # No flock (non-POSIX): every process publishes for itself
+            return True
+        os.makedirs(self._store_path, exist_ok=True)
+        lock_file = open(os.path.join(self._store_path, "publisher.lock"), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def is_follower(self) -> bool:
+        """
+        True if another process publishes the universe.
+
+        Followers must not refresh from the Backend or write to the snapshot
+        stores. If the publisher has gone this process takes its lock and
+        becomes the publisher, so the answer can change between calls.
+        """
+        if not self._shared or self._is_publisher:
+            return False
+        if self._try_become_publisher():
+            self._is_publisher = True
+            logger.info("Fund universe publisher gone; this process is now the publisher")
+            return False
+        return True
+
+    async def _load_persisted_snapshot(self) -> bool:
+        """Load the last saved snapshot from the store (if configured). Returns True if loaded."""
+        if not self._store_path or self._cache:
+            return False
+        start_time = time.time()
+        stored = await asyncio.to_thread(universe_store.load_universe, self._store_path, FundData)
+        if stored is None or len(stored.universe) == 0:
+            return False
+        await asyncio.to_thread(self._run_snapshot_listeners, stored.universe)
+        # Treat as already expired; the revalidation replaces it shortly
+        self._install_stored(stored, expiry=datetime.now())
+        logger.info(
+            f"Loaded {len(stored.universe)} funds from snapshot saved at {stored.saved_at.isoformat()} "
+            f"in {int((time.time() - start_time) * 1000)}ms"
+        )
+        return True
+
+    async def _follow_shared_snapshot(self) -> bool:
+        """Follower refresh: pick up the publisher's snapshot if it changed. Returns True if one is loaded."""
+        snapshot_id = universe_store.current_snapshot_id(self._store_path)
+        if snapshot_id is None or snapshot_id == self._snapshot_id:
+            if self._universe is not None:
+                self._extend_expiry(self._cache_duration)
+            return self._universe is not None
+
+        stored = await asyncio.to_thread(universe_store.load_universe, self._store_path, FundData)
+        if stored is None:
+            # Publisher may be replacing it right now; retried on the next poll
+            return self._universe is not None
+        await asyncio.to_thread(self._run_snapshot_listeners, stored.universe)
+        self._install_stored(stored, expiry=datetime.now() + self._cache_duration)
+        self._last_sync_mode = "shared"
+        logger.info(f"Loaded shared fund universe {stored.snapshot_id} ({len(stored.universe)} funds)")
+        return True
+
+    def _install_stored(self, stored: "universe_store.StoredUniverse", expiry: datetime):
+        """Swap in a snapshot loaded from the store (snapshot listeners must have run on it)."""
+        universe = stored.universe
+        # Keep versions increasing across restarts and in step with the publisher
+        self._versions = itertools.count(universe.version + 1)
+        with self._swap_lock:
+            self._cache = {fund.scheme_code: fund for fund in universe.funds}
+            self._universe = universe
+            self._cache_expiry = expiry
+        self._snapshot_id = stored.snapshot_id
+        self._watermark = stored.watermark
+        self._last_full_sync_at = stored.last_full_sync_at
+        self._last_refresh_at = stored.saved_at
+
+    def _persist_snapshot(self, universe: FundUniverse, watermark: Optional[str], last_full_sync_at: Optional[datetime]):
+        if not self._store_path:
+            return
+        try:
+            self._snapshot_id = universe_store.save_universe(
+                self._store_path, universe, watermark, last_full_sync_at
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist fund universe snapshot: {e}")
+
     async def get_fund(self, scheme_code: int) -> Optional[FundData]:
         """Get fund data by scheme code."""
-        if scheme_code in self._cache:
-            return self._cache[scheme_code]
-        return None
+        return self._cache.get(scheme_code)
 
     async def get_all_funds(self) -> List[FundData]:
-        """Get all cached funds."""
-        if not self._cache or self._is_cache_expired():
+        """
+        Get all cached funds.
+
+        Stale-while-revalidate: once data is loaded an expired cache is still
+        served while a refresh runs in the background. Only a cold cache
+        waits for the download.
+        """
+        if not self._cache:
             await self.refresh_all_funds()
+        elif self._is_cache_expired():
+            self._start_refresh()
         return list(self._cache.values())
 
+    async def get_universe(self) -> Optional[FundUniverse]:
+        """
+        Get the current snapshot with the same refresh behaviour as get_all_funds.
+
+        Unlike get_all_funds this does not copy the fund list, so callers that
+        only need an indexed subset stay proportional to the result size.
+        """
+        if not self._cache:
+            await self.refresh_all_funds()
+        elif self._is_cache_expired():
+            self._start_refresh()
+        return self._universe
+
+    @property
+    def universe(self) -> Optional[FundUniverse]:
+        """Current columnar snapshot of the fund universe (None until first load)."""
+        return self._universe
+
+    def snapshot(self) -> Optional[FundUniverse]:
+        """
+        Current snapshot, safe to call from any thread without blocking.
+
+        Reading the attribute is lock-free: snapshots are immutable and are
+        replaced by a single assignment. If nothing is loaded yet a refresh is
+        requested on the owner loop and None is returned immediately.
+        """
+        universe = self._universe
+        if universe is None:
+            self.request_refresh()
+        return universe
+
+    def request_refresh(self):
+        """Ask the owner loop to start a refresh (no-op if none is running). Never blocks."""
+        loop = self._owner_loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._start_refresh)
+        except RuntimeError:
+            # Loop closed between the check and the call (shutdown)
+            pass
+
+    def add_snapshot_listener(self, listener: Callable[[FundUniverse], None]):
+        """Register a callback run with every newly published snapshot (e.g. to warm indexes)."""
+        if listener not in self._snapshot_listeners:
+            self._snapshot_listeners.append(listener)
+
+    async def _publish_snapshot(self, cache: Dict[int, FundData], cache_duration: timedelta):
+        """
+        Build a snapshot from a fully loaded cache and swap it in atomically.
+
+        The universe (and anything listeners derive from it) is built in a
+        worker thread so in-flight requests are not stalled; only the swap
+        runs on the event loop. Readers see either the previous snapshot or
+        the new one, never an empty or partially filled cache.
+        """
+        universe = await asyncio.to_thread(self._build_snapshot, cache, next(self._versions))
+        self._swap_snapshot(cache, universe, cache_duration)
+
+    def _build_snapshot(self, cache: Dict[int, FundData], version: int) -> FundUniverse:
+        """Build the universe for a cache and run the snapshot listeners on it."""
+        universe = FundUniverse(
+            cache.values(),
+            category_to_asset_class=CATEGORY_TO_ASSET_CLASS,
+            version=version,
+        )
+        self._run_snapshot_listeners(universe)
+        return universe
+
+    def _swap_snapshot(self, cache: Dict[int, FundData], universe: FundUniverse, cache_duration: timedelta):
+        with self._swap_lock:
+            self._cache = cache
+            self._universe = universe
+            self._cache_expiry = datetime.now() + cache_duration
+
+    def _run_snapshot_listeners(self, universe: FundUniverse):
+        # Secondary indexes first so listeners (rankings) can use them
+        universe.build_indexes()
+        for listener in self._snapshot_listeners:
+            try:
+                listener(universe)
+            except Exception as e:
+                logger.warning(f"Snapshot listener failed: {e}")
+
+    def _extend_expiry(self, cache_duration: timedelta):
+        with self._swap_lock:
+            self._cache_expiry = datetime.now() + cache_duration
+
     def _is_cache_expired(self) -> bool:
         """Check if cache has expired."""
         if not self._cache_expiry:
             return True
         return datetime.now() > self._cache_expiry
 
-    async def refresh_all_funds(self):
-        """Refresh fund data from Backend database."""
-        logger.info(f"Refreshing fund data from Backend: {BACKEND_URL}")
+    async def refresh_all_funds(self) -> bool:
+        """
+        Refresh fund data from Backend database. Returns True on success.
+
+        Single-flight: if a refresh is already running, callers wait for it
+        instead of starting another download.
+        """
+        owner = self._owner_loop
+        if owner is not None and owner is not asyncio.get_running_loop() and owner.is_running():
+            # Refreshes run on the owner loop only; wait for it from this loop
+            future = asyncio.run_coroutine_threadsafe(self.refresh_all_funds(), owner)
+            return await asyncio.wrap_future(future)
+        # Shield so a cancelled caller does not cancel the refresh for everyone else
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Return the in-flight refresh task, starting one if none is running (owner loop only)."""
+        task = self._refresh_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._refresh())
+            self._refresh_task = task
+        return task
+
+    def _needs_full_sync(self) -> bool:
+        """Full download when there is no watermark or the periodic resync is due."""
+        if not self._cache or self._watermark is None or self._last_full_sync_at is None:
+            return True
+        return datetime.now() - self._last_full_sync_at > self._full_resync_interval
+
+    async def _refresh(self) -> bool:
+        """
+        Sync fund data from the Backend and publish a new snapshot. Returns True on success.
+
+        Normally only plans changed since the last watermark are requested and
+        applied as upserts/deletes on a copy of the cache. A full download
+        replaces the cache on first load and every ``_full_resync_interval``
+        as a safety net (e.g. for rows deleted outright in the backend).
+        """
+        if self.is_follower():
+            if await self._follow_shared_snapshot():
+                return True
+            # Nothing published yet: serve the fallback until the publisher catches up
+            if not self._cache:
+                self._load_fallback_funds()
+            return False
+
+        full = self._needs_full_sync()
+        logger.info(f"Refreshing fund data from Backend ({'full' if full else 'delta'}): {BACKEND_URL}")
+        start_time = time.time()
 
         try:
+            params = {} if full else {"updated_since": self._watermark}
             async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(f"{BACKEND_URL}/api/v1/funds/live/ml/funds")
+                response = await client.get(f"{BACKEND_URL}/api/v1/funds/live/ml/funds", params=params)
                 response.raise_for_status()
                 data = response.json()
 
-                funds_list = data.get("funds", [])
-                logger.info(f"Received {len(funds_list)} funds from Backend")
-
-                # Clear and rebuild cache
-                self._cache.clear()
-
-                for fund_dict in funds_list:
-                    try:
-                        fund = FundData(
-                            scheme_code=fund_dict.get("scheme_code", 0),
-                            scheme_name=fund_dict.get("scheme_name", ""),
-                            fund_house=fund_dict.get("fund_house", "Unknown"),
-                            category=fund_dict.get("category", "Other"),
-                            nav=fund_dict.get("nav", 0),
-                            return_1y=fund_dict.get("return_1y"),
-                            return_3y=fund_dict.get("return_3y"),
-                            return_5y=fund_dict.get("return_5y"),
-                            volatility=fund_dict.get("volatility"),
-                            sharpe_ratio=fund_dict.get("sharpe_ratio"),
-                            expense_ratio=fund_dict.get("expense_ratio"),
-                            asset_class=fund_dict.get("asset_class", "equity"),
-                            last_updated=datetime.now(),
-                        )
-                        if fund.scheme_code > 0:
-                            self._cache[fund.scheme_code] = fund
-                    except Exception as e:
-                        logger.warning(f"Failed to parse fund: {e}")
-                        continue
-
-                self._cache_expiry = datetime.now() + self._cache_duration
-                logger.info(f"Fund data refresh complete. Loaded {len(self._cache)} funds.")
+            funds_list = data.get("funds", [])
+            deleted = data.get("deleted", [])
+            watermark = data.get("watermark")
+            # A backend without delta support ignores updated_since and returns everything
+            if not data.get("delta"):
+                full = True
+            logger.info(f"Received {len(funds_list)} funds ({len(deleted)} deleted) from Backend")
+
+            # Build the new cache off to the side; the live one stays readable
+            cache: Dict[int, FundData] = {} if full else dict(self._cache)
+
+            for fund_dict in funds_list:
+                try:
+                    fund = _parse_fund(fund_dict)
+                    if fund.scheme_code > 0:
+                        cache[fund.scheme_code] = fund
+                except Exception as e:
+                    logger.warning(f"Failed to parse fund: {e}")
+                    continue
+
+            for scheme_code in deleted:
+                cache.pop(scheme_code, None)
+
+            changed = full or funds_list or deleted
+            if changed:
+                await self._publish_snapshot(cache, self._cache_duration)
+            else:
+                # Nothing changed: keep the current snapshot (and its derived indexes)
+                self._extend_expiry(self._cache_duration)
+
+            self._watermark = watermark
+            if full:
+                self._last_full_sync_at = datetime.now()
+            if changed:
+                # Written off the event loop. A no-op delta is not persisted; the
+                # older watermark on disk only makes the first delta after a restart larger.
+                await asyncio.to_thread(
+                    self._persist_snapshot, self._universe, self._watermark, self._last_full_sync_at
+                )
+            self._last_sync_mode = "full" if full else "delta"
+            self._last_refresh_at = datetime.now()
+            self._last_refresh_duration_ms = int((time.time() - start_time) * 1000)
+            self._last_refresh_error = None
+            self._consecutive_failures = 0
+            logger.info(
+                f"Fund data {self._last_sync_mode} refresh complete. "
+                f"{len(funds_list)} upserted, {len(deleted)} deleted, {len(cache)} funds loaded."
+            )
+            return True
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching funds from Backend: {e}")
+            self._record_refresh_failure(e, start_time)
             # Keep existing cache if refresh fails
             if not self._cache:
                 logger.warning("No cached data available, using fallback")
                 self._load_fallback_funds()
         except Exception as e:
             logger.error(f"Error refreshing funds: {e}")
+            self._record_refresh_failure(e, start_time)
             if not self._cache:
                 self._load_fallback_funds()
+        return False
+
+    def _record_refresh_failure(self, error: Exception, start_time: float):
+        self._last_refresh_duration_ms = int((time.time() - start_time) * 1000)
+        self._last_refresh_error = str(error) or type(error).__name__
+        self._consecutive_failures += 1
+        self._total_failures += 1
+
+    def start_background_refresh(self, interval_seconds: float, jitter_seconds: float = 0.0):
+        """
+        Start refreshing the universe periodically on the running event loop.
+
+        Each cycle waits ``interval_seconds`` plus or minus up to
+        ``jitter_seconds`` (so replicas do not hit the backend together) and
+        then refreshes. Readers keep the previous snapshot until the new one
+        is published. After a failure the next attempt uses a shorter wait.
+        """
+        if self._refresher_task is not None and not self._refresher_task.done():
+            return
+        self._owner_loop = asyncio.get_running_loop()
+        self._refresher_task = self._owner_loop.create_task(
+            self._refresh_loop(interval_seconds, jitter_seconds)
+        )
+        logger.info(f"Background fund refresh every {interval_seconds}s (jitter {jitter_seconds}s)")
+
+    async def stop_background_refresh(self):
+        """Cancel the background refresher (if running)."""
+        task = self._refresher_task
+        self._refresher_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _refresh_loop(self, interval_seconds: float, jitter_seconds: float):
+        while True:
+            if self.is_follower():
+                await asyncio.sleep(self._follow_poll_seconds)
+                try:
+                    await self._follow_shared_snapshot()
+                except Exception as e:
+                    logger.error(f"Failed to load shared fund universe: {e}")
+                continue
+
+            delay = interval_seconds
+            if self._consecutive_failures:
+                # Retry sooner after a failure, backing off up to the normal interval
+                delay = min(interval_seconds, 30.0 * 2 ** (self._consecutive_failures - 1))
+            delay = max(1.0, delay + random.uniform(-jitter_seconds, jitter_seconds))
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_all_funds()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background fund refresh failed: {e}")
+
+    def refresh_stats(self) -> Dict[str, Any]:
+        """Refresh age, duration and failure counts for health reporting."""
+        last_refresh_at = self._last_refresh_at
+        universe = self._universe
+        return {
+            "total_funds": len(self._cache),
+            "snapshot_version": universe.version if universe is not None else None,
+            "last_refresh_at": last_refresh_at.isoformat() if last_refresh_at else None,
+            "refresh_age_seconds": (
+                round((datetime.now() - last_refresh_at).total_seconds(), 1)
+                if last_refresh_at else None
+            ),
+            "last_refresh_duration_ms": self._last_refresh_duration_ms,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self._total_failures,
+            "last_error": self._last_refresh_error,
+            "cache_expiry": self._cache_expiry.isoformat() if self._cache_expiry else None,
+            "last_sync_mode": self._last_sync_mode,
+            "watermark": self._watermark,
+            "last_full_sync_at": self._last_full_sync_at.isoformat() if self._last_full_sync_at else None,
+            "snapshot_store": self._store_path,
+            "snapshot_id": self._snapshot_id,
+            "role": ("publisher" if self._is_publisher else "follower") if self._shared else "standalone",
+            "background_refresh": self._refresher_task is not None and not self._refresher_task.done(),
+        }
 
     def _load_fallback_funds(self):
         """Load fallback funds if backend is unavailable."""
-        fallback = get_fallback_funds()
-        for fund_dict in fallback:
-            fund = FundData(
-                scheme_code=fund_dict["scheme_code"],
-                scheme_name=fund_dict["scheme_name"],
-                fund_house=fund_dict["fund_house"],
-                category=fund_dict["category"],
-                nav=100.0,
-                return_1y=fund_dict.get("return_1y"),
-                return_3y=fund_dict.get("return_3y"),
-                return_5y=fund_dict.get("return_5y"),
-                volatility=fund_dict.get("volatility"),
-                sharpe_ratio=fund_dict.get("sharpe_ratio"),
-                expense_ratio=fund_dict.get("expense_ratio"),
-                asset_class=CATEGORY_TO_ASSET_CLASS.get(fund_dict["category"], "equity"),
-            )
-            self._cache[fund.scheme_code] = fund
-        self._cache_expiry = datetime.now() + timedelta(hours=1)
-        logger.warning(f"Loaded {len(self._cache)} fallback funds")
+        cache = {fund.scheme_code: fund for fund in get_fallback_fund_data()}
+        # A handful of funds: cheap enough to build on the calling thread
+        self._swap_snapshot(cache, self._build_snapshot(cache, next(self._versions)), timedelta(hours=1))
+        # The fallback list is not backend data; the next sync must be a full one
+        self._watermark = None
+        logger.warning(f"Loaded {len(cache)} fallback funds")
 
 
 # Singleton instance
 fund_data_service = FundDataService()
 
 
+def get_fund_universe() -> FundUniverse:
+    """
+    Get the current columnar fund universe without blocking.
+
+    Safe from request handlers, gRPC worker threads and scripts alike: it
+    never performs network I/O. Until the first snapshot is loaded (by the
+    owner loop) the fallback universe is returned.
+    """
+    universe = fund_data_service.snapshot()
+    return universe if universe is not None else _fallback_universe()
+
+
 def get_funds_as_dict_list() -> List[Dict]:
     """Get all funds as list of dicts (for compatibility with existing code)."""
-    import asyncio
+    return get_fund_universe().as_dict_list()
 
-    # Get event loop or create one
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    # If we're already in an async context, we can't use run_until_complete
-    if fund_data_service._cache:
-        funds = list(fund_data_service._cache.values())
-    else:
-        try:
-            loop.run_until_complete(fund_data_service.refresh_all_funds())
-            funds = list(fund_data_service._cache.values())
-        except RuntimeError:
-            logger.warning("Cannot fetch funds synchronously from async context. Using fallback.")
-            return get_fallback_funds()
 
+def get_fallback_fund_data() -> List[FundData]:
+    """Fallback funds as FundData records."""
     return [
-        {
-            "scheme_code": f.scheme_code,
-            "scheme_name": f.scheme_name,
-            "fund_house": f.fund_house,
-            "category": f.category,
-            "asset_class": f.asset_class,
-            "return_1y": f.return_1y or 0,
-            "return_3y": f.return_3y or 0,
-            "return_5y": f.return_5y or 0,
-            "volatility": f.volatility or 15.0,
-            "sharpe_ratio": f.sharpe_ratio or 0.8,
-            "expense_ratio": f.expense_ratio or 0.5,
-        }
-        for f in funds
+        FundData(
+            scheme_code=fund_dict["scheme_code"],
+            scheme_name=fund_dict["scheme_name"],
+            fund_house=fund_dict["fund_house"],
+            category=fund_dict["category"],
+            nav=100.0,
+            return_1y=fund_dict.get("return_1y"),
+            return_3y=fund_dict.get("return_3y"),
+            return_5y=fund_dict.get("return_5y"),
+            volatility=fund_dict.get("volatility"),
+            sharpe_ratio=fund_dict.get("sharpe_ratio"),
+            expense_ratio=fund_dict.get("expense_ratio"),
+            asset_class=CATEGORY_TO_ASSET_CLASS.get(fund_dict["category"], "equity"),
+        )
+        for fund_dict in get_fallback_funds()
     ]
 
 
+_fallback_universe_instance: Optional[FundUniverse] = None
+
+
+def _fallback_universe() -> FundUniverse:
+    """Universe built from the fallback funds (built once)."""
+    global _fallback_universe_instance
+    if _fallback_universe_instance is None:
+        _fallback_universe_instance = FundUniverse(
+            get_fallback_fund_data(), category_to_asset_class=CATEGORY_TO_ASSET_CLASS
+        )
+    return _fallback_universe_instance
+
+
 def get_fallback_funds() -> List[Dict]:
     """Fallback fund data in case Backend is unavailable."""
     return [
@@ -0,0 +1,373 @@
+"""
+Columnar fund universe snapshot.
+
+Holds the refreshed fund list as parallel NumPy arrays (scheme codes,
+category / asset class ids and float64 metric columns with NaN masks) so
+filter and score paths can index it directly instead of rebuilding a list
+of dicts on every request. A snapshot is immutable once built; refreshes
+produce a new snapshot with a higher version.
+
+Secondary indexes (rows per asset class, category and fund house, and rows
+ordered by each metric) are built when a snapshot is published, so
+filtered views touch only the rows they return.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Canonical asset classes (ids are stable; unknown labels are appended after these)
+ASSET_CLASSES = ("equity", "debt", "hybrid", "gold", "international", "liquid")
+
+# Float metric columns stored per fund
+METRIC_COLUMNS = (
+    "return_1y",
+    "return_3y",
+    "return_5y",
+    "volatility",
+    "sharpe_ratio",
+    "expense_ratio",
+)
+
+# Values substituted for missing (or zero) metrics in the "filled" columns.
+# Matches the defaults the dict-based recommendation path has always used.
+METRIC_DEFAULTS = {
+    "return_1y": 0.0,
+    "return_3y": 0.0,
+    "return_5y": 0.0,
+    "volatility": 15.0,
+    "sharpe_ratio": 0.8,
+    "expense_ratio": 0.5,
+}
+
+
+# Shared empty row set returned for unknown labels
+_NO_ROWS = np.empty(0, dtype=np.int64)
+_NO_ROWS.flags.writeable = False
+
+
+def _vocabulary(labels: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode labels as int32 ids in first-seen order.
+
+    Returns:
+        Tuple of (ids, names)
+    """
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    ids = []
+    for label in labels:
+        lid = index.get(label)
+        if lid is None:
+            lid = len(names)
+            index[label] = lid
+            names.append(label)
+        ids.append(lid)
+    return np.array(ids, dtype=np.int32), names
+
+
+def _partition(ids: np.ndarray, names: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Split row ids by label with one stable sort.
+
+    Rows stay ascending within each label; labels without rows are left out.
+    Returned arrays are read-only views into one shared order array.
+    """
+    order = np.argsort(ids, kind="stable")
+    order.flags.writeable = False
+    bounds = np.searchsorted(np.asarray(ids)[order], np.arange(len(names) + 1))
+    return {
+        names[i]: order[bounds[i]:bounds[i + 1]]
+        for i in range(len(names))
+        if bounds[i + 1] > bounds[i]
+    }
+
+
+class FundUniverse:
+    """
+    Immutable, array-backed view of the fund universe.
+
+    Row ``i`` of every column describes ``funds[i]``. Derived structures
+    (dict lists, rankings, indexes) are memoised per snapshot via ``derive``
+    so they are rebuilt only when a new snapshot is published.
+    """
+
+    def __init__(
+        self,
+        funds: List[Any],
+        category_to_asset_class: Dict[str, str],
+        version: int = 0,
+    ):
+        self.version = version
+        self.created_at = datetime.now()
+        self.funds = list(funds)
+
+        n = len(self.funds)
+        self.scheme_codes = np.fromiter(
+            (f.scheme_code for f in self.funds), dtype=np.int64, count=n
+        )
+        self.nav = np.fromiter(
+            (f.nav or 0.0 for f in self.funds), dtype=np.float64, count=n
+        )
+
+        # Category and fund house vocabularies (ids in first-seen order)
+        self.category_ids, self.category_names = _vocabulary(f.category for f in self.funds)
+        self._category_index = {name: i for i, name in enumerate(self.category_names)}
+        self.fund_house_ids, self.fund_house_names = _vocabulary(f.fund_house for f in self.funds)
+
+        # Asset class vocabulary (canonical classes first)
+        self.asset_class_names: List[str] = list(ASSET_CLASSES)
+        self._asset_class_index = {name: i for i, name in enumerate(self.asset_class_names)}
+        asset_class_ids = np.empty(n, dtype=np.int16)
+        for i, fund in enumerate(self.funds):
+            asset_class_ids[i] = self._intern_asset_class(
+                fund.asset_class or category_to_asset_class.get(fund.category, "equity")
+            )
+        self.asset_class_ids = asset_class_ids
+
+        # Asset class implied by category alone (used by the /funds views)
+        category_asset_class = np.array(
+            [
+                self._intern_asset_class(category_to_asset_class.get(name, "equity"))
+                for name in self.category_names
+            ],
+            dtype=np.int16,
+        )
+        self.category_asset_class_ids = (
+            category_asset_class[self.category_ids] if n else np.empty(0, dtype=np.int16)
+        )
+
+        # Metric columns: raw (NaN = missing), mask (True = present), filled (defaults applied)
+        self._set_metrics({
+            column: np.fromiter(
+                (
+                    np.nan if getattr(f, column) is None else getattr(f, column)
+                    for f in self.funds
+                ),
+                dtype=np.float64,
+                count=n,
+            )
+            for column in METRIC_COLUMNS
+        })
+        self._finish()
+
+    @classmethod
+    def from_columns(
+        cls,
+        funds: List[Any],
+        columns: Dict[str, np.ndarray],
+        category_names: List[str],
+        asset_class_names: List[str],
+        version: int = 0,
+        created_at: Optional[datetime] = None,
+        fund_house_names: Optional[List[str]] = None,
+    ) -> "FundUniverse":
+        """
+        Rebuild a snapshot from previously stored columns (see universe_store).
+
+        ``columns`` holds scheme_codes, nav, category_ids, asset_class_ids,
+        category_asset_class_ids and the raw METRIC_COLUMNS, plus
+        fund_house_ids when ``fund_house_names`` is given (otherwise fund
+        house ids are rebuilt from ``funds``). Arrays may be read-only memory
+        maps; they are used as-is.
+        """
+        self = cls.__new__(cls)
+        self.version = version
+        self.created_at = created_at or datetime.now()
+        self.funds = list(funds)
+        self.scheme_codes = columns["scheme_codes"]
+        self.nav = columns["nav"]
+        self.category_names = list(category_names)
+        self._category_index = {name: i for i, name in enumerate(self.category_names)}
+        self.category_ids = columns["category_ids"]
+        self.asset_class_names = list(asset_class_names)
+        self._asset_class_index = {name: i for i, name in enumerate(self.asset_class_names)}
+        self.asset_class_ids = columns["asset_class_ids"]
+        self.category_asset_class_ids = columns["category_asset_class_ids"]
+        if fund_house_names is not None and "fund_house_ids" in columns:
+            self.fund_house_ids = columns["fund_house_ids"]
+            self.fund_house_names = list(fund_house_names)
+        else:
+            self.fund_house_ids, self.fund_house_names = _vocabulary(f.fund_house for f in self.funds)
+        self._set_metrics({column: columns[column] for column in METRIC_COLUMNS})
+        self._finish()
+        return self
+
+    def _set_metrics(self, raw_columns: Dict[str, np.ndarray]):
+        self.metrics: Dict[str, np.ndarray] = {}
+        self.masks: Dict[str, np.ndarray] = {}
+        self.filled: Dict[str, np.ndarray] = {}
+        for column, raw in raw_columns.items():
+            present = ~np.isnan(raw)
+            self.metrics[column] = raw
+            self.masks[column] = present
+            self.filled[column] = np.where(present & (raw != 0), raw, METRIC_DEFAULTS[column])
+
+    def _finish(self):
+        self._row_by_code: Dict[int, int] = {
+            int(code): i for i, code in enumerate(self.scheme_codes.tolist())
+        }
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.RLock()
+
+    def _intern_asset_class(self, label: str) -> int:
+        aid = self._asset_class_index.get(label)
+        if aid is None:
+            aid = len(self.asset_class_names)
+            self._asset_class_index[label] = aid
+            self.asset_class_names.append(label)
+        return aid
+
+    def __len__(self) -> int:
+        return len(self.funds)
+
+    def row_of(self, scheme_code: int) -> Optional[int]:
+        """Row index for a scheme code, or None if not in the universe."""
+        return self._row_by_code.get(scheme_code)
+
+    def rows_of(self, scheme_codes: Iterable[int]) -> np.ndarray:
+        """Row indexes for scheme codes (-1 where the code is unknown)."""
+        lookup = self._row_by_code
+        return np.array([lookup.get(code, -1) for code in scheme_codes], dtype=np.int64)
+
+    def get(self, scheme_code: int) -> Optional[Any]:
+        """FundData for a scheme code, or None."""
+        row = self._row_by_code.get(scheme_code)
+        return self.funds[row] if row is not None else None
+
+    def category_id(self, category: str) -> Optional[int]:
+        return self._category_index.get(category)
+
+    def asset_class_id(self, asset_class: str) -> Optional[int]:
+        return self._asset_class_index.get(asset_class)
+
+    def asset_class_of(self, row: int) -> str:
+        return self.asset_class_names[self.asset_class_ids[row]]
+
+    def rows_in_asset_class(self, asset_class: str) -> np.ndarray:
+        """Rows of an asset class, ascending (empty if the class is unknown)."""
+        return self._index("asset_class", self.asset_class_ids, self.asset_class_names).get(
+            asset_class, _NO_ROWS
+        )
+
+    def rows_in_category_asset_class(self, asset_class: str) -> np.ndarray:
+        """Rows whose category maps to an asset class, ascending (the /funds view)."""
+        return self._index(
+            "category_asset_class", self.category_asset_class_ids, self.asset_class_names
+        ).get(asset_class, _NO_ROWS)
+
+    def rows_in_category(self, category: str) -> np.ndarray:
+        """Rows of a category, ascending (empty if the category is unknown)."""
+        return self._index("category", self.category_ids, self.category_names).get(category, _NO_ROWS)
+
+    def rows_of_fund_house(self, fund_house: str) -> np.ndarray:
+        """Rows of a fund house, ascending (empty if the fund house is unknown)."""
+        return self._index("fund_house", self.fund_house_ids, self.fund_house_names).get(
+            fund_house, _NO_ROWS
+        )
+
+    def category_asset_classes(self) -> List[str]:
+        """Asset classes implied by the categories present in this snapshot."""
+        return list(
+            self._index("category_asset_class", self.category_asset_class_ids, self.asset_class_names)
+        )
+
+    def metric_order(self, column: str) -> np.ndarray:
+        """
+        Rows ordered by a raw metric, highest first.
+
+        Missing values sort last; ties keep row order. Take a prefix for
+        top-k by a single metric, or a boolean mask over it to order a
+        subset without sorting again.
+        """
+        def build(u: "FundUniverse") -> np.ndarray:
+            raw = u.metrics[column]
+            present = u.masks[column]
+            order = np.lexsort((np.arange(len(raw)), -np.where(present, raw, 0.0), ~present))
+            order.flags.writeable = False
+            return order
+
+        return self.derive(f"index:order:{column}", build)
+
+    def select_rows(
+        self,
+        category_asset_class: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Rows matching optional filters, in row order or by ``sort_by`` (see metric_order).
+
+        Filters are read from the row indexes, so unsorted selections cost
+        time proportional to the rows returned.
+        """
+        rows = None
+        if category_asset_class:
+            rows = self.rows_in_category_asset_class(category_asset_class)
+        if category:
+            category_rows = self.rows_in_category(category)
+            rows = category_rows if rows is None else np.intersect1d(rows, category_rows, assume_unique=True)
+        if sort_by:
+            order = self.metric_order(sort_by)
+            if rows is None:
+                return order
+            selected = np.zeros(len(self), dtype=bool)
+            selected[rows] = True
+            return order[selected[order]]
+        return np.arange(len(self)) if rows is None else rows
+
+    def build_indexes(self):
+        """Build every secondary index now (called when a snapshot is published)."""
+        self.rows_in_asset_class("")
+        self.rows_in_category_asset_class("")
+        self.rows_in_category("")
+        self.rows_of_fund_house("")
+        for column in METRIC_COLUMNS:
+            self.metric_order(column)
+
+    def _index(self, name: str, ids: np.ndarray, names: List[str]) -> Dict[str, np.ndarray]:
+        """Label -> ascending row ids for a vocab-encoded column, built once per snapshot."""
+        return self.derive(f"index:{name}", lambda u: _partition(ids, names))
+
+    def derive(self, key: str, builder: Callable[["FundUniverse"], Any]) -> Any:
+        """
+        Memoise a structure derived from this snapshot.
+
+        The builder runs at most once per key per snapshot; every caller of a
+        given key sees the same object until the snapshot is replaced.
+        """
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+        with self._derived_lock:
+            value = self._derived.get(key)
+            if value is None:
+                value = builder(self)
+                self._derived[key] = value
+        return value
+
+    def to_dict(self, row: int) -> dict:
+        """Fund row in the legacy dict format (defaults applied)."""
+        f = self.funds[row]
+        return {
+            "scheme_code": f.scheme_code,
+            "scheme_name": f.scheme_name,
+            "fund_house": f.fund_house,
+            "category": f.category,
+            "asset_class": self.asset_class_of(row),
+            "return_1y": f.return_1y or 0,
+            "return_3y": f.return_3y or 0,
+            "return_5y": f.return_5y or 0,
+            "volatility": f.volatility or 15.0,
+            "sharpe_ratio": f.sharpe_ratio or 0.8,
+            "expense_ratio": f.expense_ratio or 0.5,
+        }
+
+    def as_dict_list(self) -> List[dict]:
+        """All funds in the legacy dict format, built once per snapshot."""
+        return self.derive(
+            "dict_list", lambda u: [u.to_dict(i) for i in range(len(u))]
+        )
@@ -0,0 +1,452 @@
+"""
+NAV history service.
+
+Keeps daily NAV history for the fund universe in a NavStore (float32 rows
+on a shared business-day calendar, memory-mapped under MODEL_STORE_PATH)
+and serves aligned NAV / return matrices for any set of scheme codes to
+risk models, drawdown and backtesting code without Backend round trips.
+
+The store is synced from the Backend's /api/v1/funds/live/ml/funds/nav-history
+endpoint: schemes not yet in the store are backfilled in batches, then
+only NAVs newer than the last synced date (minus a few days of overlap for
+late publications) are requested. With the shared fund universe enabled,
+only the publisher process syncs; followers map the same files.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+import numpy as np
+
+from app.services.fund_data_service import BACKEND_URL, fund_data_service
+from app.services.nav_store import NavStore
+
+logger = logging.getLogger(__name__)
+
+# Trading days per year (used to annualise daily statistics)
+TRADING_DAYS = 252
+
+# Schemes per backfill request
+BACKFILL_BATCH_SIZE = 100
+
+# Days re-requested before the last synced date (NAVs published late)
+SYNC_OVERLAP_DAYS = 7
+
+
+@dataclass
+class NavMatrix:
+    """NAVs for a set of schemes on common dates (rows) x schemes (columns)."""
+    dates: np.ndarray
+    scheme_codes: List[int]
+    navs: np.ndarray
+
+    def returns(self) -> np.ndarray:
+        """Daily simple returns, shape (len(dates) - 1, schemes); NaN where either NAV is missing."""
+        return self.navs[1:] / self.navs[:-1] - 1.0
+
+
+class NavHistoryService:
+    """NAV history store plus its sync from the Backend."""
+
+    def __init__(self, years: int = 5, retry_after: timedelta = timedelta(minutes=10)):
+        self.store = NavStore(years=years)
+        self._watermark: Optional[str] = None
+        self._failed_at: Dict[int, datetime] = {}
+        self._retry_after = retry_after
+        self._sync_lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        # Background backfills started by request paths, and the schemes they cover
+        self._backfill_tasks: Set[asyncio.Task] = set()
+        self._backfilling: Set[int] = set()
+        # Callbacks run (in a worker thread) after the stored data changes
+        self._sync_listeners: List[Callable[["NavHistoryService"], None]] = []
+        self._notified_revision: Optional[int] = None
+        self._notify_lock = asyncio.Lock()
+        self._notify_task: Optional[asyncio.Task] = None
+        # Sync statistics (reported on /health)
+        self._last_sync_at: Optional[datetime] = None
+        self._last_sync_duration_ms: Optional[int] = None
+        self._last_sync_error: Optional[str] = None
+        self._consecutive_failures = 0
+
+    @property
+    def version(self) -> int:
+        """Changes whenever NAV data changes (cache key for derived data)."""
+        return self.store.revision
+
+    def set_store_path(self, path: str, years: Optional[int] = None):
+        """Keep the store under ``path`` (memory-mapped) and load what is already there."""
+        self.store = NavStore(root=path, years=years or self.store.years)
+        watermark = self.store.load(writable=not fund_data_service.is_follower())
+        if watermark is not None:
+            self._watermark = watermark or None
+            logger.info(
+                f"Loaded NAV history for {len(self.store)} schemes "
+                f"({self.store.n_days} days, latest {self.store.latest_date})"
+            )
+
+    # ----------------------------------------------------------------- reads
+
+    def get_history(self, scheme_code: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(dates, navs) with a NAV for one scheme, or None if it has no history."""
+        state = self.store.state()
+        if state.rows.get(scheme_code) is None:
+            return None
+        navs = state.window([scheme_code])[:, 0]
+        present = ~np.isnan(navs)
+        return state.dates()[present], navs[present]
+
+    def nav_matrix(
+        self,
+        scheme_codes: List[int],
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        forward_fill: bool = True,
+    ) -> NavMatrix:
+        """
+        NAVs for the schemes between ``start`` and ``end`` (dates, inclusive).
+
+        Calendar days on which none of the schemes has a NAV (holidays) are
+        dropped. With ``forward_fill`` a scheme's last NAV is carried over
+        days it did not publish; days before its first NAV stay NaN.
+        """
+        state = self.store.state()
+        first, last = 0, state.n_days
+        if start is not None:
+            first = int(np.busday_count(state.calendar_start, np.datetime64(start, "D")))
+        if end is not None:
+            last = int(np.busday_count(state.calendar_start, np.datetime64(end, "D") + np.timedelta64(1, "D")))
+        navs = state.window(scheme_codes, first, last)
+        dates = state.dates(max(0, first), max(0, first) + len(navs))
+
+        present = ~np.isnan(navs)
+        trading = present.any(axis=1)
+        navs, present, dates = navs[trading], present[trading], dates[trading]
+
+        if forward_fill and len(navs):
+            # Index of the last row with a NAV, per column
+            last_seen = np.where(present, np.arange(len(navs))[:, None], 0)
+            np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+            filled = navs[last_seen, np.arange(navs.shape[1])]
+            navs = np.where(np.maximum.accumulate(present, axis=0), filled, np.nan)
+
+        return NavMatrix(dates=dates, scheme_codes=list(scheme_codes), navs=navs)
+
+    def return_matrix(
+        self,
+        scheme_codes: List[int],
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily returns for the schemes as ``(dates, returns)``.
+
+        ``returns`` has shape (days, schemes); ``dates[i]`` is the day return
+        ``i`` ends on. NAVs are forward-filled (see nav_matrix), so returns
+        are NaN only before a scheme's first NAV.
+        """
+        matrix = self.nav_matrix(scheme_codes, start, end)
+        return matrix.dates[1:], matrix.returns()
+
+    def aligned_returns(
+        self,
+        scheme_codes: List[int],
+        lookback_days: int = 3 * TRADING_DAYS,
+        min_observations: int = 120,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily simple returns for the schemes on the dates all of them have a NAV.
+
+        Returns ``(returns, available)``: ``returns`` has one row per date in
+        the most recent ``lookback_days`` on which every available scheme
+        published a NAV, and one column per available scheme; ``available``
+        is a boolean mask over ``scheme_codes``. Schemes without at least
+        ``min_observations`` returns in the window are marked unavailable,
+        as are the shortest histories if the common dates would be too few.
+        """
+        state = self.store.state()
+        navs = state.window(scheme_codes, state.n_days - lookback_days - 1)
+        present = ~np.isnan(navs)
+        available = present.sum(axis=0) > min_observations
+
+        while available.any():
+            common = present[:, available].all(axis=1)
+            if common.sum() > min_observations:
+                prices = navs[np.ix_(common, available)]
+                return prices[1:] / prices[:-1] - 1.0, available
+            counts = np.where(available, present.sum(axis=0), np.iinfo(np.int64).max)
+            available[np.argmin(counts)] = False
+
+        return np.empty((0, 0)), available
+
+    # ------------------------------------------------------------------ sync
+
+    def add_sync_listener(self, listener: Callable[["NavHistoryService"], None]):
+        """Register a callback run after NAV data changes (e.g. to rebuild risk models)."""
+        if listener not in self._sync_listeners:
+            self._sync_listeners.append(listener)
+
+    async def _notify_listeners(self):
+        """
+        Run the sync listeners off the event loop if the data changed since they last ran.
+
+        Callers arriving while the listeners run wait for that run; if the
+        data changed meanwhile the listeners run once more, so any number of
+        writes during a run cost a single extra rebuild.
+        """
+        async with self._notify_lock:
+            while self.store.revision != self._notified_revision:
+                self._notified_revision = self.store.revision
+                for listener in self._sync_listeners:
+                    try:
+                        await asyncio.to_thread(listener, self)
+                    except Exception as e:
+                        logger.warning(f"NAV history sync listener failed: {e}")
+
+    def _schedule_notify(self):
+        """Run the sync listeners in the background (at most one pending run)."""
+        if self._notify_task is None or self._notify_task.done():
+            self._notify_task = asyncio.get_running_loop().create_task(self._notify_listeners())
+
+    def set_history(self, scheme_code: int, points: List[dict]) -> int:
+        """Write a history given as [{"date": ..., "nav": ...}]. Returns the days written."""
+        dates = np.array([str(p["date"])[:10] for p in points], dtype="datetime64[D]")
+        navs = np.array([float(p["nav"]) for p in points], dtype=np.float64)
+        return self.store.upsert(scheme_code, dates, navs)
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        since: str,
+        scheme_codes: Optional[List[int]] = None,
+        known_only: bool = False,
+    ) -> Tuple[int, Optional[str]]:
+        """
+        Request NAVs after ``since`` and write them to the store.
+
+        Returns (days written, latest date reported by the Backend). With
+        ``known_only`` schemes not yet in the store are skipped (they are
+        backfilled in full instead of starting from a partial window).
+        """
+        params = {"since": since}
+        if scheme_codes:
+            params["scheme_codes"] = ",".join(str(code) for code in scheme_codes)
+        response = await client.get(f"{BACKEND_URL}/api/v1/funds/live/ml/funds/nav-history", params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        def apply() -> int:
+            written = 0
+            for scheme in data.get("schemes", []):
+                code = scheme["scheme_code"]
+                if known_only and self.store.row_of(code) is None:
+                    continue
+                written += self.store.upsert(
+                    code,
+                    np.array(scheme["dates"], dtype="datetime64[D]"),
+                    np.array(scheme["navs"], dtype=np.float64),
+                )
+            return written
+
+        written = await asyncio.to_thread(apply)
+        return written, data.get("latest_date")
+
+    async def ensure(self, scheme_codes: Iterable[int]) -> int:
+        """
+        Backfill schemes that have no history yet. Returns the number of days written.
+
+        Used on request paths that need specific schemes before the
+        background sync has reached them. Failures are logged and not
+        retried for ``retry_after``.
+        """
+        if fund_data_service.is_follower():
+            return 0
+        now = datetime.now()
+        missing = [
+            code for code in dict.fromkeys(scheme_codes)
+            if self.store.row_of(code) is None
+            and not (code in self._failed_at and now - self._failed_at[code] < self._retry_after)
+        ]
+        if not missing:
+            return 0
+
+        since = str(self.store.calendar_start - np.timedelta64(1, "D"))
+        written = 0
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                for i in range(0, len(missing), BACKFILL_BATCH_SIZE):
+                    batch = missing[i:i + BACKFILL_BATCH_SIZE]
+                    written += (await self._fetch(client, since, batch))[0]
+        except Exception as e:
+            logger.warning(f"Failed to fetch NAV history for {len(missing)} schemes: {e}")
+        for code in missing:
+            if self.store.row_of(code) is None:
+                self._failed_at[code] = now
+        if written:
+            # Don't hold up the caller while derived models are rebuilt
+            self._schedule_notify()
+        return written
+
+    def ensure_in_background(self, scheme_codes: Iterable[int]):
+        """
+        Start ``ensure`` for the schemes without waiting for it.
+
+        For request paths that only benefit from the history once derived
+        models are rebuilt (e.g. the covariance used by the optimizer).
+        Schemes already being backfilled are not requested again.
+        """
+        codes = [
+            code for code in dict.fromkeys(scheme_codes)
+            if code not in self._backfilling and self.store.row_of(code) is None
+        ]
+        if not codes:
+            return
+        self._backfilling.update(codes)
+        task = asyncio.get_running_loop().create_task(self.ensure(codes))
+        self._backfill_tasks.add(task)
+
+        def done(task: asyncio.Task):
+            self._backfill_tasks.discard(task)
+            self._backfilling.difference_update(codes)
+
+        task.add_done_callback(done)
+
+    async def sync(self) -> bool:
+        """
+        Bring the store up to date with the Backend. Returns True on success.
+
+        Step 1 backfills every scheme of the fund universe that has no
+        history; step 2 fetches NAVs published since the last synced date.
+        """
+        if fund_data_service.is_follower():
+            followed = self._follow()
+            if followed:
+                await self._notify_listeners()
+            return followed
+
+        async with self._sync_lock:
+            start_time = time.time()
+            try:
+                if not self.store.writable:
+                    # Promoted from follower: remap the store read-write
+                    self.store.load(writable=True)
+                universe = fund_data_service.snapshot()
+                codes = universe.scheme_codes.tolist() if universe is not None else []
+                missing = [code for code in codes if self.store.row_of(code) is None]
+                backfill_since = str(self.store.calendar_start - np.timedelta64(1, "D"))
+                backfilled = 0
+                updated = 0
+
+                async with httpx.AsyncClient(timeout=60.0) as client:
+                    # Step 1: backfill new schemes
+                    if missing:
+                        self.store.reserve(len(self.store) + len(missing))
+                    for i in range(0, len(missing), BACKFILL_BATCH_SIZE):
+                        written, latest = await self._fetch(client, backfill_since, missing[i:i + BACKFILL_BATCH_SIZE])
+                        backfilled += written
+                        if self._watermark is None and latest:
+                            self._watermark = latest
+
+                    # Step 2: incremental update of known schemes
+                    if self._watermark is not None and len(self.store):
+                        since = str(np.datetime64(self._watermark, "D") - np.timedelta64(SYNC_OVERLAP_DAYS, "D"))
+                        updated, latest = await self._fetch(client, since, known_only=True)
+                        if latest:
+                            self._watermark = latest
+
+                await asyncio.to_thread(self.store.save, self._watermark)
+                self._last_sync_at = datetime.now()
+                self._last_sync_duration_ms = int((time.time() - start_time) * 1000)
+                self._last_sync_error = None
+                self._consecutive_failures = 0
+                logger.info(
+                    f"NAV history sync complete: {len(missing)} schemes backfilled ({backfilled} days), "
+                    f"{updated} days updated, {len(self.store)} schemes stored"
+                )
+            except Exception as e:
+                logger.error(f"NAV history sync failed: {e}")
+                self._last_sync_duration_ms = int((time.time() - start_time) * 1000)
+                self._last_sync_error = str(e) or type(e).__name__
+                self._consecutive_failures += 1
+
+        # Also after a failure: data loaded from disk still needs its derived models
+        await self._notify_listeners()
+        return self._consecutive_failures == 0
+
+    def _follow(self) -> bool:
+        """Follower: remap the publisher's store when it has moved on."""
+        meta = self.store.read_meta()
+        if meta is None:
+            return False
+        if meta.get("revision") != self.store.revision:
+            watermark = self.store.load(meta, writable=False)
+            if watermark is None:
+                return False
+            self._watermark = watermark or None
+            self._last_sync_at = datetime.now()
+        return True
+
+    def start_background_sync(self, interval_seconds: float, jitter_seconds: float = 0.0):
+        """Sync now and then every ``interval_seconds`` (plus or minus jitter) on the running loop."""
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        self._sync_task = asyncio.get_running_loop().create_task(
+            self._sync_loop(interval_seconds, jitter_seconds)
+        )
+        logger.info(f"Background NAV history sync every {interval_seconds}s")
+
+    async def stop_background_sync(self):
+        """Cancel the background sync (if running)."""
+        task = self._sync_task
+        self._sync_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _sync_loop(self, interval_seconds: float, jitter_seconds: float):
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background NAV history sync failed: {e}")
+
+            delay = interval_seconds
+            if fund_data_service.is_follower():
+                delay = fund_data_service.follow_poll_seconds
+            elif self._consecutive_failures:
+                delay = min(interval_seconds, 30.0 * 2 ** (self._consecutive_failures - 1))
+            await asyncio.sleep(max(1.0, delay + random.uniform(-jitter_seconds, jitter_seconds)))
+
+    def sync_stats(self) -> Dict[str, Any]:
+        """Store size and sync state for health reporting."""
+        store = self.store
+        return {
+            "schemes": len(store),
+            "days": store.n_days,
+            "calendar_start": str(store.calendar_start),
+            "latest_date": str(store.latest_date) if store.latest_date is not None else None,
+            "watermark": self._watermark,
+            "store_path": store.root,
+            "size_bytes": store.size_bytes(),
+            "last_sync_at": self._last_sync_at.isoformat() if self._last_sync_at else None,
+            "last_sync_duration_ms": self._last_sync_duration_ms,
+            "consecutive_failures": self._consecutive_failures,
+            "last_error": self._last_sync_error,
+            "background_sync": self._sync_task is not None and not self._sync_task.done(),
+        }
+
+
+# Global instance
+nav_history_service = NavHistoryService()
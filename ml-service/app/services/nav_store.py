@@ -0,0 +1,323 @@
+"""
+On-disk NAV history store.
+
+Holds daily NAVs for every scheme as float32 rows on one shared
+business-day calendar (Mon-Fri from ``calendar_start``), so any set of
+schemes can be sliced into an aligned matrix without joins. Missing days
+(holidays, dates before a scheme's launch) are NaN.
+
+Layout::
+
+    <root>/meta.json          calendar, row order (scheme codes), sync watermark
+    <root>/navs-<gen>.npy     row-major float32 matrix, row_capacity x day_capacity
+
+The matrix is an .npy file opened with ``mmap_mode``. Rows and calendar
+days are allocated with headroom; when either runs out a larger file (next
+generation) is written and meta.json is atomically replaced to point at
+it. Updates within capacity are written in place, so followers mapping the
+same file see them without reloading.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older stores are rebuilt
+FORMAT_VERSION = 1
+
+# Extra calendar days / rows allocated whenever the matrix grows
+DAY_HEADROOM = 260
+ROW_HEADROOM = 512
+
+
+def business_days_before(end: np.datetime64, years: int) -> np.datetime64:
+    """First business day on or after ``end`` minus ``years`` years."""
+    start = np.datetime64(end, "D") - np.timedelta64(365 * years + years // 4, "D")
+    return np.busday_offset(start, 0, roll="forward")
+
+
+class NavState(NamedTuple):
+    """
+    One consistent view of the store: matrix, calendar length and row index.
+
+    A state is replaced as a whole whenever the matrix, calendar or
+    calendar length changes. Within a state the only changes are NAVs
+    written in place and schemes appended to ``rows``/``codes``, whose row
+    is always within the matrix, so a reader holding a state never sees a
+    row index or day count the matrix does not have.
+    """
+    navs: np.ndarray
+    n_days: int
+    rows: Dict[int, int]
+    codes: List[int]
+    calendar_start: np.datetime64
+
+    def dates(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Calendar dates (datetime64[D]) for day indexes ``start:stop``."""
+        stop = self.n_days if stop is None else stop
+        return np.busday_offset(self.calendar_start, np.arange(start, stop))
+
+    def rows_of(self, scheme_codes: Iterable[int]) -> np.ndarray:
+        """Row indexes for scheme codes (-1 where the scheme has no history)."""
+        rows = self.rows
+        return np.array([rows.get(code, -1) for code in scheme_codes], dtype=np.int64)
+
+    def window(self, scheme_codes: List[int], start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        NAVs for the schemes over day indexes ``start:stop`` as float64, shape (days, schemes).
+
+        Schemes without history give an all-NaN column.
+        """
+        stop = self.n_days if stop is None else min(stop, self.n_days)
+        start = max(0, start)
+        rows = self.rows_of(scheme_codes)
+        out = np.full((max(0, stop - start), len(rows)), np.nan)
+        known = rows >= 0
+        if known.any() and stop > start:
+            out[:, known] = self.navs[rows[known], start:stop].T
+        return out
+
+
+class NavStore:
+    """
+    Per-scheme NAV rows on a shared business-day calendar.
+
+    Writes are serialised by a lock and publish a new NavState whenever
+    the matrix or calendar changes (a grown matrix is swapped in only after
+    it is fully populated). Reads take no lock: each takes the current
+    state once and works on it, so readers that combine several reads
+    (e.g. NAVs and their dates) should call ``state()`` and use that.
+    """
+
+    def __init__(self, root: Optional[str] = None, years: int = 5):
+        self.root = root
+        self.years = years
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        today = np.datetime64(date.today(), "D")
+        self._state = NavState(
+            navs=np.full((0, 0), np.nan, dtype=np.float32),
+            n_days=0,
+            rows={},
+            codes=[],
+            calendar_start=business_days_before(today, self.years),
+        )
+        self._generation = 0
+        self.latest_date: Optional[np.datetime64] = None
+        self.revision = 0
+        self.writable = True
+
+    # ----------------------------------------------------------------- reads
+
+    def state(self) -> NavState:
+        """The current state (a consistent view to read from)."""
+        return self._state
+
+    def __len__(self) -> int:
+        return len(self._state.codes)
+
+    @property
+    def n_days(self) -> int:
+        return self._state.n_days
+
+    @property
+    def calendar_start(self) -> np.datetime64:
+        return self._state.calendar_start
+
+    @property
+    def scheme_codes(self) -> List[int]:
+        return list(self._state.codes)
+
+    def dates(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Calendar dates (datetime64[D]) for day indexes ``start:stop``."""
+        return self._state.dates(start, stop)
+
+    def day_index(self, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calendar indexes for dates, with a mask of dates that are on the calendar."""
+        calendar_start = self._state.calendar_start
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        valid = np.is_busday(dates) & (dates >= calendar_start)
+        index = np.busday_count(calendar_start, dates)
+        return index, valid
+
+    def row_of(self, scheme_code: int) -> Optional[int]:
+        return self._state.rows.get(scheme_code)
+
+    def rows_of(self, scheme_codes: Iterable[int]) -> np.ndarray:
+        """Row indexes for scheme codes (-1 where the scheme has no history)."""
+        return self._state.rows_of(scheme_codes)
+
+    def window(self, scheme_codes: List[int], start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        NAVs for the schemes over day indexes ``start:stop`` as float64, shape (days, schemes).
+
+        Schemes without history give an all-NaN column.
+        """
+        return self._state.window(scheme_codes, start, stop)
+
+    # ---------------------------------------------------------------- writes
+
+    def upsert(self, scheme_code: int, dates: np.ndarray, navs: np.ndarray) -> int:
+        """
+        Write NAVs for one scheme (dates off the calendar are ignored).
+
+        Returns the number of days written.
+        """
+        index, valid = self.day_index(dates)
+        navs = np.asarray(navs, dtype=np.float32)
+        valid &= navs > 0
+        if not valid.any():
+            return 0
+        index, navs = index[valid], navs[valid]
+
+        with self._lock:
+            state = self._state
+            row = state.rows.get(scheme_code)
+            needed_rows = len(state.codes) + (row is None)
+            needed_days = max(state.n_days, int(index.max()) + 1)
+            if needed_rows > state.navs.shape[0] or needed_days > state.navs.shape[1]:
+                state = self._grow(needed_rows, needed_days)
+            if row is None:
+                # Within the matrix of this state, so safe to publish in place
+                row = len(state.codes)
+                state.rows[scheme_code] = row
+                state.codes.append(scheme_code)
+            state.navs[row, index] = navs
+            if needed_days != state.n_days:
+                state = self._state = state._replace(n_days=needed_days)
+            latest = state.dates(needed_days - 1, needed_days)[0]
+            if self.latest_date is None or latest > self.latest_date:
+                self.latest_date = latest
+            self.revision += 1
+        return len(index)
+
+    def reserve(self, rows: int):
+        """Make room for ``rows`` schemes up front (avoids repeated growth during a backfill)."""
+        with self._lock:
+            state = self._state
+            if rows > state.navs.shape[0]:
+                # Room for the calendar through today as well
+                days = int(np.busday_count(state.calendar_start, np.datetime64(date.today(), "D"))) + 1
+                self._grow(rows, max(state.n_days, days))
+
+    def _grow(self, rows: int, days: int) -> NavState:
+        """
+        Move to a larger matrix (a new file generation when on disk).
+
+        Publishes and returns a new state whose row index and codes are
+        copies, so readers of the old state never see rows beyond its matrix.
+        """
+        state = self._state
+        current_rows, current_days = state.navs.shape
+        shape = (
+            max(rows + ROW_HEADROOM, current_rows + current_rows // 2),
+            max(days + DAY_HEADROOM, current_days),
+        )
+        generation = self._generation + 1
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+            navs = np.lib.format.open_memmap(
+                self._matrix_path(generation), mode="w+", dtype=np.float32, shape=shape
+            )
+        else:
+            navs = np.empty(shape, dtype=np.float32)
+        navs[:] = np.nan
+        old = state.navs
+        navs[: old.shape[0], : old.shape[1]] = old
+        self._generation = generation
+        self._state = state._replace(navs=navs, rows=dict(state.rows), codes=list(state.codes))
+        return self._state
+
+    # ----------------------------------------------------------- persistence
+
+    def _matrix_path(self, generation: int) -> str:
+        return os.path.join(self.root, f"navs-{generation}.npy")
+
+    def save(self, watermark: Optional[str] = None):
+        """Flush the matrix and atomically publish meta.json (no-op without a root)."""
+        if not self.root:
+            return
+        with self._lock:
+            state = self._state
+            if isinstance(state.navs, np.memmap):
+                state.navs.flush()
+            meta = {
+                "format_version": FORMAT_VERSION,
+                "generation": self._generation,
+                "calendar_start": str(state.calendar_start),
+                "n_days": state.n_days,
+                "scheme_codes": list(state.codes),
+                "latest_date": str(self.latest_date) if self.latest_date is not None else None,
+                "revision": self.revision,
+                "watermark": watermark,
+            }
+        tmp = os.path.join(self.root, f"meta.json.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.root, "meta.json"))
+
+        # Drop matrix files from older generations
+        current = os.path.basename(self._matrix_path(meta["generation"]))
+        for entry in os.listdir(self.root):
+            if entry.startswith("navs-") and entry != current:
+                try:
+                    os.remove(os.path.join(self.root, entry))
+                except OSError:
+                    pass
+
+    def read_meta(self) -> Optional[dict]:
+        if not self.root:
+            return None
+        try:
+            with open(os.path.join(self.root, "meta.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def load(self, meta: Optional[dict] = None, writable: bool = True) -> Optional[str]:
+        """
+        Map the stored matrix (read-write unless ``writable`` is False).
+
+        Returns the stored sync watermark ("" if there is none), or None if
+        nothing usable was found.
+        """
+        meta = meta or self.read_meta()
+        if meta is None or meta.get("format_version") != FORMAT_VERSION:
+            return None
+        try:
+            navs = np.load(self._matrix_path(meta["generation"]), mmap_mode="r+" if writable else "r")
+        except (FileNotFoundError, ValueError, OSError) as e:
+            logger.warning(f"Failed to load NAV history store: {e}")
+            return None
+
+        codes = list(meta["scheme_codes"])
+        state = NavState(
+            navs=navs,
+            n_days=meta["n_days"],
+            rows={code: i for i, code in enumerate(codes)},
+            codes=codes,
+            calendar_start=np.datetime64(meta["calendar_start"], "D"),
+        )
+        with self._lock:
+            self._state = state
+            self._generation = meta["generation"]
+            latest = meta.get("latest_date")
+            self.latest_date = np.datetime64(latest, "D") if latest else None
+            self.revision = meta["revision"]
+            self.writable = writable
+        return meta.get("watermark") or ""
+
+    def size_bytes(self) -> int:
+        return int(self._state.navs.nbytes)
+
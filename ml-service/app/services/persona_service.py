@@ -2,13 +2,20 @@
 Persona classification service.
 Rules-based classification with blended persona distribution.
 Returns weighted distribution across all personas and blended allocation strategy.
+
+The rules depend only on an age bucket, a horizon bucket and four enum
+fields, so every result is precomputed in a rule table (a few hundred
+cells) and classification is a single lookup.
 """
 
 import time
+from bisect import bisect_left, bisect_right
 from typing import Dict, Tuple, List
 from dataclasses import dataclass, field
 
-from app.schemas.profile import ProfileInput, PersonaResult
+import numpy as np
+
+from app.schemas.profile import ProfileInput, PersonaResult, Liquidity, RiskTolerance, Knowledge, Volatility
 
 
 @dataclass
@@ -103,11 +110,217 @@ ALLOCATION_STRATEGIES = {
 }
 
 
+# ============= Rule tables =============
+# Persona scoring rules (matching the mobile app's buildPersona function) as
+# score tables indexed by age bucket, horizon bucket and enum codes. Columns
+# follow PERSONA_ORDER; a profile's scores are the sum of its six rows.
+
+PERSONA_ORDER = ("capital-guardian", "balanced-voyager", "accelerated-builder")
+ASSET_CLASS_ORDER = ("equity", "debt", "hybrid", "gold", "international", "liquid")
+
+# Age buckets: <30, 30-39, 40-54, 55+
+AGE_BUCKET_EDGES = (30, 40, 55)
+AGE_SCORES = np.array([
+    [0, 1, 3],
+    [0, 2, 2],
+    [1, 3, 1],
+    [3, 1, 0],
+], dtype=np.float64)
+
+# Horizon buckets: <=3, 4-5, 6-10, >10 years
+HORIZON_BUCKET_EDGES = (3, 5, 10)
+HORIZON_SCORES = np.array([
+    [3, 0, 0],
+    [2, 2, 0],
+    [0, 3, 1],
+    [0, 1, 3],
+], dtype=np.float64)
+
+# Enum tables (rows in enum declaration order)
+RISK_TOLERANCE_SCORES = np.array([[4, 0, 0], [0, 4, 0], [0, 0, 4]], dtype=np.float64)
+VOLATILITY_SCORES = np.array([[2, 0, 0], [0, 2, 0], [0, 0, 2]], dtype=np.float64)
+LIQUIDITY_SCORES = np.array([[0, 0, 2], [0, 2, 0], [2, 1, 0]], dtype=np.float64)
+KNOWLEDGE_SCORES = np.array([[1, 1, 0], [0, 1, 1], [0, 0, 2]], dtype=np.float64)
+
+ENUM_CODES = {
+    "risk_tolerance": {member: i for i, member in enumerate(RiskTolerance)},
+    "volatility": {member: i for i, member in enumerate(Volatility)},
+    "liquidity": {member: i for i, member in enumerate(Liquidity)},
+    "knowledge": {member: i for i, member in enumerate(Knowledge)},
+}
+
+# Shape of the rule space: age bucket x horizon bucket x the four enums
+RULE_SPACE_SHAPE = (
+    len(AGE_SCORES),
+    len(HORIZON_SCORES),
+    len(RISK_TOLERANCE_SCORES),
+    len(VOLATILITY_SCORES),
+    len(LIQUIDITY_SCORES),
+    len(KNOWLEDGE_SCORES),
+)
+
+
+def encode_profiles(profiles: List[ProfileInput]) -> Dict[str, np.ndarray]:
+    """Encode profiles as integer arrays (age, horizon and enum codes)."""
+    n = len(profiles)
+    encoded = {
+        "age": np.fromiter((p.age for p in profiles), dtype=np.int64, count=n),
+        "horizon_years": np.fromiter((p.horizon_years for p in profiles), dtype=np.int64, count=n),
+    }
+    for field_name, codes in ENUM_CODES.items():
+        encoded[field_name] = np.fromiter(
+            (codes[getattr(p, field_name)] for p in profiles), dtype=np.int64, count=n
+        )
+    return encoded
+
+
+def profile_cells(encoded: Dict[str, np.ndarray]) -> np.ndarray:
+    """Rule-space cell (row of the rule table) of each encoded profile."""
+    age_bucket = np.searchsorted(AGE_BUCKET_EDGES, encoded["age"], side="right")
+    horizon_bucket = np.searchsorted(HORIZON_BUCKET_EDGES, encoded["horizon_years"], side="left")
+    return np.ravel_multi_index(
+        (
+            age_bucket,
+            horizon_bucket,
+            encoded["risk_tolerance"],
+            encoded["volatility"],
+            encoded["liquidity"],
+            encoded["knowledge"],
+        ),
+        RULE_SPACE_SHAPE,
+    )
+
+
+def profile_cell(profile: ProfileInput) -> int:
+    """Rule-space cell of one profile (scalar version of profile_cells)."""
+    cell = bisect_right(AGE_BUCKET_EDGES, profile.age)
+    cell = cell * RULE_SPACE_SHAPE[1] + bisect_left(HORIZON_BUCKET_EDGES, profile.horizon_years)
+    for size, (field_name, codes) in zip(RULE_SPACE_SHAPE[2:], ENUM_CODES.items()):
+        cell = cell * size + codes[getattr(profile, field_name)]
+    return cell
+
+
+def rule_space_scores() -> np.ndarray:
+    """Persona scores for every rule-space cell, shape (cells, 3) in PERSONA_ORDER."""
+    age, horizon, risk, volatility, liquidity, knowledge = np.indices(RULE_SPACE_SHAPE).reshape(6, -1)
+
+    scores = AGE_SCORES[age]
+    scores = scores + HORIZON_SCORES[horizon]
+    scores = scores + RISK_TOLERANCE_SCORES[risk]
+    scores = scores + VOLATILITY_SCORES[volatility]
+    scores = scores + LIQUIDITY_SCORES[liquidity]
+    scores = scores + KNOWLEDGE_SCORES[knowledge]
+
+    # Ensure minimum scores for probability calculation
+    return np.maximum(scores, 0.1)
+
+
+@dataclass
+class RuleTable:
+    """
+    Classification results for every cell of the rule space.
+
+    Entries are shared by every profile in the same cell and are read-only.
+    """
+    version: int
+    # classify: (persona, confidence, probabilities) per cell
+    classified: List[Tuple[PersonaResult, float, Dict[str, float]]]
+    # classify_blended: (primary_persona, distribution, blended_allocation, confidence) per cell
+    blended: List[Tuple[PersonaResult, List[Dict], Dict[str, float], float]]
+    build_ms: int
+
+
+def build_rule_table(version: int = 1) -> RuleTable:
+    """
+    Precompute classify and classify_blended results for the whole rule space.
+
+    Reads PERSONAS and ALLOCATION_STRATEGIES, so it must be rebuilt when they
+    change (PersonaService.rebuild_rule_table). Cells with identical scores
+    share one entry.
+    """
+    start_time = time.time()
+
+    persona_results = [
+        PersonaResult(
+            id=PERSONAS[slug].id,
+            name=PERSONAS[slug].name,
+            slug=PERSONAS[slug].slug,
+            risk_band=PERSONAS[slug].risk_band,
+            description=PERSONAS[slug].description,
+        )
+        for slug in PERSONA_ORDER
+    ]
+    persona_dicts = [result.model_dump() for result in persona_results]
+    allocations = [
+        {asset_class: getattr(ALLOCATION_STRATEGIES[slug], asset_class) for asset_class in ASSET_CLASS_ORDER}
+        for slug in PERSONA_ORDER
+    ]
+
+    classified = []
+    blended = []
+    entries: Dict[tuple, tuple] = {}
+    for scores in map(tuple, rule_space_scores().tolist()):
+        entry = entries.get(scores)
+        if entry is None:
+            # Normalize to probabilities (this is the distribution)
+            total = sum(scores)
+            weights = [score / total for score in scores]
+
+            # Blended allocation: sum of persona weight x persona allocation per asset class
+            allocation = {asset_class: 0.0 for asset_class in ASSET_CLASS_ORDER}
+            for weight, persona_allocation in zip(weights, allocations):
+                for asset_class in ASSET_CLASS_ORDER:
+                    allocation[asset_class] += weight * persona_allocation[asset_class]
+
+            # Primary persona: highest weight (ties in persona order)
+            order = sorted(range(len(PERSONA_ORDER)), key=lambda i: -weights[i])
+            primary = order[0]
+            entry = entries[scores] = (
+                (
+                    persona_results[primary],
+                    weights[primary],
+                    dict(zip(PERSONA_ORDER, weights)),
+                ),
+                (
+                    persona_results[primary],
+                    [
+                        {
+                            "persona": persona_dicts[i],
+                            "weight": round(weights[i], 4),
+                            "allocation": allocations[i],
+                        }
+                        for i in order
+                    ],
+                    {asset_class: round(value, 4) for asset_class, value in allocation.items()},
+                    weights[primary],
+                ),
+            )
+        classified.append(entry[0])
+        blended.append(entry[1])
+
+    return RuleTable(
+        version=version,
+        classified=classified,
+        blended=blended,
+        build_ms=int((time.time() - start_time) * 1000),
+    )
+
+
 class PersonaService:
     """Service for classifying user profiles into investment personas."""
 
     def __init__(self):
         self.model_version = "rules-v2-blended"
+        self._rule_table = build_rule_table()
+
+    @property
+    def rules_version(self) -> str:
+        """Model and rule table version (changes when the table is rebuilt)."""
+        return f"{self.model_version}.{self._rule_table.version}"
+
+    def rebuild_rule_table(self):
+        """Recompute the rule table (after PERSONAS or ALLOCATION_STRATEGIES change) and swap it in."""
+        self._rule_table = build_rule_table(self._rule_table.version + 1)
 
     def classify(
         self, profile: ProfileInput
@@ -120,212 +333,78 @@ class PersonaService:
         """
         start_time = time.time()
 
-        # Calculate scores for each persona
-        scores = self._calculate_scores(profile)
-
-        # Normalize to probabilities
-        total = sum(scores.values())
-        probabilities = {k: v / total for k, v in scores.items()}
-
-        # Get the winning persona
-        winning_slug = max(probabilities, key=probabilities.get)
-        confidence = probabilities[winning_slug]
-
-        persona = PERSONAS[winning_slug]
-        result = PersonaResult(
-            id=persona.id,
-            name=persona.name,
-            slug=persona.slug,
-            risk_band=persona.risk_band,
-            description=persona.description,
-        )
+        persona, confidence, probabilities = self._rule_table.classified[profile_cell(profile)]
 
         latency_ms = int((time.time() - start_time) * 1000)
 
-        return result, confidence, probabilities, latency_ms
+        return persona, confidence, probabilities, latency_ms
 
     def classify_blended(self, profile: ProfileInput) -> BlendedClassificationResult:
         """
         Classify a user profile with full distribution and blended allocation.
 
         Returns weighted distribution across all personas and calculates
-        a blended asset allocation based on the weights.
+        a blended asset allocation based on the weights (one rule table lookup).
         """
         start_time = time.time()
 
-        # Calculate scores for each persona
-        scores = self._calculate_scores(profile)
-
-        # Normalize to probabilities (this is the distribution)
-        total = sum(scores.values())
-        distribution_weights = {k: v / total for k, v in scores.items()}
-
-        # Calculate blended allocation
-        blended_allocation = self._calculate_blended_allocation(distribution_weights)
-
-        # Get the primary (highest weight) persona
-        primary_slug = max(distribution_weights, key=distribution_weights.get)
-        primary_persona_data = PERSONAS[primary_slug]
-        primary_persona = PersonaResult(
-            id=primary_persona_data.id,
-            name=primary_persona_data.name,
-            slug=primary_persona_data.slug,
-            risk_band=primary_persona_data.risk_band,
-            description=primary_persona_data.description,
+        primary_persona, distribution, blended_allocation, confidence = (
+            self._rule_table.blended[profile_cell(profile)]
         )
 
-        # Build distribution list with persona details
-        distribution = []
-        for slug, weight in sorted(distribution_weights.items(), key=lambda x: -x[1]):
-            persona_data = PERSONAS[slug]
-            distribution.append({
-                "persona": {
-                    "id": persona_data.id,
-                    "name": persona_data.name,
-                    "slug": persona_data.slug,
-                    "risk_band": persona_data.risk_band,
-                    "description": persona_data.description,
-                },
-                "weight": round(weight, 4),
-                "allocation": self._get_persona_allocation(slug),
-            })
-
         latency_ms = int((time.time() - start_time) * 1000)
 
         return BlendedClassificationResult(
             primary_persona=primary_persona,
             distribution=distribution,
             blended_allocation=blended_allocation,
-            confidence=distribution_weights[primary_slug],
+            confidence=confidence,
             latency_ms=latency_ms,
             model_version=self.model_version,
         )
 
-    def _calculate_blended_allocation(
-        self, distribution: Dict[str, float]
-    ) -> Dict[str, float]:
+    def classify_blended_batch(
+        self, profiles: List[ProfileInput]
+    ) -> Tuple[List[BlendedClassificationResult], int]:
         """
-        Calculate blended asset allocation based on persona distribution.
+        Blended classification for many profiles at once.
 
-        For each asset class:
-        blended_value = sum(persona_weight * persona_allocation[asset])
-        """
-        blended = {
-            "equity": 0.0,
-            "debt": 0.0,
-            "hybrid": 0.0,
-            "gold": 0.0,
-            "international": 0.0,
-            "liquid": 0.0,
-        }
-
-        for slug, weight in distribution.items():
-            strategy = ALLOCATION_STRATEGIES[slug]
-            blended["equity"] += weight * strategy.equity
-            blended["debt"] += weight * strategy.debt
-            blended["hybrid"] += weight * strategy.hybrid
-            blended["gold"] += weight * strategy.gold
-            blended["international"] += weight * strategy.international
-            blended["liquid"] += weight * strategy.liquid
-
-        # Round to 4 decimal places
-        return {k: round(v, 4) for k, v in blended.items()}
-
-    def _get_persona_allocation(self, slug: str) -> Dict[str, float]:
-        """Get the allocation strategy for a specific persona."""
-        strategy = ALLOCATION_STRATEGIES[slug]
-        return {
-            "equity": strategy.equity,
-            "debt": strategy.debt,
-            "hybrid": strategy.hybrid,
-            "gold": strategy.gold,
-            "international": strategy.international,
-            "liquid": strategy.liquid,
-        }
-
-    def _calculate_scores(self, profile: ProfileInput) -> Dict[str, float]:
-        """
-        Calculate persona scores based on profile attributes.
-        Logic matches mobile app's buildPersona function.
+        Profiles are encoded into integer arrays and mapped to their rule
+        table cells in one vectorized step. Results match classify_blended
+        item by item.
+
+        Returns:
+            Tuple of (results in input order, latency_ms)
         """
-        scores = {
-            "capital-guardian": 0.0,
-            "balanced-voyager": 0.0,
-            "accelerated-builder": 0.0,
-        }
-
-        # Age-based scoring
-        if profile.age >= 55:
-            scores["capital-guardian"] += 3
-            scores["balanced-voyager"] += 1
-        elif profile.age >= 40:
-            scores["capital-guardian"] += 1
-            scores["balanced-voyager"] += 3
-            scores["accelerated-builder"] += 1
-        elif profile.age >= 30:
-            scores["balanced-voyager"] += 2
-            scores["accelerated-builder"] += 2
-        else:  # Under 30
-            scores["accelerated-builder"] += 3
-            scores["balanced-voyager"] += 1
-
-        # Investment horizon scoring
-        if profile.horizon_years <= 3:
-            scores["capital-guardian"] += 3
-        elif profile.horizon_years <= 5:
-            scores["capital-guardian"] += 2
-            scores["balanced-voyager"] += 2
-        elif profile.horizon_years <= 10:
-            scores["balanced-voyager"] += 3
-            scores["accelerated-builder"] += 1
-        else:  # > 10 years
-            scores["accelerated-builder"] += 3
-            scores["balanced-voyager"] += 1
-
-        # Risk tolerance scoring
-        risk = profile.risk_tolerance.value
-        if risk == "Conservative":
-            scores["capital-guardian"] += 4
-        elif risk == "Moderate":
-            scores["balanced-voyager"] += 4
-        else:  # Aggressive
-            scores["accelerated-builder"] += 4
-
-        # Volatility comfort scoring
-        volatility = profile.volatility.value
-        if volatility == "Low":
-            scores["capital-guardian"] += 2
-        elif volatility == "Medium":
-            scores["balanced-voyager"] += 2
-        else:  # High
-            scores["accelerated-builder"] += 2
-
-        # Liquidity needs scoring
-        liquidity = profile.liquidity.value
-        if liquidity == "High":
-            scores["capital-guardian"] += 2
-            scores["balanced-voyager"] += 1
-        elif liquidity == "Medium":
-            scores["balanced-voyager"] += 2
-        else:  # Low
-            scores["accelerated-builder"] += 2
-
-        # Knowledge level scoring
-        knowledge = profile.knowledge.value
-        if knowledge == "Beginner":
-            scores["capital-guardian"] += 1
-            scores["balanced-voyager"] += 1
-        elif knowledge == "Intermediate":
-            scores["balanced-voyager"] += 1
-            scores["accelerated-builder"] += 1
-        else:  # Advanced
-            scores["accelerated-builder"] += 2
-
-        # Ensure minimum scores for probability calculation
-        for key in scores:
-            scores[key] = max(scores[key], 0.1)
-
-        return scores
+        start_time = time.time()
+
+        if not profiles:
+            return [], int((time.time() - start_time) * 1000)
+
+        table = self._rule_table.blended
+        cells = profile_cells(encode_profiles(profiles)).tolist()
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        # Profiles in the same cell share the table's (read-only) structures
+        results = [
+            BlendedClassificationResult(
+                primary_persona=primary_persona,
+                distribution=distribution,
+                blended_allocation=blended_allocation,
+                confidence=confidence,
+                latency_ms=latency_ms,
+                model_version=self.model_version,
+            )
+            for primary_persona, distribution, blended_allocation, confidence
+            in (table[cell] for cell in cells)
+        ]
+
+        return results, latency_ms
 
     def get_model_version(self) -> str:
         return self.model_version
+
+
+# Global instance (shared by the REST and gRPC servers)
+persona_service = PersonaService()
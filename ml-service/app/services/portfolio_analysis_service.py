@@ -11,6 +11,8 @@ from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.schemas.portfolio_analysis import (
     PortfolioHoldingInput,
     AllocationTarget,
@@ -20,7 +22,10 @@ from app.schemas.portfolio_analysis import (
     AnalysisSummary,
     PortfolioAnalysisResponse,
 )
-from app.services.fund_data_service import fund_data_service, CATEGORY_TO_ASSET_CLASS
+from app.services.covariance_service import covariance_service
+from app.services.fund_data_service import fund_data_service
+from app.services.fund_universe import FundUniverse
+from app.services import scoring_engine
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,9 @@ MEDIUM_PRIORITY_GAP = 0.05  # 5-15% off target = MEDIUM priority
 CONCENTRATION_THRESHOLD = 0.40  # Single fund >40% = HIGH priority
 CATEGORY_CONCENTRATION_THRESHOLD = 0.35  # Category >35% = MEDIUM priority
 
+# Asset classes reported in allocations and gaps (AllocationTarget fields, in order)
+ALLOCATION_CLASSES = ("equity", "debt", "hybrid", "gold", "international", "liquid")
+
 
 @dataclass
 class FundRecommendation:
@@ -47,6 +55,34 @@ class FundRecommendation:
     score: float
 
 
+def _asset_class_picks(universe: FundUniverse, asset_class: str, n: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-n rows of an asset class for ADD_NEW actions, best first.
+
+    Scores only the asset class's own rows. Missing or non-positive metrics
+    contribute nothing, as in the original per-fund scoring.
+
+    Returns:
+        Tuple of (rows, scores)
+    """
+    rows = universe.rows_in_asset_class(asset_class)
+    sharpe = universe.metrics["sharpe_ratio"][rows]
+    return_3y = universe.metrics["return_3y"][rows]
+    expense = universe.metrics["expense_ratio"][rows]
+    volatility = universe.metrics["volatility"][rows]
+
+    # Prefer higher Sharpe ratio
+    score = np.where(sharpe > 0, np.minimum(sharpe / 2, 1) * 0.3, 0.0)
+    # Prefer 3Y returns
+    score = score + np.where(return_3y > 0, np.minimum(return_3y / 30, 1) * 0.3, 0.0)
+    # Prefer lower expense ratio
+    score = score + np.where(expense > 0, np.maximum(0, 1 - expense / 2) * 0.2, 0.0)
+    # Prefer lower volatility
+    score = score + np.where(volatility > 0, np.maximum(0, 1 - volatility / 30) * 0.2, 0.0)
+
+    return scoring_engine.select_top(rows, score, n)
+
+
 class PortfolioAnalysisService:
     """
     Analyzes current portfolio against target allocation.
@@ -59,8 +95,20 @@ class PortfolioAnalysisService:
     def get_model_version(self) -> str:
         return self.model_version
 
-    async def analyze(
+    async def load_universe(self) -> Optional[FundUniverse]:
+        """
+        Fund universe snapshot to analyze against (None if no data is loaded).
+
+        The only asynchronous step: it waits for the first load of fund data.
+        ``analyze`` and ``analyze_batch`` are synchronous and CPU-bound, so
+        callers run them on an execution lane with the returned snapshot.
+        """
+        await fund_data_service.initialize()
+        return await fund_data_service.get_universe()
+
+    def analyze(
         self,
+        universe: Optional[FundUniverse],
         holdings: List[PortfolioHoldingInput],
         target_allocation: AllocationTarget,
         profile: dict,
@@ -75,6 +123,7 @@ class PortfolioAnalysisService:
         5. Add tax flags
 
         Args:
+            universe: Fund universe snapshot (from load_universe)
             holdings: List of current portfolio holdings
             target_allocation: Target allocation from persona classification
             profile: User profile data
@@ -85,7 +134,7 @@ class PortfolioAnalysisService:
         start_time = time.time()
 
         # Step 1: Enrich holdings with current data
-        enriched_holdings = await self._enrich_holdings(holdings)
+        enriched_holdings = self._enrich_holdings(universe, holdings)
 
         # Step 2: Calculate current allocation
         total_value = sum(h.current_value for h in enriched_holdings)
@@ -98,7 +147,8 @@ class PortfolioAnalysisService:
         current_metrics = self._calculate_metrics(enriched_holdings, total_value)
 
         # Step 5: Generate rebalancing actions
-        rebalancing_actions = await self._generate_rebalancing_actions(
+        rebalancing_actions = self._generate_rebalancing_actions(
+            universe,
             enriched_holdings,
             allocation_gaps,
             target_allocation,
@@ -129,17 +179,213 @@ class PortfolioAnalysisService:
             latency_ms=latency_ms,
         )
 
-    async def _enrich_holdings(
-        self, holdings: List[PortfolioHoldingInput]
+    def analyze_batch(
+        self,
+        universe: Optional[FundUniverse],
+        clients: List[Tuple[List[PortfolioHoldingInput], AllocationTarget, dict]],
+    ) -> Tuple[List[PortfolioAnalysisResponse], int]:
+        """
+        Analyze many clients' portfolios in one pass (e.g. an advisor's whole book).
+
+        Holdings of all clients are joined against the fund universe snapshot
+        with one scheme_code -> row lookup, and values, weights, asset-class
+        allocations and gaps are computed as grouped array sums over the
+        flattened holdings. Portfolio volatilities use the batched covariance
+        path. Rebalancing actions are then generated per client, with ADD_NEW
+        suggestions computed once per asset class.
+
+        Args:
+            universe: Fund universe snapshot (from load_universe)
+            clients: (holdings, target_allocation, profile) per client
+
+        Returns:
+            Tuple of (responses in client order, latency_ms)
+        """
+        start_time = time.time()
+
+        # Step 1: Flatten holdings and join them against the snapshot
+        owners = np.array([c for c, (holdings, _, _) in enumerate(clients) for _ in holdings], dtype=np.int64)
+        flat = [holding for holdings, _, _ in clients for holding in holdings]
+        if universe is not None and len(universe):
+            rows = universe.rows_of(h.scheme_code for h in flat)
+        else:
+            rows = np.full(len(flat), -1, dtype=np.int64)
+        known = rows >= 0
+        safe_rows = np.where(known, rows, 0)
+
+        # Step 2: Current values and weights
+        amount = np.array([np.nan if h.amount is None else h.amount for h in flat])
+        units = np.array([np.nan if h.units is None else h.units for h in flat])
+        nav = np.where(known, universe.nav[safe_rows], 0.0) if universe is not None else np.zeros(len(flat))
+        has_amount = ~np.isnan(amount)
+        priced = known & ~has_amount & ~np.isnan(units) & (nav > 0)
+        values = np.where(has_amount, amount, np.where(priced, units * nav, 0.0))
+        held_units = np.where(
+            known & has_amount & (nav > 0), amount / np.where(nav > 0, nav, 1.0), np.where(priced, units, np.nan)
+        )
+        totals = np.bincount(owners, weights=values, minlength=len(clients))
+        weights = np.where(totals[owners] > 0, values / np.where(totals[owners] > 0, totals[owners], 1.0), 0.0)
+
+        # Step 3: Allocation by asset class and gaps, as grouped sums
+        n_classes = len(ALLOCATION_CLASSES)
+        if universe is not None:
+            class_of_label = np.array(
+                [
+                    ALLOCATION_CLASSES.index(label.lower()) if label.lower() in ALLOCATION_CLASSES else -1
+                    for label in universe.asset_class_names
+                ],
+                dtype=np.int64,
+            )
+            class_ids = np.where(known, class_of_label[universe.asset_class_ids[safe_rows]], 0)
+        else:
+            class_ids = np.zeros(len(flat), dtype=np.int64)
+        counted = class_ids >= 0
+        allocations = np.bincount(
+            owners[counted] * n_classes + class_ids[counted],
+            weights=weights[counted],
+            minlength=len(clients) * n_classes,
+        ).reshape(len(clients), n_classes)
+        # Summed weights can overshoot 1 by a rounding error
+        np.minimum(allocations, 1.0, out=allocations)
+        targets = np.array([[getattr(target, c) for c in ALLOCATION_CLASSES] for _, target, _ in clients])
+        gaps = allocations - targets
+
+        # Step 4: Enriched holdings (response objects)
+        enriched = [
+            self._enriched_holding(
+                holding,
+                universe.funds[row] if row >= 0 else None,
+                universe.asset_class_of(row) if row >= 0 else "equity",
+                float(value),
+                float(weight),
+                None if np.isnan(unit) else float(unit),
+            )
+            for holding, row, value, weight, unit in zip(flat, rows.tolist(), values, weights, held_units)
+        ]
+        by_client: List[List[EnrichedHolding]] = [[] for _ in clients]
+        for owner, holding in zip(owners.tolist(), enriched):
+            by_client[owner].append(holding)
+
+        # Step 5: Portfolio volatilities for all clients at once
+        volatilities = 100 * covariance_service.portfolio_volatilities(
+            [[h.scheme_code for h in holdings] for holdings in by_client],
+            [[h.weight for h in holdings] for holdings in by_client],
+            [[h.volatility / 100 if h.volatility is not None else np.nan for h in holdings] for holdings in by_client],
+            [[h.asset_class for h in holdings] for holdings in by_client],
+        )
+
+        # Step 6: Metrics, rebalancing actions and summary per client
+        recommendations_by_class: Dict[str, List[FundRecommendation]] = {}
+        responses = []
+        for c, (_, target_allocation, profile) in enumerate(clients):
+            holdings = by_client[c]
+            total_value = float(totals[c])
+            current_allocation = AllocationTarget(
+                **dict(zip(ALLOCATION_CLASSES, allocations[c].tolist()))
+            ) if total_value > 0 else AllocationTarget()
+            allocation_gaps = dict(zip(ALLOCATION_CLASSES, (
+                gaps[c] if total_value > 0 else -targets[c]
+            ).tolist()))
+
+            rebalancing_actions = self._generate_rebalancing_actions(
+                universe,
+                holdings,
+                allocation_gaps,
+                target_allocation,
+                total_value,
+                profile,
+                recommendations_by_class=recommendations_by_class,
+            )
+
+            responses.append(PortfolioAnalysisResponse(
+                current_allocation=current_allocation,
+                target_allocation=target_allocation,
+                allocation_gaps=allocation_gaps,
+                current_metrics=self._calculate_metrics(
+                    holdings, total_value, portfolio_volatility=float(volatilities[c])
+                ),
+                holdings=holdings,
+                rebalancing_actions=rebalancing_actions,
+                summary=self._generate_summary(
+                    current_allocation,
+                    target_allocation,
+                    allocation_gaps,
+                    rebalancing_actions,
+                    total_value,
+                ),
+                model_version=self.model_version,
+                latency_ms=0,
+            ))
+
+        latency_ms = int((time.time() - start_time) * 1000)
+        for response in responses:
+            response.latency_ms = latency_ms
+        return responses, latency_ms
+
+    def _enriched_holding(
+        self,
+        holding: PortfolioHoldingInput,
+        fund,
+        asset_class: str,
+        current_value: float,
+        weight: float,
+        units: Optional[float],
+    ) -> EnrichedHolding:
+        """EnrichedHolding for a holding already valued (fund is None if not in the universe)."""
+        if fund is None:
+            return EnrichedHolding(
+                scheme_code=holding.scheme_code,
+                scheme_name=holding.scheme_name or f"Unknown Fund ({holding.scheme_code})",
+                category="Unknown",
+                asset_class="equity",  # Default to equity
+                current_value=current_value,
+                weight=weight,
+            )
+
+        # Calculate tax status
+        holding_period_days = None
+        tax_status = None
+        unrealized_gain = None
+
+        if holding.purchase_date:
+            holding_period_days = (date.today() - holding.purchase_date).days
+            tax_status = "LTCG" if holding_period_days > LTCG_THRESHOLD_DAYS else "STCG"
+
+        if holding.purchase_amount is not None and current_value > 0:
+            unrealized_gain = current_value - holding.purchase_amount
+
+        return EnrichedHolding(
+            scheme_code=holding.scheme_code,
+            scheme_name=fund.scheme_name,
+            category=fund.category,
+            asset_class=asset_class,
+            current_value=current_value,
+            weight=weight,
+            units=units,
+            nav=fund.nav,
+            return_1y=fund.return_1y,
+            return_3y=fund.return_3y,
+            volatility=fund.volatility,
+            sharpe_ratio=fund.sharpe_ratio,
+            holding_period_days=holding_period_days,
+            tax_status=tax_status,
+            purchase_amount=holding.purchase_amount,
+            unrealized_gain=unrealized_gain,
+        )
+
+    def _enrich_holdings(
+        self, universe: Optional[FundUniverse], holdings: List[PortfolioHoldingInput]
     ) -> List[EnrichedHolding]:
-        """Fetch current NAV, category, metrics for each holding."""
+        """Look up current NAV, category, metrics for each holding in the snapshot."""
         enriched = []
 
-        # Ensure fund data is available
-        await fund_data_service.initialize()
+        if universe is not None and len(universe):
+            rows = universe.rows_of(h.scheme_code for h in holdings).tolist()
+        else:
+            rows = [-1] * len(holdings)
 
-        for holding in holdings:
-            fund = await fund_data_service.get_fund(holding.scheme_code)
+        for holding, row in zip(holdings, rows):
+            fund = universe.funds[row] if row >= 0 else None
 
             if fund:
                 # Calculate current value
@@ -153,52 +399,21 @@ class PortfolioAnalysisService:
                     current_value = 0
                     units = None
 
-                # Calculate tax status
-                holding_period_days = None
-                tax_status = None
-                unrealized_gain = None
-
-                if holding.purchase_date:
-                    holding_period_days = (date.today() - holding.purchase_date).days
-                    tax_status = "LTCG" if holding_period_days > LTCG_THRESHOLD_DAYS else "STCG"
-
-                if holding.purchase_amount is not None and current_value > 0:
-                    unrealized_gain = current_value - holding.purchase_amount
-
                 enriched.append(
-                    EnrichedHolding(
-                        scheme_code=holding.scheme_code,
-                        scheme_name=fund.scheme_name,
-                        category=fund.category,
-                        asset_class=fund.asset_class or CATEGORY_TO_ASSET_CLASS.get(fund.category, "equity"),
-                        current_value=current_value,
-                        weight=0,  # Will be calculated after total
-                        units=units,
-                        nav=fund.nav,
-                        return_1y=fund.return_1y,
-                        return_3y=fund.return_3y,
-                        volatility=fund.volatility,
-                        sharpe_ratio=fund.sharpe_ratio,
-                        holding_period_days=holding_period_days,
-                        tax_status=tax_status,
-                        purchase_amount=holding.purchase_amount,
-                        unrealized_gain=unrealized_gain,
+                    self._enriched_holding(
+                        holding,
+                        fund,
+                        universe.asset_class_of(row),
+                        current_value,
+                        0,  # Will be calculated after total
+                        units,
                     )
                 )
             else:
                 # Fund not found in database - use provided data
-                current_value = holding.amount or 0
                 logger.warning(f"Fund {holding.scheme_code} not found in database")
-
                 enriched.append(
-                    EnrichedHolding(
-                        scheme_code=holding.scheme_code,
-                        scheme_name=holding.scheme_name or f"Unknown Fund ({holding.scheme_code})",
-                        category="Unknown",
-                        asset_class="equity",  # Default to equity
-                        current_value=current_value,
-                        weight=0,
-                    )
+                    self._enriched_holding(holding, None, "equity", holding.amount or 0, 0, None)
                 )
 
         # Calculate weights
@@ -230,7 +445,8 @@ class PortfolioAnalysisService:
             if asset_class in allocation:
                 allocation[asset_class] += holding.current_value / total_value
 
-        return AllocationTarget(**allocation)
+        # Summed weights can overshoot 1 by a rounding error
+        return AllocationTarget(**{k: min(v, 1.0) for k, v in allocation.items()})
 
     def _calculate_gaps(
         self, current: AllocationTarget, target: AllocationTarget
@@ -246,14 +462,22 @@ class PortfolioAnalysisService:
         }
 
     def _calculate_metrics(
-        self, holdings: List[EnrichedHolding], total_value: float
+        self,
+        holdings: List[EnrichedHolding],
+        total_value: float,
+        portfolio_volatility: Optional[float] = None,
     ) -> CurrentMetrics:
-        """Calculate weighted portfolio metrics."""
+        """
+        Calculate weighted portfolio metrics.
+
+        Volatility is sqrt(w'Σw) over the holdings' covariance, not the
+        weighted average of fund volatilities. Pass ``portfolio_volatility``
+        (%) when it has already been computed (batch path).
+        """
         category_breakdown: Dict[str, Dict] = {}
 
         weighted_return_1y = 0.0
         weighted_return_3y = 0.0
-        weighted_volatility = 0.0
         weighted_sharpe = 0.0
         count_with_returns = 0
 
@@ -274,13 +498,20 @@ class PortfolioAnalysisService:
                 weighted_return_1y += holding.return_1y * holding.weight
             if holding.return_3y is not None:
                 weighted_return_3y += holding.return_3y * holding.weight
-            if holding.volatility is not None:
-                weighted_volatility += holding.volatility * holding.weight
             if holding.sharpe_ratio is not None:
                 weighted_sharpe += holding.sharpe_ratio * holding.weight
             if holding.return_1y is not None or holding.return_3y is not None:
                 count_with_returns += 1
 
+        weighted_volatility = portfolio_volatility
+        if weighted_volatility is None:
+            weighted_volatility = 100 * covariance_service.portfolio_volatility(
+                [h.scheme_code for h in holdings],
+                [h.weight for h in holdings],
+                [h.volatility / 100 if h.volatility is not None else np.nan for h in holdings],
+                [h.asset_class for h in holdings],
+            )
+
         return CurrentMetrics(
             total_value=total_value,
             total_holdings=len(holdings),
@@ -291,17 +522,22 @@ class PortfolioAnalysisService:
             category_breakdown=category_breakdown,
         )
 
-    async def _generate_rebalancing_actions(
+    def _generate_rebalancing_actions(
         self,
+        universe: Optional[FundUniverse],
         holdings: List[EnrichedHolding],
         gaps: Dict[str, float],
         target: AllocationTarget,
         total_value: float,
         profile: dict,
+        recommendations_by_class: Optional[Dict[str, List[FundRecommendation]]] = None,
     ) -> List[RebalancingAction]:
         """
         Generate specific fund-level actions.
 
+        ``recommendations_by_class`` memoises ADD_NEW suggestions per asset
+        class across calls (they do not depend on the client).
+
         Strategy:
         1. Identify overweight asset classes -> SELL actions
         2. Identify underweight asset classes -> BUY or ADD_NEW actions
@@ -461,7 +697,13 @@ class PortfolioAnalysisService:
                     )
             else:
                 # ADD_NEW - need to recommend new funds
-                recommendations = await self._get_fund_recommendations(asset_class, target_value)
+                if recommendations_by_class is None:
+                    recommendations = self._get_fund_recommendations(universe, asset_class, target_value)
+                else:
+                    recommendations = recommendations_by_class.get(asset_class)
+                    if recommendations is None:
+                        recommendations = self._get_fund_recommendations(universe, asset_class, target_value)
+                        recommendations_by_class[asset_class] = recommendations
 
                 if recommendations:
                     # Distribute amount across recommended funds
@@ -531,56 +773,28 @@ class PortfolioAnalysisService:
         else:
             return f"STCG: 15% tax on gains"
 
-    async def _get_fund_recommendations(
-        self, asset_class: str, target_amount: float
+    def _get_fund_recommendations(
+        self, universe: Optional[FundUniverse], asset_class: str, target_amount: float
     ) -> List[FundRecommendation]:
         """Get fund recommendations for a specific asset class."""
-        recommendations = []
-
-        # Get all funds and filter by asset class
-        all_funds = await fund_data_service.get_all_funds()
-
-        matching_funds = [
-            f for f in all_funds
-            if (f.asset_class or CATEGORY_TO_ASSET_CLASS.get(f.category, "equity")).lower() == asset_class.lower()
-        ]
+        if universe is None:
+            return []
 
-        if not matching_funds:
-            return recommendations
-
-        # Score and sort funds
-        def score_fund(fund) -> float:
-            score = 0.0
-            # Prefer higher Sharpe ratio
-            if fund.sharpe_ratio and fund.sharpe_ratio > 0:
-                score += min(fund.sharpe_ratio / 2, 1) * 0.3
-            # Prefer 3Y returns
-            if fund.return_3y and fund.return_3y > 0:
-                score += min(fund.return_3y / 30, 1) * 0.3
-            # Prefer lower expense ratio
-            if fund.expense_ratio and fund.expense_ratio > 0:
-                score += max(0, 1 - fund.expense_ratio / 2) * 0.2
-            # Prefer lower volatility
-            if fund.volatility and fund.volatility > 0:
-                score += max(0, 1 - fund.volatility / 30) * 0.2
-            return score
-
-        scored_funds = [(f, score_fund(f)) for f in matching_funds]
-        scored_funds.sort(key=lambda x: -x[1])
-
-        # Return top 2 recommendations
-        for fund, score in scored_funds[:2]:
-            recommendations.append(
-                FundRecommendation(
-                    scheme_code=fund.scheme_code,
-                    scheme_name=fund.scheme_name,
-                    category=fund.category,
-                    asset_class=asset_class,
-                    score=score,
-                )
+        # Top 2 funds of the asset class, picked once per universe snapshot
+        rows, scores = universe.derive(
+            f"analysis:picks:{asset_class.lower()}",
+            lambda u: _asset_class_picks(u, asset_class.lower()),
+        )
+        return [
+            FundRecommendation(
+                scheme_code=universe.funds[row].scheme_code,
+                scheme_name=universe.funds[row].scheme_name,
+                category=universe.funds[row].category,
+                asset_class=asset_class,
+                score=score,
             )
-
-        return recommendations
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
 
     def _generate_summary(
         self,
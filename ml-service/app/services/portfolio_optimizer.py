@@ -0,0 +1,383 @@
+"""
+Constrained mean-variance optimizer.
+
+Solves long-only mean-variance problems with budget, per-fund, equity-cap,
+debt-floor and minimum-return constraints as quadratic programs in OSQP.
+One OSQP workspace is kept per size bucket with a fixed (dense) sparsity
+pattern, so a request only updates the matrices in place and re-solves
+warm-started from the previous solution; no problem is rebuilt per
+request. Candidate sets are padded up to the bucket size with
+zero-capacity slots.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import osqp
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+# Workspaces are built for candidate counts rounded up to a multiple of this
+SIZE_BUCKET = 16
+
+# Weights below this are treated as zero
+MIN_WEIGHT = 1e-4
+
+# Bisection steps (and relative tolerance below the cap) when searching
+# the frontier for a volatility cap
+FRONTIER_STEPS = 30
+FRONTIER_TOLERANCE = 1e-3
+
+SOLVED = ("solved", "solved inaccurate")
+
+
+def nearest_psd(covariance: np.ndarray) -> np.ndarray:
+    """
+    Symmetric positive semi-definite version of a covariance matrix.
+
+    Sample covariances patched with prior terms are not guaranteed to be
+    PSD; negative eigenvalues are clipped to zero.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh((covariance + covariance.T) / 2)
+    if eigenvalues[0] >= 0:
+        return (covariance + covariance.T) / 2
+    return (eigenvectors * np.clip(eigenvalues, 0.0, None)) @ eigenvectors.T
+
+
+def select_positions(
+    weights: np.ndarray,
+    fund_caps: np.ndarray,
+    equity_mask: np.ndarray,
+    debt_mask: np.ndarray,
+    max_equity: float,
+    min_debt: float,
+    max_funds: int,
+) -> Optional[np.ndarray]:
+    """
+    Indices of at most ``max_funds`` candidates to keep after a solve.
+
+    Positions are taken largest weight first, but debt funds are taken
+    until their caps cover the debt floor and non-equity funds until their
+    caps cover ``1 - max_equity`` before any other position, so the class
+    limits stay satisfiable over the kept set. Returns None when no such
+    set fits in ``max_funds`` positions.
+    """
+    order = [i for i in np.argsort(-weights, kind="stable").tolist() if fund_caps[i] > 0]
+    non_equity_mask = 1.0 - equity_mask
+    kept: List[int] = []
+
+    def take(mask: np.ndarray, needed: float) -> bool:
+        covered = float(fund_caps[kept] @ mask[kept]) if kept else 0.0
+        for i in order:
+            if covered >= needed - 1e-9:
+                break
+            if mask[i] > 0 and i not in kept:
+                kept.append(i)
+                covered += fund_caps[i]
+        return covered >= needed - 1e-9
+
+    # Step 1: positions the class limits need
+    if not take(debt_mask, min_debt) or not take(non_equity_mask, 1.0 - max_equity):
+        return None
+
+    # Step 2: the largest remaining positions
+    for i in order:
+        if len(kept) >= max_funds:
+            break
+        if i not in kept:
+            kept.append(i)
+
+    # Step 3: the budget must be reachable without breaking the equity cap
+    kept = np.array(kept, dtype=np.int64)
+    reachable = float(fund_caps[kept] @ non_equity_mask[kept]) + min(float(fund_caps[kept] @ equity_mask[kept]), max_equity)
+    if len(kept) > max_funds or reachable < 1.0 - 1e-9:
+        return None
+    return kept
+
+
+def drop_dust(weights: np.ndarray, fund_caps: np.ndarray, classes: np.ndarray) -> np.ndarray:
+    """
+    Zero weights below MIN_WEIGHT and give their mass back without breaking caps.
+
+    Solver output is clipped to ``[0, fund_caps]``. The dropped mass goes to
+    the remaining positions of the same class (``classes`` labels each
+    candidate) in proportion to their headroom below the cap, so class totals
+    do not move. Whatever a class cannot absorb is spread over the headroom
+    of all remaining positions. Weights are never scaled past their caps.
+    """
+    weights = np.clip(weights, 0.0, fund_caps)
+    dust = weights <= MIN_WEIGHT
+    out = np.where(dust, 0.0, weights)
+
+    def spread(residual: float, mask: np.ndarray):
+        nonlocal out
+        headroom = np.where(mask, np.maximum(fund_caps - out, 0.0), 0.0)
+        room = headroom.sum()
+        if residual > 0 and room > 0:
+            out = out + headroom * min(1.0, residual / room)
+
+    for label in np.unique(classes):
+        in_class = classes == label
+        spread(float(weights[in_class & dust].sum()), in_class & ~dust)
+    spread(1.0 - float(out.sum()), ~dust)
+
+    total = out.sum()
+    if total > 1.0:
+        # Solver overshoot (within its tolerance): scaling down never breaks a cap
+        out /= total
+    return out
+
+
+@dataclass
+class MVOResult:
+    """Optimal weights with the portfolio's expected return and volatility."""
+    weights: np.ndarray
+    expected_return: float
+    volatility: float
+    status: str
+
+
+class _Workspace:
+    """
+    OSQP workspace for one size bucket.
+
+    Minimises ``1/2 w'Σw - t * mu'w`` over the ``n`` weights. Constraint
+    rows: budget (= 1), per-fund bounds (n rows), equity cap, debt floor
+    and minimum expected return.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.lock = threading.Lock()
+
+        # P: dense upper triangle in CSC order (column j holds rows 0..j)
+        self._p_rows = np.concatenate([np.arange(j + 1) for j in range(n)])
+        self._p_cols = np.repeat(np.arange(n), np.arange(1, n + 1))
+        p_indptr = np.concatenate([[0], np.cumsum(np.arange(1, n + 1))])
+
+        # A: column j holds rows budget, bound j, equity, debt, return
+        a_indices = np.column_stack([
+            np.zeros(n, dtype=np.int64),
+            1 + np.arange(n),
+            np.full(n, n + 1),
+            np.full(n, n + 2),
+            np.full(n, n + 3),
+        ]).ravel()
+        a_indptr = np.arange(0, 5 * n + 1, 5)
+
+        # Explicit zeros keep the sparsity pattern fixed across updates
+        P = sp.csc_matrix((np.zeros(len(self._p_rows)), self._p_rows, p_indptr), shape=(n, n))
+        A = sp.csc_matrix((self._a_data(np.zeros(n), np.zeros(n), np.zeros(n)), a_indices, a_indptr), shape=(n + 4, n))
+
+        self.solver = osqp.OSQP()
+        self.solver.setup(
+            P=P,
+            q=np.zeros(n),
+            A=A,
+            l=np.zeros(n + 4),
+            u=np.ones(n + 4),
+            verbose=False,
+            eps_abs=1e-7,
+            eps_rel=1e-7,
+            polish=True,
+            warm_start=True,
+        )
+        self.mu = np.zeros(n)
+        self.lower = np.zeros(n + 4)
+        self.upper = np.ones(n + 4)
+
+    def _a_data(self, equity_mask: np.ndarray, debt_mask: np.ndarray, mu: np.ndarray) -> np.ndarray:
+        ones = np.ones(self.n)
+        return np.column_stack([ones, ones, equity_mask, debt_mask, mu]).ravel()
+
+    def load(
+        self,
+        covariance: np.ndarray,
+        mu: np.ndarray,
+        equity_mask: np.ndarray,
+        debt_mask: np.ndarray,
+        fund_caps: np.ndarray,
+        max_equity: float,
+        min_debt: float,
+    ):
+        """Install a problem (all arrays already padded to ``n``)."""
+        self.mu = mu
+        self.lower = np.concatenate([[1.0], np.zeros(self.n), [-np.inf, min_debt, -np.inf]])
+        self.upper = np.concatenate([[1.0], fund_caps, [max_equity, np.inf, np.inf]])
+        self.solver.update(
+            Px=covariance[self._p_rows, self._p_cols],
+            Ax=self._a_data(equity_mask, debt_mask, mu),
+            q=np.zeros(self.n),
+            l=self.lower,
+            u=self.upper,
+        )
+
+    def set_fund_caps(self, fund_caps: np.ndarray):
+        self.upper[1:self.n + 1] = fund_caps
+        self.solver.update(u=self.upper)
+
+    def solve(self, return_weight: float, min_return: Optional[float] = None) -> Optional[np.ndarray]:
+        """Solve for a given return weight ``t`` (0 = minimum variance)."""
+        self.lower[-1] = -np.inf if min_return is None else min_return
+        self.solver.update(q=-return_weight * self.mu, l=self.lower)
+        result = self.solver.solve()
+        if result.info.status not in SOLVED:
+            return None
+        return result.x
+
+
+class MeanVarianceOptimizer:
+    """
+    Long-only constrained MVO.
+
+    Thread-safe: each workspace is guarded by its own lock (OSQP
+    workspaces hold the problem data and warm-start state).
+    """
+
+    def __init__(self):
+        self._workspaces: Dict[int, _Workspace] = {}
+        self._workspaces_lock = threading.Lock()
+
+    def _workspace(self, n: int) -> _Workspace:
+        size = max(SIZE_BUCKET, -(-n // SIZE_BUCKET) * SIZE_BUCKET)
+        workspace = self._workspaces.get(size)
+        if workspace is None:
+            with self._workspaces_lock:
+                workspace = self._workspaces.get(size)
+                if workspace is None:
+                    workspace = _Workspace(size)
+                    self._workspaces[size] = workspace
+        return workspace
+
+    def optimize(
+        self,
+        mu: np.ndarray,
+        covariance: np.ndarray,
+        fund_caps: np.ndarray,
+        equity_mask: np.ndarray,
+        debt_mask: np.ndarray,
+        max_equity: float = 1.0,
+        min_debt: float = 0.0,
+        risk_aversion: float = 1.0,
+        max_volatility: Optional[float] = None,
+        target_return: Optional[float] = None,
+        max_funds: Optional[int] = None,
+    ) -> Optional[MVOResult]:
+        """
+        Efficient long-only weights for ``n`` candidates.
+
+        ``mu`` are annual expected returns and ``covariance`` the annualised
+        covariance matrix (positive semi-definite). With a ``target_return``
+        the minimum-variance portfolio reaching it is returned; otherwise the
+        portfolio maximising ``mu'w - risk_aversion/2 * w'Σw``. If that
+        exceeds ``max_volatility``, the highest-return frontier portfolio
+        within the cap is used instead (or the minimum-variance portfolio
+        when no portfolio meets the cap). At most ``max_funds`` weights are
+        non-zero, chosen so the class limits still hold (see select_positions).
+        Returned weights never exceed ``fund_caps``.
+
+        Returns None when the constraints are infeasible, including when no
+        ``max_funds`` positions can meet them.
+        """
+        n = len(mu)
+        workspace = self._workspace(n)
+        size = workspace.n
+
+        def pad(values: np.ndarray) -> np.ndarray:
+            out = np.zeros(size)
+            out[:n] = values
+            return out
+
+        padded_covariance = np.zeros((size, size))
+        padded_covariance[:n, :n] = covariance
+        caps = pad(fund_caps)
+
+        with workspace.lock:
+            workspace.load(
+                padded_covariance, pad(mu), pad(equity_mask), pad(debt_mask),
+                caps, max_equity, min_debt,
+            )
+            weights, status = self._solve(
+                workspace, padded_covariance, risk_aversion, max_volatility, target_return
+            )
+            if weights is None:
+                return None
+
+            # Cardinality: keep the largest positions the class limits allow and re-solve over them
+            if max_funds is not None and np.count_nonzero(weights > MIN_WEIGHT) > max_funds:
+                keep = select_positions(
+                    weights, caps, pad(equity_mask), pad(debt_mask), max_equity, min_debt, max_funds
+                )
+                if keep is None:
+                    return None
+                restricted = np.zeros(size)
+                restricted[keep] = caps[keep]
+                workspace.set_fund_caps(restricted)
+                weights, status = self._solve(
+                    workspace, padded_covariance, risk_aversion, max_volatility, target_return
+                )
+                if weights is None:
+                    return None
+                caps = restricted
+
+        classes = (equity_mask + 2 * debt_mask).astype(np.int64)
+        weights = drop_dust(weights[:n], caps[:n], classes)
+        return MVOResult(
+            weights=weights,
+            expected_return=float(mu @ weights),
+            volatility=float(np.sqrt(max(weights @ covariance @ weights, 0.0))),
+            status=status,
+        )
+
+    def _solve(
+        self,
+        workspace: _Workspace,
+        covariance: np.ndarray,
+        risk_aversion: float,
+        max_volatility: Optional[float],
+        target_return: Optional[float],
+    ) -> Tuple[Optional[np.ndarray], str]:
+        """Run the solve sequence on a loaded workspace."""
+
+        def volatility(w: np.ndarray) -> float:
+            return float(np.sqrt(max(w @ covariance @ w, 0.0)))
+
+        # Step 1: min variance subject to the target return, else the utility optimum
+        weights = None
+        if target_return is not None:
+            weights, status = workspace.solve(0.0, min_return=target_return), "target_return"
+            # Out of reach: fall back to the utility optimum
+            min_return = target_return if weights is not None else None
+        if weights is None:
+            min_return = None
+            weights, status = workspace.solve(1.0 / risk_aversion), "utility"
+        if weights is None:
+            return None, "infeasible"
+        if max_volatility is None or volatility(weights) <= max_volatility * (1 + 1e-4):
+            return weights, status
+
+        # Step 2: volatility falls as the return weight shrinks; bisect for the cap
+        low = workspace.solve(0.0, min_return=min_return)
+        if low is None or volatility(low) > max_volatility:
+            # Cap cannot be met: least volatile portfolio available
+            low = workspace.solve(0.0)
+            return low, "min_variance" if low is not None else "infeasible"
+
+        lo, hi = 0.0, 1.0 / risk_aversion
+        best = low
+        for _ in range(FRONTIER_STEPS):
+            mid = (lo + hi) / 2
+            candidate = workspace.solve(mid, min_return=min_return)
+            candidate_volatility = volatility(candidate) if candidate is not None else np.inf
+            if candidate_volatility <= max_volatility:
+                best, lo = candidate, mid
+                # Close enough to the cap
+                if candidate_volatility >= max_volatility * (1 - FRONTIER_TOLERANCE):
+                    break
+            else:
+                hi = mid
+        return best, "volatility_capped"
@@ -2,8 +2,11 @@
 Portfolio optimization service using Mean-Variance Optimization.
 """
 
+import logging
+import threading
 import time
-from typing import List, Optional
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 import numpy as np
 
 from app.schemas.portfolio import (
@@ -12,6 +15,10 @@ from app.schemas.portfolio import (
     AllocationResult,
     PortfolioMetrics,
 )
+from app.services.covariance_service import covariance_service
+from app.services.portfolio_optimizer import MeanVarianceOptimizer, nearest_psd
+
+logger = logging.getLogger(__name__)
 
 
 # Default allocation templates by persona
@@ -20,16 +27,19 @@ PERSONA_ALLOCATIONS = {
         "max_equity": 0.35,
         "min_debt": 0.50,
         "target_volatility": 0.08,
+        "risk_aversion": 6.0,
     },
     "balanced-voyager": {
         "max_equity": 0.65,
         "min_debt": 0.25,
         "target_volatility": 0.12,
+        "risk_aversion": 3.0,
     },
     "accelerated-builder": {
         "max_equity": 0.90,
         "min_debt": 0.05,
         "target_volatility": 0.18,
+        "risk_aversion": 1.5,
     },
 }
 
@@ -72,13 +82,30 @@ HYBRID_CATEGORIES = {
     "Arbitrage",
 }
 
+# Candidates per asset class passed to the optimizer (best scored first)
+MVO_CANDIDATES_PER_CLASS = 20
+
+
+def _asset_class(category: str) -> str:
+    """Asset class used for the equity / debt constraints (unknown categories count as equity)."""
+    if category in DEBT_CATEGORIES:
+        return "debt"
+    if category in HYBRID_CATEGORIES:
+        return "hybrid"
+    return "equity"
+
 
 class PortfolioService:
     """Service for portfolio optimization."""
 
-    def __init__(self):
-        self.model_version = "mvo-v1"
+    def __init__(self, covariance_cache_size: int = 128):
+        self.model_version = "mvo-v2"
         self.risk_free_rate = 0.065  # 6.5% risk-free rate (Indian context)
+        self.optimizer = MeanVarianceOptimizer()
+        # (covariance model version, candidate key) -> covariance matrix, LRU
+        self._covariance_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._covariance_cache_size = covariance_cache_size
+        self._covariance_lock = threading.Lock()
 
     def optimize(
         self,
@@ -86,10 +113,16 @@ class PortfolioService:
         profile: dict,
         available_funds: List[FundInput],
         constraints: Optional[OptimizationConstraints] = None,
+        method: str = "mvo",
     ) -> tuple:
         """
         Optimize portfolio allocation based on persona and constraints.
 
+        ``method="mvo"`` solves a constrained mean-variance problem over a
+        covariance matrix estimated from NAV return history; if it cannot
+        be solved (or ``method="heuristic"``), weights are split across the
+        top-scored funds of each asset class.
+
         Returns:
             Tuple of (allocations, metrics, latency_ms)
         """
@@ -110,6 +143,163 @@ class PortfolioService:
         min_funds = constraints.min_funds
         max_funds = constraints.max_funds
 
+        result = None
+        if method == "mvo" and available_funds:
+            try:
+                result = self._optimize_mvo(
+                    persona_prefs, profile, available_funds, constraints,
+                    max_equity, min_debt, max_single_fund,
+                )
+            except Exception as e:
+                logger.warning(f"MVO failed, falling back to score-based allocation: {e}")
+
+        if result is not None:
+            allocations, metrics = result
+        else:
+            allocations = self._allocate_by_score(
+                profile, available_funds, max_equity, min_debt, max_single_fund, max_funds
+            )
+            metrics = self._calculate_metrics(allocations, available_funds, profile)
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        return allocations, metrics, latency_ms
+
+    def _optimize_mvo(
+        self,
+        persona_prefs: dict,
+        profile: dict,
+        available_funds: List[FundInput],
+        constraints: OptimizationConstraints,
+        max_equity: float,
+        min_debt: float,
+        max_single_fund: float,
+    ) -> Optional[Tuple[List[AllocationResult], PortfolioMetrics]]:
+        """
+        Constrained mean-variance allocation.
+
+        Returns None when the equity cap, debt floor, per-fund cap or fund
+        count limits cannot all be met with the funds on offer (the caller
+        then falls back to the score-based allocation).
+        """
+        # Step 1: candidates (best scored funds of each asset class)
+        by_class = {"equity": [], "debt": [], "hybrid": []}
+        for fund in available_funds:
+            by_class[_asset_class(fund.category)].append(fund)
+        candidates = [
+            fund
+            for funds in by_class.values()
+            for fund, _ in self._score_funds(funds)[:MVO_CANDIDATES_PER_CLASS]
+        ]
+        classes = [_asset_class(f.category) for f in candidates]
+        equity_mask = np.array([c == "equity" for c in classes], dtype=np.float64)
+        debt_mask = np.array([c == "debt" for c in classes], dtype=np.float64)
+
+        # Step 2: per-fund caps; the limits are never relaxed, infeasible requests
+        # fall back to the score-based allocation
+        upper = np.full(len(candidates), max_single_fund)
+        # At least min_funds holdings: no single fund may carry more than 1/min_funds
+        upper = np.minimum(upper, 1.0 / max(1, min(constraints.min_funds, len(candidates))))
+        if upper.sum() < 1.0 - 1e-9:
+            logger.warning(
+                f"MVO infeasible: {len(candidates)} funds capped at {upper[0]:.2%} cannot reach 100%"
+            )
+            return None
+        if float(debt_mask @ upper) < min_debt - 1e-9:
+            logger.warning(f"MVO infeasible: debt funds on offer cannot reach the {min_debt:.2%} debt floor")
+            return None
+        if float((1 - equity_mask) @ upper) < 1.0 - max_equity - 1e-9:
+            logger.warning(f"MVO infeasible: non-equity funds on offer cannot keep equity under {max_equity:.2%}")
+            return None
+
+        # Step 3: inputs
+        mu = np.array([self._expected_return(f) for f in candidates])
+        covariance = self._covariance(candidates, classes)
+
+        max_volatility = persona_prefs["target_volatility"]
+        if constraints.max_volatility is not None:
+            max_volatility = min(max_volatility, constraints.max_volatility / 100)
+        target_return = constraints.target_return / 100 if constraints.target_return is not None else None
+
+        # Step 4: solve
+        result = self.optimizer.optimize(
+            mu,
+            covariance,
+            upper,
+            equity_mask,
+            debt_mask,
+            max_equity=max_equity,
+            min_debt=min_debt,
+            risk_aversion=persona_prefs["risk_aversion"],
+            max_volatility=max_volatility,
+            target_return=target_return,
+            max_funds=constraints.max_funds,
+        )
+        if result is None:
+            return None
+
+        allocations = [
+            AllocationResult(
+                scheme_code=fund.scheme_code,
+                scheme_name=fund.scheme_name,
+                category=fund.category,
+                weight=round(float(weight), 6),
+                monthly_sip=self._calculate_sip(profile, float(weight)),
+            )
+            for fund, weight in sorted(
+                zip(candidates, result.weights), key=lambda x: x[1], reverse=True
+            )
+            if weight > 0
+        ]
+        metrics = self._calculate_metrics(
+            allocations, available_funds, profile, expected_volatility=result.volatility
+        )
+        return allocations, metrics
+
+    def _expected_return(self, fund: FundInput) -> float:
+        """Annual expected return (same fallbacks as _calculate_metrics)."""
+        return (fund.return_3y or fund.return_1y or 10.0) / 100
+
+    def _covariance(self, funds: List[FundInput], classes: List[str]) -> np.ndarray:
+        """
+        Annualised covariance matrix for the funds (cached).
+
+        Funds covered by the factor covariance model (enough NAV history)
+        take their block from it; the rest get their stated volatility
+        combined with prior asset-class correlations.
+        """
+        key = (
+            covariance_service.version,
+            tuple((f.scheme_code, c, f.volatility) for f, c in zip(funds, classes)),
+        )
+        with self._covariance_lock:
+            covariance = self._covariance_cache.get(key)
+            if covariance is not None:
+                self._covariance_cache.move_to_end(key)
+                return covariance
+
+        covariance = covariance_service.blended_covariance(
+            [f.scheme_code for f in funds],
+            [(f.volatility or 15.0) / 100 for f in funds],
+            classes,
+        )
+        covariance = nearest_psd(covariance)
+        with self._covariance_lock:
+            self._covariance_cache[key] = covariance
+            if len(self._covariance_cache) > self._covariance_cache_size:
+                self._covariance_cache.popitem(last=False)
+        return covariance
+
+    def _allocate_by_score(
+        self,
+        profile: dict,
+        available_funds: List[FundInput],
+        max_equity: float,
+        min_debt: float,
+        max_single_fund: float,
+        max_funds: int,
+    ) -> List[AllocationResult]:
+        """Split target class weights evenly across the top-scored funds of each class."""
         # Categorize funds
         equity_funds = []
         debt_funds = []
@@ -197,12 +387,7 @@ class PortfolioService:
                 alloc.weight = alloc.weight / total_weight
                 alloc.monthly_sip = self._calculate_sip(profile, alloc.weight)
 
-        # Calculate expected metrics
-        metrics = self._calculate_metrics(allocations, available_funds, profile)
-
-        latency_ms = int((time.time() - start_time) * 1000)
-
-        return allocations, metrics, latency_ms
+        return allocations
 
     def _score_funds(self, funds: List[FundInput]) -> List[tuple]:
         """Score funds based on risk-adjusted returns."""
@@ -247,28 +432,40 @@ class PortfolioService:
         allocations: List[AllocationResult],
         funds: List[FundInput],
         profile: dict,
+        expected_volatility: Optional[float] = None,
     ) -> PortfolioMetrics:
-        """Calculate expected portfolio metrics."""
+        """
+        Calculate expected portfolio metrics.
+
+        Volatility is sqrt(w'Σw) over the funds' covariance; pass
+        ``expected_volatility`` when it is already known (e.g. from the
+        optimizer).
+        """
         # Create fund lookup
         fund_map = {f.scheme_code: f for f in funds}
 
         # Calculate weighted metrics
         expected_return = 0.0
-        expected_volatility = 0.0
         total_weight = 0.0
+        held = []
 
         for alloc in allocations:
             fund = fund_map.get(alloc.scheme_code)
             if fund:
                 ret = fund.return_3y or fund.return_1y or 10.0
-                vol = fund.volatility or 15.0
                 expected_return += alloc.weight * (ret / 100)
-                expected_volatility += alloc.weight * (vol / 100)
                 total_weight += alloc.weight
+                held.append((fund, alloc.weight))
 
         if total_weight > 0:
             expected_return /= total_weight
-            expected_volatility /= total_weight
+        if expected_volatility is None:
+            expected_volatility = covariance_service.portfolio_volatility(
+                [f.scheme_code for f, _ in held],
+                [w / total_weight for _, w in held],
+                [(f.volatility or 15.0) / 100 for f, _ in held],
+                [_asset_class(f.category) for f, _ in held],
+            ) if held else 0.0
 
         # Calculate Sharpe ratio
         sharpe = (expected_return - self.risk_free_rate) / max(expected_volatility, 0.01)
@@ -303,3 +500,7 @@ class PortfolioService:
 
     def get_model_version(self) -> str:
         return self.model_version
+
+
+# Global instance (shared by the REST and gRPC servers)
+portfolio_service = PortfolioService()
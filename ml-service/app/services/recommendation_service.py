@@ -13,6 +13,9 @@ from app.schemas.recommendation import (
     AllocationTarget,
     AssetClassBreakdown,
 )
+from app.services.fund_data_service import FundData, fund_data_service
+from app.services.fund_universe import FundUniverse
+from app.services import scoring_engine
 
 
 # Sample fund database (in production, this would come from database/cache)
@@ -293,17 +296,88 @@ ASSET_CLASS_VOLATILITY_LIMITS = {
 }
 
 
-def _get_real_fund_data() -> List[dict]:
-    """Get fund data from the fund data service (real MFAPI.in data) or fallback to SAMPLE_FUNDS."""
+def _get_real_fund_universe() -> FundUniverse:
+    """Get the fund universe from the fund data service (real MFAPI.in data) or fallback to SAMPLE_FUNDS."""
     try:
-        from app.services.fund_data_service import get_funds_as_dict_list
-        funds = get_funds_as_dict_list()
-        if funds:
-            return funds
+        from app.services.fund_data_service import get_fund_universe
+        universe = get_fund_universe()
+        if len(universe):
+            return universe
     except Exception as e:
         import logging
         logging.getLogger(__name__).warning(f"Failed to get real fund data: {e}, using fallback")
-    return SAMPLE_FUNDS
+    return _sample_universe()
+
+
+_sample_universe_instance: Optional[FundUniverse] = None
+
+
+def _sample_universe() -> FundUniverse:
+    """Universe built from SAMPLE_FUNDS (built once)."""
+    global _sample_universe_instance
+    if _sample_universe_instance is None:
+        _sample_universe_instance = FundUniverse(
+            [
+                FundData(
+                    scheme_code=f["scheme_code"],
+                    scheme_name=f["scheme_name"],
+                    fund_house=f["fund_house"],
+                    category=f["category"],
+                    nav=0,
+                    return_1y=f.get("return_1y"),
+                    return_3y=f.get("return_3y"),
+                    return_5y=f.get("return_5y"),
+                    volatility=f.get("volatility"),
+                    sharpe_ratio=f.get("sharpe_ratio"),
+                    expense_ratio=f.get("expense_ratio"),
+                    asset_class=CATEGORY_TO_ASSET_CLASS.get(f["category"], "equity"),
+                )
+                for f in SAMPLE_FUNDS
+            ],
+            category_to_asset_class=CATEGORY_TO_ASSET_CLASS,
+        )
+    return _sample_universe_instance
+
+
+def persona_ranking(universe: FundUniverse, persona_id: str) -> scoring_engine.Ranking:
+    """
+    Ranking of every fund eligible for a persona, built once per universe snapshot.
+
+    Scores depend only on fund data and the persona preferences, so a single
+    ordering serves every request for that persona.
+    """
+    if persona_id not in PERSONA_PREFERENCES:
+        persona_id = "balanced-voyager"
+    prefs = PERSONA_PREFERENCES[persona_id]
+
+    def build(u: FundUniverse) -> scoring_engine.Ranking:
+        rows = scoring_engine.filter_rows(u, max_volatility=prefs["max_volatility"])
+        return scoring_engine.build_ranking(rows, scoring_engine.persona_scores(u, rows, prefs))
+
+    return universe.derive(f"ranking:persona:{persona_id}", build)
+
+
+def asset_class_ranking(universe: FundUniverse, asset_class: str) -> scoring_engine.Ranking:
+    """Ranking of every fund within an asset class, built once per universe snapshot."""
+    max_vol = ASSET_CLASS_VOLATILITY_LIMITS.get(asset_class, 30.0)
+
+    def build(u: FundUniverse) -> scoring_engine.Ranking:
+        rows = scoring_engine.filter_rows(u, max_volatility=max_vol, rows=u.rows_in_asset_class(asset_class))
+        return scoring_engine.build_ranking(rows, scoring_engine.asset_class_scores(u, rows, max_vol))
+
+    return universe.derive(f"ranking:asset_class:{asset_class}", build)
+
+
+def build_rankings(universe: FundUniverse) -> None:
+    """Precompute persona and asset class rankings for a new snapshot."""
+    for persona_id in PERSONA_PREFERENCES:
+        persona_ranking(universe, persona_id)
+    for asset_class in ASSET_CLASS_VOLATILITY_LIMITS:
+        asset_class_ranking(universe, asset_class)
+
+
+# Rankings are built as part of each refresh rather than on the first request
+fund_data_service.add_snapshot_listener(build_rankings)
 
 
 class RecommendationService:
@@ -311,21 +385,16 @@ class RecommendationService:
 
     def __init__(self):
         self.model_version = "recommender-v1"
-        self._funds_cache = None
-        self._cache_time = None
 
     @property
-    def funds_db(self) -> List[dict]:
-        """Get funds database with caching (refreshes every 5 minutes)."""
-        import time as t
-        now = t.time()
+    def universe(self) -> FundUniverse:
+        """Get the current columnar fund universe (lock-free snapshot read, never blocks)."""
+        return _get_real_fund_universe()
 
-        # Refresh cache every 5 minutes
-        if self._funds_cache is None or self._cache_time is None or (now - self._cache_time) > 300:
-            self._funds_cache = _get_real_fund_data()
-            self._cache_time = now
-
-        return self._funds_cache
+    @property
+    def funds_db(self) -> List[dict]:
+        """Get funds database as dicts (materialised once per universe snapshot)."""
+        return self.universe.as_dict_list()
 
     def recommend(
         self,
@@ -348,19 +417,17 @@ class RecommendationService:
             persona_id, PERSONA_PREFERENCES["balanced-voyager"]
         )
 
-        # Filter and score funds
-        candidates = self._filter_funds(
+        # Take the top N from the persona's precomputed ranking
+        universe = self.universe
+        ranking = persona_ranking(universe, persona_id)
+        top_funds = self._top_funds(
+            universe,
+            ranking,
+            top_n,
             category_filters=category_filters,
-            exclude_funds=exclude_funds or [],
-            max_volatility=prefs["max_volatility"],
+            exclude_funds=exclude_funds,
         )
 
-        # Score funds based on persona preferences
-        scored = self._score_funds(candidates, prefs, profile)
-
-        # Select top N
-        top_funds = scored[:top_n]
-
         # Calculate allocation weights
         total_score = sum(s for _, s in top_funds)
         recommendations = []
@@ -393,70 +460,19 @@ class RecommendationService:
 
         return recommendations, persona_alignment, latency_ms
 
-    def _filter_funds(
+    def _top_funds(
         self,
-        category_filters: Optional[List[str]],
-        exclude_funds: List[int],
-        max_volatility: float,
-    ) -> List[dict]:
-        """Filter funds based on criteria."""
-        filtered = []
-
-        for fund in self.funds_db:
-            # Exclude specific funds
-            if fund["scheme_code"] in exclude_funds:
-                continue
-
-            # Filter by category
-            if category_filters and fund["category"] not in category_filters:
-                continue
-
-            # Filter by volatility
-            if fund.get("volatility", 0) > max_volatility:
-                continue
-
-            filtered.append(fund)
-
-        return filtered
-
-    def _score_funds(
-        self, funds: List[dict], prefs: dict, profile: dict
-    ) -> List[tuple]:
-        """Score funds based on persona preferences and profile."""
-        scored = []
-
-        preferred_categories = prefs["preferred_categories"]
-
-        for fund in funds:
-            score = 0.0
-
-            # Category preference bonus (0-0.3)
-            if fund["category"] in preferred_categories:
-                idx = preferred_categories.index(fund["category"])
-                score += 0.3 * (1 - idx / len(preferred_categories))
-
-            # Return score (0-0.3)
-            return_3y = fund.get("return_3y", 0)
-            score += 0.3 * min(return_3y / 30, 1.0)
-
-            # Risk-adjusted return (0-0.2)
-            sharpe = fund.get("sharpe_ratio", 0)
-            score += 0.2 * min(sharpe / 1.5, 1.0)
-
-            # Expense ratio (0-0.1, lower is better)
-            expense = fund.get("expense_ratio", 2.0)
-            score += 0.1 * max(0, 1 - expense / 2.0)
-
-            # Volatility fit (0-0.1)
-            volatility = fund.get("volatility", 20)
-            max_vol = prefs["max_volatility"]
-            if volatility <= max_vol:
-                score += 0.1 * (1 - volatility / max_vol)
-
-            scored.append((fund, score))
-
-        # Sort by score descending
-        return sorted(scored, key=lambda x: x[1], reverse=True)
+        universe: FundUniverse,
+        ranking: scoring_engine.Ranking,
+        top_n: int,
+        category_filters: Optional[List[str]] = None,
+        exclude_funds: Optional[List[int]] = None,
+    ) -> List[Tuple[dict, float]]:
+        """Select the top N ranked funds passing the filters as (fund dict, score) pairs."""
+        rows, scores = scoring_engine.take_ranked(
+            universe, ranking, top_n, category_filters=category_filters, exclude_funds=exclude_funds
+        )
+        return [(universe.to_dict(row), float(score)) for row, score in zip(rows.tolist(), scores)]
 
     def _generate_reasoning(
         self, fund: dict, prefs: dict, profile: dict
@@ -537,6 +553,72 @@ class RecommendationService:
         """
         start_time = time.time()
 
+        recommendations, breakdown, alignment_score, alignment_message = self._recommend_blended(
+            self.universe,
+            blended_allocation,
+            top_n=top_n,
+            investment_amount=investment_amount,
+            category_filters=category_filters,
+            exclude_funds=exclude_funds,
+        )
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        return recommendations, breakdown, alignment_score, alignment_message, latency_ms
+
+    def recommend_blended_batch(
+        self, items: List[dict]
+    ) -> Tuple[List[Tuple[List[FundRecommendation], List[AssetClassBreakdown], float, str]], int]:
+        """
+        Recommend funds for many blended allocations at once (e.g. an advisor's whole book).
+
+        Each item holds the keyword arguments of ``recommend_blended``. All items
+        are served from one universe snapshot, and the fund selection for each
+        distinct (asset class, fund count, filters) combination is computed
+        once and shared by every item that needs it.
+
+        Returns:
+            Tuple of (per-item results in input order, latency_ms); each result is
+            (recommendations, asset_class_breakdown, alignment_score, alignment_message)
+        """
+        start_time = time.time()
+
+        universe = self.universe
+        selections: Dict[tuple, List[Tuple[dict, float]]] = {}
+        results = [
+            self._recommend_blended(
+                universe,
+                item["blended_allocation"],
+                top_n=item.get("top_n", 6),
+                investment_amount=item.get("investment_amount"),
+                category_filters=item.get("category_filters"),
+                exclude_funds=item.get("exclude_funds"),
+                selections=selections,
+            )
+            for item in items
+        ]
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        return results, latency_ms
+
+    def _recommend_blended(
+        self,
+        universe: FundUniverse,
+        blended_allocation: AllocationTarget,
+        top_n: int = 6,
+        investment_amount: Optional[float] = None,
+        category_filters: Optional[List[str]] = None,
+        exclude_funds: Optional[List[int]] = None,
+        selections: Optional[Dict[tuple, List[Tuple[dict, float]]]] = None,
+    ) -> Tuple[List[FundRecommendation], List[AssetClassBreakdown], float, str]:
+        """
+        Blended recommendation against a given universe snapshot.
+
+        ``selections`` memoises per-asset-class fund selections across calls
+        (used by the batch path); keys include the filters so only identical
+        selections are shared.
+        """
         # Convert allocation to dict
         target_alloc = {
             "equity": blended_allocation.equity,
@@ -550,30 +632,33 @@ class RecommendationService:
         # Filter out zero allocations
         active_allocations = {k: v for k, v in target_alloc.items() if v > 0}
 
-        # Group funds by asset class
-        funds_by_class = self._group_funds_by_asset_class(
-            category_filters=category_filters,
-            exclude_funds=exclude_funds or [],
-        )
-
         # Determine funds per asset class based on allocation
         funds_per_class = self._allocate_fund_slots(active_allocations, top_n)
 
-        # Select best funds for each asset class
+        # Select best funds for each asset class from its precomputed ranking
         recommendations = []
         actual_allocations = {}
+        filter_key = (
+            tuple(sorted(set(category_filters))) if category_filters else (),
+            tuple(sorted(set(exclude_funds))) if exclude_funds else (),
+        )
 
         for asset_class, num_funds in funds_per_class.items():
-            if num_funds == 0 or asset_class not in funds_by_class:
+            if num_funds == 0:
                 continue
 
-            # Get volatility limit for this asset class
-            max_vol = ASSET_CLASS_VOLATILITY_LIMITS.get(asset_class, 30.0)
-
-            # Score and select funds for this asset class
-            class_funds = funds_by_class[asset_class]
-            scored = self._score_funds_for_asset_class(class_funds, max_vol, profile)
-            selected = scored[:num_funds]
+            key = (asset_class, num_funds) + filter_key
+            selected = selections.get(key) if selections is not None else None
+            if selected is None:
+                selected = self._top_funds(
+                    universe,
+                    asset_class_ranking(universe, asset_class),
+                    num_funds,
+                    category_filters=category_filters,
+                    exclude_funds=exclude_funds,
+                )
+                if selections is not None:
+                    selections[key] = selected
 
             for fund, score in selected:
                 rec = FundRecommendation(
@@ -608,33 +693,7 @@ class RecommendationService:
         alignment_score = self._calculate_alignment_score(breakdown, target_alloc)
         alignment_message = self._generate_alignment_message(alignment_score, breakdown)
 
-        latency_ms = int((time.time() - start_time) * 1000)
-
-        return recommendations, breakdown, alignment_score, alignment_message, latency_ms
-
-    def _group_funds_by_asset_class(
-        self,
-        category_filters: Optional[List[str]],
-        exclude_funds: List[int],
-    ) -> Dict[str, List[dict]]:
-        """Group available funds by their asset class."""
-        grouped = {}
-
-        for fund in self.funds_db:
-            if fund["scheme_code"] in exclude_funds:
-                continue
-
-            category = fund["category"]
-            if category_filters and category not in category_filters:
-                continue
-
-            # Use asset_class from fund data if available, otherwise derive from category
-            asset_class = fund.get("asset_class") or CATEGORY_TO_ASSET_CLASS.get(category, "equity")
-            if asset_class not in grouped:
-                grouped[asset_class] = []
-            grouped[asset_class].append(fund)
-
-        return grouped
+        return recommendations, breakdown, alignment_score, alignment_message
 
     def _allocate_fund_slots(
         self, allocations: Dict[str, float], total_funds: int
@@ -692,39 +751,6 @@ class RecommendationService:
 
         return fund_counts
 
-    def _score_funds_for_asset_class(
-        self, funds: List[dict], max_volatility: float, profile: dict
-    ) -> List[Tuple[dict, float]]:
-        """Score funds within an asset class."""
-        scored = []
-
-        for fund in funds:
-            # Skip if volatility exceeds limit
-            if fund.get("volatility", 0) > max_volatility:
-                continue
-
-            score = 0.0
-
-            # Return score (0-0.35)
-            return_3y = fund.get("return_3y", 0)
-            score += 0.35 * min(return_3y / 30, 1.0)
-
-            # Sharpe ratio (0-0.25)
-            sharpe = fund.get("sharpe_ratio", 0)
-            score += 0.25 * min(sharpe / 1.5, 1.0)
-
-            # Expense ratio (0-0.2, lower is better)
-            expense = fund.get("expense_ratio", 2.0)
-            score += 0.2 * max(0, 1 - expense / 2.0)
-
-            # Volatility fit (0-0.2, prefer lower within limit)
-            volatility = fund.get("volatility", max_volatility)
-            score += 0.2 * (1 - volatility / max_volatility)
-
-            scored.append((fund, score))
-
-        return sorted(scored, key=lambda x: x[1], reverse=True)
-
     def _distribute_allocations(
         self,
         recommendations: List[FundRecommendation],
@@ -860,3 +886,7 @@ class RecommendationService:
             reasons.append("low volatility")
 
         return ", ".join(reasons) if reasons else f"Well-suited {asset_class} fund for diversification"
+
+
+# Global instance (shared by the REST and gRPC servers)
+recommendation_service = RecommendationService()
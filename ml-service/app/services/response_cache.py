@@ -0,0 +1,162 @@
+"""
+LRU cache of whole API responses.
+
+``/recommend``, ``/recommend/blended`` and ``/classify/blended`` are pure
+functions of the request body and of the data they are computed from (the
+fund universe snapshot for recommendations, the persona rules for
+classification). Popular persona and allocation combinations repeat all
+day, so finished responses are cached and a repeated request is answered
+without recomputing or leaving the event loop.
+
+Keys are ``(endpoint, version, digest)`` where ``digest`` is a hash of the
+request body in canonical JSON (sorted keys, ``request_id`` left out) and
+``version`` identifies the data the response was computed from. A new fund
+universe snapshot drops every entry of older versions (see ``invalidate``),
+so stale responses are never served. Cached responses are shared between
+callers and must not be mutated; ``respond`` returns a copy carrying the
+caller's request_id.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.services.fund_data_service import fund_data_service
+from app.services.fund_universe import FundUniverse
+
+
+def request_digest(request: BaseModel) -> str:
+    """Hash of a request body in canonical JSON, ignoring its request_id."""
+    body = request.model_dump(mode="json", exclude={"request_id"})
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class _EndpointCounters:
+    """Hit and miss counts for one endpoint."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class ResponseCache:
+    """Size-bounded LRU of responses keyed by endpoint, data version and request digest."""
+
+    def __init__(self, max_entries: int = 4096):
+        self._entries: "OrderedDict[Tuple[str, Hashable, str], BaseModel]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._universe_version = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._endpoints: Dict[str, _EndpointCounters] = {}
+
+    def configure(self, max_entries: int):
+        """Set the maximum number of entries (0 disables the cache)."""
+        with self._lock:
+            self._max_entries = max(0, max_entries)
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def key(self, endpoint: str, version: Hashable, request: BaseModel) -> Tuple[str, Hashable, str]:
+        """Cache key for a request to ``endpoint`` against data ``version``."""
+        return endpoint, version, request_digest(request)
+
+    def get(self, key: Tuple[str, Hashable, str]) -> Optional[BaseModel]:
+        """Cached response for the key (None on a miss)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            counters = self._counters(key[0])
+            cached = self._entries.get(key)
+            if cached is None:
+                counters.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            counters.hits += 1
+            return cached
+
+    def put(self, key: Tuple[str, Hashable, str], response: BaseModel):
+        """
+        Store a response, evicting the least recently used entries when full.
+
+        Responses computed from a fund universe older than the latest
+        published snapshot are not stored.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            version = key[1]
+            if isinstance(version, int) and version < self._universe_version:
+                return
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def respond(self, response: BaseModel, request_id: Optional[str], latency_ms: int = 0) -> BaseModel:
+        """Copy of a cached response for another request (shallow: nested objects are shared)."""
+        return response.model_copy(update={"request_id": request_id, "latency_ms": latency_ms})
+
+    def invalidate(self, universe: FundUniverse):
+        """Drop responses computed from fund universe snapshots older than ``universe``."""
+        with self._lock:
+            self._universe_version = max(self._universe_version, universe.version)
+            stale = [
+                key for key in self._entries
+                if isinstance(key[1], int) and key[1] < self._universe_version
+            ]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _counters(self, endpoint: str) -> _EndpointCounters:
+        counters = self._endpoints.get(endpoint)
+        if counters is None:
+            counters = self._endpoints[endpoint] = _EndpointCounters()
+        return counters
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, eviction and per-endpoint hit/miss counts for health reporting."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "universe_version": self._universe_version,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "endpoints": {
+                    endpoint: counters.to_dict()
+                    for endpoint, counters in sorted(self._endpoints.items())
+                },
+            }
+
+
+# Global instance (sized from settings at startup), invalidated by every new snapshot
+response_cache = ResponseCache()
+fund_data_service.add_snapshot_listener(response_cache.invalidate)
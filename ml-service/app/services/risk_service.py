@@ -7,6 +7,7 @@ import time
 from typing import List, Dict, Optional
 
 from app.schemas.risk import RiskFactor
+from app.services.covariance_service import covariance_service
 
 
 # Risk thresholds by persona
@@ -44,6 +45,15 @@ DEBT_CATEGORIES = {
 }
 
 
+def _asset_class(category: Optional[str]) -> str:
+    """Asset class for prior correlations (categories outside both sets count as hybrid)."""
+    if category in EQUITY_CATEGORIES:
+        return "equity"
+    if category in DEBT_CATEGORIES:
+        return "debt"
+    return "hybrid"
+
+
 class RiskService:
     """Service for portfolio risk assessment."""
 
@@ -245,30 +255,28 @@ class RiskService:
     def _assess_volatility_risk(
         self, portfolio: List[dict], thresholds: dict
     ) -> Optional[RiskFactor]:
-        """Assess portfolio volatility risk."""
-        weighted_vol = 0
-        total_weight = 0
-
-        for fund in portfolio:
-            vol = fund.get("volatility", 15)  # Default 15% if unknown
-            weight = fund.get("weight", 0)
-            weighted_vol += vol * weight
-            total_weight += weight
+        """Assess portfolio volatility risk (sqrt(w'Σw), diversification included)."""
+        total_weight = sum(fund.get("weight", 0) for fund in portfolio)
 
         if total_weight == 0:
             return None
 
-        avg_vol = weighted_vol / total_weight
+        portfolio_vol = 100 * covariance_service.portfolio_volatility(
+            [fund.get("scheme_code") or -1 for fund in portfolio],
+            [fund.get("weight", 0) / total_weight for fund in portfolio],
+            [fund.get("volatility", 15) / 100 for fund in portfolio],  # Default 15% if unknown
+            [_asset_class(fund.get("category")) for fund in portfolio],
+        )
         max_vol = thresholds["max_volatility"]
 
-        if avg_vol > max_vol:
-            excess = avg_vol - max_vol
+        if portfolio_vol > max_vol:
+            excess = portfolio_vol - max_vol
             contribution = min(0.35, 0.15 + excess / 100)
             return RiskFactor(
                 name="Volatility Risk",
                 contribution=round(contribution, 2),
                 severity="High" if excess > 10 else "Moderate",
-                description=f"Portfolio volatility of {avg_vol:.1f}% exceeds {max_vol}% threshold",
+                description=f"Portfolio volatility of {portfolio_vol:.1f}% exceeds {max_vol}% threshold",
             )
 
         return None
@@ -371,3 +379,7 @@ class RiskService:
 
     def get_model_version(self) -> str:
         return self.model_version
+
+
+# Global instance (shared by the REST and gRPC servers)
+risk_service = RiskService()
@@ -0,0 +1,234 @@
+"""
+On-disk store for the fund universe snapshot.
+
+Persists the last good FundUniverse under MODEL_STORE_PATH so a restarted
+(or newly scaled) replica can serve real fund data immediately instead of
+waiting for the backend download. The same store is how uvicorn workers
+share one universe: a single publisher process writes it and the others
+memory-map the files, so the column data lives once in the page cache.
+
+Layout::
+
+    <root>/CURRENT                   name of the active snapshot directory
+    <root>/<snapshot_id>/manifest.json
+    <root>/<snapshot_id>/<column>.npy
+    <root>/<snapshot_id>/scheme_names.bin   UTF-8 names, sliced by scheme_name_offsets.npy
+
+Numeric columns are plain .npy files loaded with ``mmap_mode="r"``; text
+columns are vocab-encoded (ids in .npy, names in the manifest) except scheme
+names, which are stored as one UTF-8 blob plus offsets. A snapshot directory
+is fully written before CURRENT is atomically replaced to point at it, so a
+crash mid-write leaves the previous snapshot in place.
+"""
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.fund_universe import FundUniverse, METRIC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older snapshots are ignored
+FORMAT_VERSION = 1
+
+ARRAY_COLUMNS = (
+    "scheme_codes",
+    "nav",
+    "category_ids",
+    "asset_class_ids",
+    "category_asset_class_ids",
+    "fund_house_ids",
+    "scheme_name_offsets",
+) + METRIC_COLUMNS
+
+
+@dataclass
+class StoredUniverse:
+    """A snapshot loaded from disk with the sync state it was saved with."""
+    snapshot_id: str
+    universe: FundUniverse
+    saved_at: datetime
+    watermark: Optional[str] = None
+    last_full_sync_at: Optional[datetime] = None
+
+
+def save_universe(
+    root: str,
+    universe: FundUniverse,
+    watermark: Optional[str] = None,
+    last_full_sync_at: Optional[datetime] = None,
+) -> str:
+    """
+    Write a snapshot and make it the current one. Returns the snapshot id.
+
+    Older snapshot directories are removed once CURRENT points at the new one.
+    """
+    os.makedirs(root, exist_ok=True)
+    saved_at = datetime.now()
+    snapshot_id = f"v{universe.version}-{saved_at.strftime('%Y%m%dT%H%M%S%f')}"
+    snapshot_dir = os.path.join(root, snapshot_id)
+    os.makedirs(snapshot_dir)
+
+    # Scheme names: one UTF-8 blob plus offsets
+    encoded = [(fund.scheme_name or "").encode("utf-8") for fund in universe.funds]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=offsets[1:])
+    with open(os.path.join(snapshot_dir, "scheme_names.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+
+    columns = {
+        "scheme_codes": universe.scheme_codes,
+        "nav": universe.nav,
+        "category_ids": universe.category_ids,
+        "asset_class_ids": universe.asset_class_ids,
+        "category_asset_class_ids": universe.category_asset_class_ids,
+        "fund_house_ids": universe.fund_house_ids,
+        "scheme_name_offsets": offsets,
+    }
+    columns.update(universe.metrics)
+    for name in ARRAY_COLUMNS:
+        np.save(os.path.join(snapshot_dir, f"{name}.npy"), np.ascontiguousarray(columns[name]))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "snapshot_id": snapshot_id,
+        "universe_version": universe.version,
+        "total_funds": len(universe),
+        "saved_at": saved_at.isoformat(),
+        "universe_created_at": universe.created_at.isoformat(),
+        "watermark": watermark,
+        "last_full_sync_at": last_full_sync_at.isoformat() if last_full_sync_at else None,
+        "columns": list(ARRAY_COLUMNS),
+        "category_names": universe.category_names,
+        "asset_class_names": universe.asset_class_names,
+        "fund_house_names": universe.fund_house_names,
+    }
+    with open(os.path.join(snapshot_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    # Switch CURRENT atomically, then drop superseded snapshots
+    current_tmp = os.path.join(root, f"CURRENT.{os.getpid()}.tmp")
+    with open(current_tmp, "w") as f:
+        f.write(snapshot_id)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(current_tmp, os.path.join(root, "CURRENT"))
+
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        if entry != snapshot_id and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+    return snapshot_id
+
+
+def current_snapshot_id(root: str) -> Optional[str]:
+    """Id of the current snapshot (cheap; used to poll for a newer one)."""
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_universe(root: str, fund_factory: Any) -> Optional[StoredUniverse]:
+    """
+    Load the current snapshot, or None if there is none (or it is unreadable).
+
+    ``fund_factory`` builds a fund record from keyword arguments (FundData).
+    Numeric columns are memory-mapped rather than read into memory.
+    """
+    snapshot_id = current_snapshot_id(root)
+    if snapshot_id is None:
+        return None
+
+    snapshot_dir = os.path.join(root, snapshot_id)
+    try:
+        with open(os.path.join(snapshot_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            logger.warning(f"Ignoring fund universe snapshot {snapshot_id}: unsupported format")
+            return None
+
+        columns = {
+            name: np.load(os.path.join(snapshot_dir, f"{name}.npy"), mmap_mode="r")
+            for name in manifest["columns"]
+        }
+        with open(os.path.join(snapshot_dir, "scheme_names.bin"), "rb") as f:
+            names_blob = f.read()
+
+        saved_at = datetime.fromisoformat(manifest["saved_at"])
+        funds = _build_funds(columns, names_blob, manifest, fund_factory, saved_at)
+        universe = FundUniverse.from_columns(
+            funds,
+            columns,
+            category_names=manifest["category_names"],
+            asset_class_names=manifest["asset_class_names"],
+            version=manifest["universe_version"],
+            created_at=datetime.fromisoformat(manifest["universe_created_at"]),
+            fund_house_names=manifest["fund_house_names"],
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load fund universe snapshot {snapshot_id}: {e}")
+        return None
+
+    last_full_sync_at = manifest.get("last_full_sync_at")
+    return StoredUniverse(
+        snapshot_id=snapshot_id,
+        universe=universe,
+        saved_at=saved_at,
+        watermark=manifest.get("watermark"),
+        last_full_sync_at=datetime.fromisoformat(last_full_sync_at) if last_full_sync_at else None,
+    )
+
+
+def _build_funds(
+    columns: Dict[str, np.ndarray],
+    names_blob: bytes,
+    manifest: Dict[str, Any],
+    fund_factory: Any,
+    saved_at: datetime,
+) -> List[Any]:
+    """Rebuild per-fund records from the stored columns."""
+    category_names = manifest["category_names"]
+    asset_class_names = manifest["asset_class_names"]
+    fund_house_names = manifest["fund_house_names"]
+    offsets = columns["scheme_name_offsets"].tolist()
+    # One row of metric values per fund (NaN -> None), in METRIC_COLUMNS order
+    metric_rows = zip(*(
+        [v if v == v else None for v in columns[name].tolist()]
+        for name in METRIC_COLUMNS
+    ))
+
+    funds = []
+    for i, (code, nav, cid, aid, fid, (r1, r3, r5, vol, sharpe, expense)) in enumerate(zip(
+        columns["scheme_codes"].tolist(),
+        columns["nav"].tolist(),
+        columns["category_ids"].tolist(),
+        columns["asset_class_ids"].tolist(),
+        columns["fund_house_ids"].tolist(),
+        metric_rows,
+    )):
+        funds.append(fund_factory(
+            scheme_code=code,
+            scheme_name=names_blob[offsets[i]:offsets[i + 1]].decode("utf-8"),
+            fund_house=fund_house_names[fid],
+            category=category_names[cid],
+            nav=nav,
+            asset_class=asset_class_names[aid],
+            last_updated=saved_at,
+            return_1y=r1,
+            return_3y=r3,
+            return_5y=r5,
+            volatility=vol,
+            sharpe_ratio=sharpe,
+            expense_ratio=expense,
+        ))
+    return funds
@@ -0,0 +1,161 @@
+"""
+Limit tests for the mean-variance optimizer.
+
+Every weight vector the optimizer returns must be a full, long-only
+allocation within the per-fund cap, the equity cap, the debt floor and the
+fund count limits; inputs that cannot meet them must give None rather
+than a relaxed allocation.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from app.services.portfolio_optimizer import (
+    MIN_WEIGHT,
+    MeanVarianceOptimizer,
+    drop_dust,
+    select_positions,
+)
+
+# Tolerance for sums and class totals (solver accuracy plus rounding)
+TOLERANCE = 1e-5
+
+# 7 equity, 4 debt and 3 hybrid candidates
+EQUITY_MASK = np.array([1.0] * 7 + [0.0] * 7)
+DEBT_MASK = np.array([0.0] * 7 + [1.0] * 4 + [0.0] * 3)
+N = len(EQUITY_MASK)
+
+_rng = np.random.default_rng(7)
+MU = np.where(EQUITY_MASK > 0, _rng.uniform(0.10, 0.18, N), np.where(DEBT_MASK > 0, _rng.uniform(0.06, 0.08, N), 0.10))
+_volatility = np.where(EQUITY_MASK > 0, _rng.uniform(0.14, 0.22, N), np.where(DEBT_MASK > 0, _rng.uniform(0.01, 0.03, N), 0.09))
+_loadings = _rng.normal(size=(N, 3)) * 0.5
+_correlation = _loadings @ _loadings.T + np.eye(N)
+_scale = np.sqrt(np.diag(_correlation))
+_correlation = _correlation / np.outer(_scale, _scale)
+COVARIANCE = _correlation * np.outer(_volatility, _volatility)
+
+
+def fund_caps(max_single_fund: float, min_funds: int) -> np.ndarray:
+    """Per-fund caps as portfolio_service builds them (at least ``min_funds`` holdings)."""
+    return np.full(N, min(max_single_fund, 1.0 / min_funds))
+
+
+FEASIBLE_CASES = [
+    # max_single_fund, min_funds, max_funds, max_equity, min_debt, risk_aversion, max_volatility, target_return
+    (0.30, 3, 10, 1.00, 0.00, 1.0, None, None),
+    (0.35, 3, 3, 0.90, 0.20, 0.2, None, None),
+    (0.25, 4, 5, 0.60, 0.30, 0.5, None, None),
+    (0.20, 5, 6, 0.50, 0.35, 2.0, 0.12, None),
+    (0.15, 7, 8, 0.80, 0.10, 1.0, None, 0.10),
+    (0.40, 3, 4, 0.30, 0.50, 1.0, 0.05, None),
+    (0.50, 2, 2, 0.50, 0.50, 0.1, None, None),
+]
+
+
+@pytest.mark.parametrize(
+    "max_single_fund,min_funds,max_funds,max_equity,min_debt,risk_aversion,max_volatility,target_return",
+    FEASIBLE_CASES,
+)
+def test_weights_within_limits(
+    max_single_fund: float,
+    min_funds: int,
+    max_funds: int,
+    max_equity: float,
+    min_debt: float,
+    risk_aversion: float,
+    max_volatility: Optional[float],
+    target_return: Optional[float],
+):
+    caps = fund_caps(max_single_fund, min_funds)
+    result = MeanVarianceOptimizer().optimize(
+        MU,
+        COVARIANCE,
+        caps,
+        EQUITY_MASK,
+        DEBT_MASK,
+        max_equity=max_equity,
+        min_debt=min_debt,
+        risk_aversion=risk_aversion,
+        max_volatility=max_volatility,
+        target_return=target_return,
+        max_funds=max_funds,
+    )
+    assert result is not None
+    weights = result.weights
+    held = np.count_nonzero(weights)
+
+    assert weights.min() >= 0.0
+    assert weights.sum() == pytest.approx(1.0, abs=TOLERANCE)
+    assert weights.max() <= max_single_fund
+    assert weights.max() <= caps.max()
+    assert EQUITY_MASK @ weights <= max_equity + TOLERANCE
+    assert DEBT_MASK @ weights >= min_debt - TOLERANCE
+    assert min_funds <= held <= max_funds
+    assert weights[weights > 0].min() > MIN_WEIGHT
+
+
+INFEASIBLE_CASES = [
+    # Caps cannot reach 100%
+    dict(max_single_fund=0.05, min_funds=3, max_funds=14, max_equity=1.0, min_debt=0.0),
+    # Debt funds cannot reach the floor
+    dict(max_single_fund=0.10, min_funds=3, max_funds=14, max_equity=1.0, min_debt=0.5),
+    # Non-equity funds cannot keep equity under the cap
+    dict(max_single_fund=0.10, min_funds=3, max_funds=14, max_equity=0.2, min_debt=0.0),
+    # Too few positions allowed to reach 100% under the per-fund cap
+    dict(max_single_fund=0.25, min_funds=3, max_funds=3, max_equity=1.0, min_debt=0.0),
+    # Class limits need more positions than max_funds allows
+    dict(max_single_fund=0.30, min_funds=3, max_funds=3, max_equity=0.3, min_debt=0.6),
+]
+
+
+@pytest.mark.parametrize("case", INFEASIBLE_CASES)
+def test_infeasible_returns_none(case: dict):
+    result = MeanVarianceOptimizer().optimize(
+        MU,
+        COVARIANCE,
+        fund_caps(case["max_single_fund"], case["min_funds"]),
+        EQUITY_MASK,
+        DEBT_MASK,
+        max_equity=case["max_equity"],
+        min_debt=case["min_debt"],
+        max_funds=case["max_funds"],
+    )
+    assert result is None
+
+
+def test_select_positions_covers_class_limits():
+    # Equity carries the largest weights, but the debt floor needs two debt funds
+    weights = np.where(EQUITY_MASK > 0, 0.12, 0.02)
+    caps = np.full(N, 0.3)
+    keep = select_positions(weights, caps, EQUITY_MASK, DEBT_MASK, max_equity=0.6, min_debt=0.4, max_funds=5)
+    assert keep is not None
+    assert len(keep) <= 5
+    assert DEBT_MASK[keep] @ caps[keep] >= 0.4
+    assert (1 - EQUITY_MASK[keep]) @ caps[keep] >= 0.4
+
+
+def test_select_positions_infeasible():
+    caps = np.full(N, 0.3)
+    weights = np.full(N, 1.0 / N)
+    assert select_positions(weights, caps, EQUITY_MASK, DEBT_MASK, 1.0, 0.0, max_funds=3) is None
+    assert select_positions(weights, caps, EQUITY_MASK, DEBT_MASK, 1.0, 0.7, max_funds=2) is None
+
+
+def test_drop_dust_keeps_caps_and_class_totals():
+    caps = np.full(N, 0.2)
+    weights = np.zeros(N)
+    weights[[0, 1, 2]] = [0.2, 0.2, 0.19995]
+    weights[3] = 0.00005
+    weights[[7, 8]] = [0.2, 0.1999]
+    weights[9] = 0.0001
+    classes = (EQUITY_MASK + 2 * DEBT_MASK).astype(np.int64)
+
+    out = drop_dust(weights, caps, classes)
+
+    assert out.sum() == pytest.approx(1.0, abs=1e-12)
+    assert out.max() <= 0.2
+    assert out[3] == 0.0 and out[9] == 0.0
+    assert EQUITY_MASK @ out == pytest.approx(EQUITY_MASK @ weights, abs=1e-12)
+    assert DEBT_MASK @ out == pytest.approx(DEBT_MASK @ weights, abs=1e-12)
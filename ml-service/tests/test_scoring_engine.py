@@ -0,0 +1,284 @@
+"""
+Parity tests for the vectorized scoring engine.
+
+The reference functions below are the original per-fund scoring loops of
+RecommendationService (``_filter_funds``, ``_score_funds``,
+``_group_funds_by_asset_class`` and ``_score_funds_for_asset_class``),
+run over the legacy fund dicts. The vectorized rankings must give the same
+scores bit for bit and the same top-N order, ties included.
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from app.services import scoring_engine
+from app.services.fund_data_service import CATEGORY_TO_ASSET_CLASS, FundData
+from app.services.fund_universe import FundUniverse
+from app.services.recommendation_service import (
+    ASSET_CLASS_VOLATILITY_LIMITS,
+    PERSONA_PREFERENCES,
+    RecommendationService,
+    asset_class_ranking,
+    persona_ranking,
+)
+
+CATEGORIES = list(CATEGORY_TO_ASSET_CLASS) + ["Unmapped Category"]
+
+
+# ============= Reference (scalar) implementation =============
+
+def legacy_dict(fund: FundData) -> dict:
+    """Fund in the legacy dict format (defaults for missing or zero metrics)."""
+    return {
+        "scheme_code": fund.scheme_code,
+        "scheme_name": fund.scheme_name,
+        "fund_house": fund.fund_house,
+        "category": fund.category,
+        "asset_class": fund.asset_class,
+        "return_1y": fund.return_1y or 0,
+        "return_3y": fund.return_3y or 0,
+        "return_5y": fund.return_5y or 0,
+        "volatility": fund.volatility or 15.0,
+        "sharpe_ratio": fund.sharpe_ratio or 0.8,
+        "expense_ratio": fund.expense_ratio or 0.5,
+    }
+
+
+def reference_filter_funds(
+    funds: List[dict],
+    category_filters: Optional[List[str]],
+    exclude_funds: List[int],
+    max_volatility: float,
+) -> List[dict]:
+    filtered = []
+    for fund in funds:
+        if fund["scheme_code"] in exclude_funds:
+            continue
+        if category_filters and fund["category"] not in category_filters:
+            continue
+        if fund.get("volatility", 0) > max_volatility:
+            continue
+        filtered.append(fund)
+    return filtered
+
+
+def reference_score_funds(funds: List[dict], prefs: dict) -> List[Tuple[dict, float]]:
+    scored = []
+    preferred_categories = prefs["preferred_categories"]
+    for fund in funds:
+        score = 0.0
+
+        if fund["category"] in preferred_categories:
+            idx = preferred_categories.index(fund["category"])
+            score += 0.3 * (1 - idx / len(preferred_categories))
+
+        return_3y = fund.get("return_3y", 0)
+        score += 0.3 * min(return_3y / 30, 1.0)
+
+        sharpe = fund.get("sharpe_ratio", 0)
+        score += 0.2 * min(sharpe / 1.5, 1.0)
+
+        expense = fund.get("expense_ratio", 2.0)
+        score += 0.1 * max(0, 1 - expense / 2.0)
+
+        volatility = fund.get("volatility", 20)
+        max_vol = prefs["max_volatility"]
+        if volatility <= max_vol:
+            score += 0.1 * (1 - volatility / max_vol)
+
+        scored.append((fund, score))
+    return sorted(scored, key=lambda x: x[1], reverse=True)
+
+
+def reference_group_funds_by_asset_class(
+    funds: List[dict],
+    category_filters: Optional[List[str]],
+    exclude_funds: List[int],
+) -> Dict[str, List[dict]]:
+    grouped = {}
+    for fund in funds:
+        if fund["scheme_code"] in exclude_funds:
+            continue
+        category = fund["category"]
+        if category_filters and category not in category_filters:
+            continue
+        asset_class = fund.get("asset_class") or CATEGORY_TO_ASSET_CLASS.get(category, "equity")
+        grouped.setdefault(asset_class, []).append(fund)
+    return grouped
+
+
+def reference_score_funds_for_asset_class(funds: List[dict], max_volatility: float) -> List[Tuple[dict, float]]:
+    scored = []
+    for fund in funds:
+        if fund.get("volatility", 0) > max_volatility:
+            continue
+
+        score = 0.0
+
+        return_3y = fund.get("return_3y", 0)
+        score += 0.35 * min(return_3y / 30, 1.0)
+
+        sharpe = fund.get("sharpe_ratio", 0)
+        score += 0.25 * min(sharpe / 1.5, 1.0)
+
+        expense = fund.get("expense_ratio", 2.0)
+        score += 0.2 * max(0, 1 - expense / 2.0)
+
+        volatility = fund.get("volatility", max_volatility)
+        score += 0.2 * (1 - volatility / max_volatility)
+
+        scored.append((fund, score))
+    return sorted(scored, key=lambda x: x[1], reverse=True)
+
+
+# ============= Fixtures =============
+
+def make_funds(n: int, seed: int) -> List[FundData]:
+    """
+    Random funds with missing (None) and zero metrics, and blocks of funds
+    sharing identical metrics so scores tie.
+    """
+    rng = random.Random(seed)
+
+    def metric(low: float, high: float) -> Optional[float]:
+        roll = rng.random()
+        if roll < 0.1:
+            return None
+        if roll < 0.13:
+            return 0.0
+        return round(rng.uniform(low, high), 2)
+
+    funds = []
+    template = None
+    for i in range(n):
+        category = rng.choice(CATEGORIES)
+        if template is None or rng.random() < 0.7:
+            template = {
+                "return_1y": metric(-10, 40),
+                "return_3y": metric(-5, 35),
+                "return_5y": metric(0, 30),
+                "volatility": metric(0.2, 30),
+                "sharpe_ratio": metric(-0.5, 2.5),
+                "expense_ratio": metric(0.05, 2.5),
+            }
+        funds.append(FundData(
+            scheme_code=100000 + i,
+            scheme_name=f"Fund {i}",
+            fund_house=f"House {i % 25}",
+            category=category,
+            nav=100.0,
+            asset_class=rng.choice([None, CATEGORY_TO_ASSET_CLASS.get(category, "equity"), "equity"]),
+            **template,
+        ))
+    return funds
+
+
+@pytest.fixture(scope="module", params=[1, 2, 3])
+def funds(request) -> List[FundData]:
+    return make_funds(3000, seed=request.param)
+
+
+@pytest.fixture(scope="module")
+def universe(funds) -> FundUniverse:
+    return FundUniverse(funds, category_to_asset_class=CATEGORY_TO_ASSET_CLASS)
+
+
+@pytest.fixture(scope="module")
+def fund_dicts(funds) -> List[dict]:
+    return [legacy_dict(f) for f in funds]
+
+
+def ranked(pairs: List[Tuple[dict, float]]) -> List[Tuple[int, float]]:
+    return [(fund["scheme_code"], score) for fund, score in pairs]
+
+
+FILTER_CASES = [
+    (None, None),
+    (["Large Cap", "Flexi Cap", "ELSS"], None),
+    (None, list(range(100000, 100600, 3))),
+    (["Corporate Bond", "Gilt", "Liquid", "Unmapped Category"], list(range(100000, 103000, 7))),
+    (["Not A Category"], None),
+]
+
+
+# ============= Tests =============
+
+def test_ties_present(fund_dicts):
+    """The fixture must exercise tie-breaking."""
+    prefs = PERSONA_PREFERENCES["balanced-voyager"]
+    scores = [score for _, score in reference_score_funds(fund_dicts, prefs)]
+    assert len(scores) - len(set(scores)) > 100
+
+
+@pytest.mark.parametrize("persona_id", list(PERSONA_PREFERENCES))
+def test_persona_scores_match(universe, fund_dicts, persona_id):
+    prefs = PERSONA_PREFERENCES[persona_id]
+    rows = scoring_engine.filter_rows(universe, max_volatility=prefs["max_volatility"])
+    scores = scoring_engine.persona_scores(universe, rows, prefs)
+
+    candidates = reference_filter_funds(fund_dicts, None, [], prefs["max_volatility"])
+    expected = {fund["scheme_code"]: score for fund, score in reference_score_funds(candidates, prefs)}
+
+    assert universe.scheme_codes[rows].tolist() == [f["scheme_code"] for f in candidates]
+    assert dict(zip(universe.scheme_codes[rows].tolist(), scores.tolist())) == expected
+
+
+@pytest.mark.parametrize("persona_id", list(PERSONA_PREFERENCES))
+@pytest.mark.parametrize("category_filters,exclude_funds", FILTER_CASES)
+@pytest.mark.parametrize("top_n", [1, 5, 40])
+def test_persona_top_n_matches(universe, fund_dicts, persona_id, category_filters, exclude_funds, top_n):
+    prefs = PERSONA_PREFERENCES[persona_id]
+    candidates = reference_filter_funds(fund_dicts, category_filters, exclude_funds or [], prefs["max_volatility"])
+    expected = ranked(reference_score_funds(candidates, prefs)[:top_n])
+
+    top = RecommendationService()._top_funds(
+        universe,
+        persona_ranking(universe, persona_id),
+        top_n,
+        category_filters=category_filters,
+        exclude_funds=exclude_funds,
+    )
+    assert ranked(top) == expected
+
+
+@pytest.mark.parametrize("asset_class", list(ASSET_CLASS_VOLATILITY_LIMITS))
+@pytest.mark.parametrize("category_filters,exclude_funds", FILTER_CASES)
+@pytest.mark.parametrize("top_n", [1, 3, 25])
+def test_asset_class_top_n_matches(universe, fund_dicts, asset_class, category_filters, exclude_funds, top_n):
+    max_vol = ASSET_CLASS_VOLATILITY_LIMITS[asset_class]
+    grouped = reference_group_funds_by_asset_class(fund_dicts, category_filters, exclude_funds or [])
+    expected = ranked(reference_score_funds_for_asset_class(grouped.get(asset_class, []), max_vol)[:top_n])
+
+    top = RecommendationService()._top_funds(
+        universe,
+        asset_class_ranking(universe, asset_class),
+        top_n,
+        category_filters=category_filters,
+        exclude_funds=exclude_funds,
+    )
+    assert ranked(top) == expected
+
+
+@pytest.mark.parametrize("asset_class", list(ASSET_CLASS_VOLATILITY_LIMITS))
+def test_select_top_matches_stable_sort(universe, fund_dicts, asset_class):
+    max_vol = ASSET_CLASS_VOLATILITY_LIMITS[asset_class]
+    rows = scoring_engine.filter_rows(
+        universe, max_volatility=max_vol, rows=universe.rows_in_asset_class(asset_class)
+    )
+    scores = scoring_engine.asset_class_scores(universe, rows, max_vol)
+    grouped = reference_group_funds_by_asset_class(fund_dicts, None, [])
+    reference = ranked(reference_score_funds_for_asset_class(grouped.get(asset_class, []), max_vol))
+
+    for n in (1, 2, 10, len(rows) + 5):
+        top_rows, top_scores = scoring_engine.select_top(rows, scores, n)
+        assert list(zip(universe.scheme_codes[top_rows].tolist(), top_scores.tolist())) == reference[:n]
+
+
+def test_select_top_all_tied():
+    rows = np.arange(10, 20)
+    scores = np.full(10, 0.5)
+    top_rows, _ = scoring_engine.select_top(rows, scores, 4)
+    assert top_rows.tolist() == [10, 11, 12, 13]